@@ -12,31 +12,41 @@ Classes:
                      using BioBERT with automatic chunking and average pooling.
 """
 
+from typing import List, Optional
+
 import torch
 from transformers import AutoTokenizer, AutoModel
 from BFHTW.models.qdrant import QdrantEmbeddingModel
 from BFHTW.ai_assistants.base.base_local_assistant import BaseLocalAssistant
+from BFHTW.ai_assistants.internal.bio_bert.quantization import inference_autocast
 
 MAX_TOKENS = 512
+DEFAULT_BATCH_SIZE = 128
+DEFAULT_MAX_TOKENS_PER_BATCH = 8192
+# Padded lengths are rounded up to this, bounding the shapes a compiled model sees
+PAD_TO_MULTIPLE_OF = 64
 
 class BioBERTEmbedder(BaseLocalAssistant[QdrantEmbeddingModel]):
     """
     A local assistant that generates vector embeddings from biomedical text using BioBERT.
 
     This assistant tokenizes input text, chunks it if necessary, passes it through
-    BioBERT, and returns a mean-pooled embedding suitable for similarity search.
+    BioBERT in batches, and returns a mean-pooled embedding suitable for similarity search.
 
     Attributes:
         tokenizer: Hugging Face tokenizer loaded from the BioBERT model.
         model: Hugging Face transformer model for BioBERT.
     """
 
-    def __init__(self, model_name: str = "dmis-lab/biobert-base-cased-v1.1"):
+    def __init__(self, model_name: str = "dmis-lab/biobert-base-cased-v1.1", half_precision: bool = False):
         """
         Initialize the BioBERTEmbedder with a specific BioBERT model.
 
         Args:
             model_name (str): Hugging Face model identifier. Defaults to dmis-lab BioBERT.
+            half_precision (bool): Load weights in bfloat16 (float16 on GPUs without
+                bf16 support). Off by default so new vectors match the FP32 vectors
+                already stored. Pooled vectors are always returned as float32.
         """
         super().__init__(
             name="BioBERT-Embedder",
@@ -45,28 +55,12 @@ class BioBERTEmbedder(BaseLocalAssistant[QdrantEmbeddingModel]):
             response_model=QdrantEmbeddingModel,
         )
         self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-        self.model = AutoModel.from_pretrained(model_name)
-
-    def _chunk_text(self, text: str, max_tokens: int = MAX_TOKENS) -> list[str]:
-        """
-        Splits text into chunks of up to max_tokens tokens, preserving token boundaries.
-
-        Args:
-            text (str): The input text to be chunked.
-            max_tokens (int): Maximum number of tokens per chunk.
-
-        Returns:
-            list[str]: A list of text chunks.
-        """
-        tokens = self.tokenizer.tokenize(text)
-        chunks = []
-        start = 0
-        while start < len(tokens):
-            end = min(start + max_tokens, len(tokens))
-            chunk = self.tokenizer.convert_tokens_to_string(tokens[start:end])
-            chunks.append(chunk)
-            start = end
-        return chunks
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        dtype = torch.float32
+        if half_precision:
+            dtype = torch.bfloat16 if self.device.type == "cpu" or torch.cuda.is_bf16_supported() else torch.float16
+        # Loading straight into the target dtype avoids materialising fp32 weights first
+        self.model = AutoModel.from_pretrained(model_name, torch_dtype=dtype).to(self.device).eval()
 
     def run(self, text: str, *, block_id: str, doc_id: str, page: int) -> QdrantEmbeddingModel:  # type: ignore[override]
         """
@@ -81,34 +75,140 @@ class BioBERTEmbedder(BaseLocalAssistant[QdrantEmbeddingModel]):
         Returns:
             QdrantEmbeddingModel: A structured object containing metadata and final embedding.
         """
-        chunks = self._chunk_text(text)
-        all_embeddings = []
-
-        for chunk in chunks:
-            inputs = self.tokenizer(
-                chunk,
-                return_tensors="pt",
-                truncation=True,
-                max_length=MAX_TOKENS,
-                padding="max_length"
+        return self.run_batch([text], block_ids=[block_id], doc_ids=[doc_id], pages=[page])[0]
+
+    def run_batch(
+        self,
+        texts: List[str],
+        *,
+        block_ids: List[str],
+        doc_ids: List[str],
+        pages: List[Optional[int]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_tokens_per_batch: int = DEFAULT_MAX_TOKENS_PER_BATCH
+    ) -> List[QdrantEmbeddingModel]:
+        """
+        Generate embeddings for many text blocks with batched forward passes.
+
+        See `embed_batch` for how texts are chunked and batched.
+
+        Args:
+            texts (List[str]): Raw biomedical text blocks.
+            block_ids (List[str]): Block ID for each text.
+            doc_ids (List[str]): Document ID for each text.
+            pages (List[Optional[int]]): Page number for each text.
+            batch_size (int): Maximum number of chunks per forward pass.
+            max_tokens_per_batch (int): Padded token budget per forward pass.
+
+        Returns:
+            List[QdrantEmbeddingModel]: One embedding per input text, in input order.
+        """
+        if not texts:
+            return []
+
+        # One tolist() for the whole matrix
+        final_embeddings = self.embed_batch(
+            texts, batch_size=batch_size, max_tokens_per_batch=max_tokens_per_batch
+        ).tolist()
+
+        # Fields are produced here, so skip re-validating every float of every vector
+        return [
+            QdrantEmbeddingModel.model_construct(
+                doc_id=doc_id,
+                block_id=block_id,
+                page=page,
+                text=text,
+                embedding=embedding
             )
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                # Mean pooling over token embeddings
-                embedding = outputs.last_hidden_state.mean(dim=1).squeeze().tolist()
-                all_embeddings.append(embedding)
-
-        # Average across all chunks
-        if len(all_embeddings) > 1:
-            embedding_tensor = torch.tensor(all_embeddings)
-            final_embedding = embedding_tensor.mean(dim=0).tolist()
-        else:
-            final_embedding = all_embeddings[0]
-
-        return QdrantEmbeddingModel(
-            doc_id=doc_id,
-            block_id=block_id,
-            page=page,
-            text=text,
-            embedding=final_embedding
+            for text, block_id, doc_id, page, embedding
+            in zip(texts, block_ids, doc_ids, pages, final_embeddings)
+        ]
+
+    def embed_batch(
+        self,
+        texts: List[str],
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_tokens_per_batch: int = DEFAULT_MAX_TOKENS_PER_BATCH
+    ) -> torch.Tensor:
+        """
+        Embed many texts into one contiguous float32 matrix.
+
+        Texts longer than MAX_TOKENS are split into token-aligned chunks by the
+        tokenizer's overflow handling; each chunk is mean-pooled over its real
+        (non-padding) tokens and the chunk vectors are averaged per text. The
+        original embedder averaged all 512 padded positions instead, so these
+        vectors are stored in a separate Qdrant collection
+        (``BLOCK_EMBEDDING_COLLECTION``) rather than mixed with the old ones.
+
+        Chunks are sorted by token length and packed greedily into batches whose
+        padded size (sequences x longest sequence) stays within
+        ``max_tokens_per_batch``, so short chunks travel in large batches, long
+        ones in small batches, and little compute is spent on padding.
+
+        Args:
+            texts (List[str]): Raw biomedical text blocks.
+            batch_size (int): Maximum number of chunks per forward pass.
+            max_tokens_per_batch (int): Padded token budget per forward pass.
+
+        Returns:
+            torch.Tensor: CPU tensor of shape (len(texts), hidden_size), rows in input order.
+        """
+        if not texts:
+            return torch.zeros(0, self.model.config.hidden_size)
+
+        encoded = self.tokenizer(
+            texts,
+            truncation=True,
+            max_length=MAX_TOKENS,
+            return_overflowing_tokens=True
         )
+        sample_map = encoded.pop("overflow_to_sample_mapping")
+        features = [
+            {key: encoded[key][i] for key in encoded.keys()}
+            for i in range(len(encoded["input_ids"]))
+        ]
+        order = sorted(range(len(features)), key=lambda i: len(features[i]["input_ids"]))
+
+        # Ascending order means the chunk being added is always the longest so far
+        batches: List[List[int]] = []
+        current: List[int] = []
+        for i in order:
+            length = len(features[i]["input_ids"])
+            if current and (len(current) >= batch_size or (len(current) + 1) * length > max_tokens_per_batch):
+                batches.append(current)
+                current = []
+            current.append(i)
+        if current:
+            batches.append(current)
+
+        hidden_size = self.model.config.hidden_size
+        # Pooled vectors accumulate on the device, so nothing waits on the GPU until
+        # the end and the next batch is padded and copied while this one computes
+        sums = torch.zeros(len(texts), hidden_size, device=self.device)
+        counts = torch.bincount(torch.tensor(sample_map), minlength=len(texts)).unsqueeze(1)
+
+        for idx in batches:
+            batch = self.tokenizer.pad(
+                [features[i] for i in idx],
+                padding=True,
+                pad_to_multiple_of=PAD_TO_MULTIPLE_OF,
+                return_tensors="pt"
+            )
+            if self.device.type == "cuda":
+                # Pinned host memory lets the copy run asynchronously on the current stream
+                batch = {key: value.pin_memory().to(self.device, non_blocking=True) for key, value in batch.items()}
+            else:
+                batch = batch.to(self.device)
+
+            with torch.inference_mode(), inference_autocast(self.device):
+                outputs = self.model(**batch)
+                # Mean pooling over real tokens only, accumulated in float32
+                mask = batch["attention_mask"].unsqueeze(-1).float()
+                pooled = (outputs.last_hidden_state.float() * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+
+            owners = torch.tensor([sample_map[i] for i in idx]).to(self.device, non_blocking=True)
+            sums.index_add_(0, owners, pooled)
+
+        # Average across all chunks of each text, with a single device-to-host transfer
+        return sums.cpu() / counts.clamp(min=1)
@@ -17,9 +17,10 @@ from json import JSONDecodeError
 from collections import defaultdict
 from pathlib import Path
 from typing import List, Dict, Any
-from transformers import AutoTokenizer
+import torch
 from BFHTW.models.bio_medical_entity_block import BiomedicalEntityBlock
 from BFHTW.ai_assistants.base.base_local_assistant import BaseLocalAssistant
+from BFHTW.ai_assistants.internal.bio_bert.quantization import inference_autocast
 from BFHTW.utils.logs import get_logger
 
 L = get_logger()
@@ -27,6 +28,9 @@ L = get_logger()
 DEFAULT_LABEL_MAP = Path(__file__).parent / 'label_map.json'
 
 MAX_TOKENS = 512
+DEFAULT_BATCH_SIZE = 32
+# Token overlap between windows when the pipeline splits long texts itself
+WINDOW_STRIDE = 32
 
 class BioBERTNER(BaseLocalAssistant[BiomedicalEntityBlock]):
     """
@@ -52,7 +56,8 @@ class BioBERTNER(BaseLocalAssistant[BiomedicalEntityBlock]):
             pipeline_type="token-classification",
             response_model=BiomedicalEntityBlock,
             aggregation_strategy="simple",
-            return_all_scores=False
+            return_all_scores=False,
+            device=0 if torch.cuda.is_available() else -1
         )
         try:
             with label_map_path.open() as f:
@@ -61,7 +66,8 @@ class BioBERTNER(BaseLocalAssistant[BiomedicalEntityBlock]):
             L.error(f"Failed to load label map from {label_map_path}: {e}")
             raise RuntimeError("NER label map is required but failed to load.") from e
 
-        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        # The pipeline already loaded this model's tokenizer; reuse it
+        self.tokenizer = self.pipe.tokenizer
 
     def _chunk_text(self, text: str, max_tokens: int = MAX_TOKENS) -> list[str]:
         """
@@ -102,28 +108,53 @@ class BioBERTNER(BaseLocalAssistant[BiomedicalEntityBlock]):
             raise RuntimeError("Unexpected output from HuggingFace NER pipeline")
         return result
 
-    def run(self, text: str, *, block_id: str, doc_id: str) -> BiomedicalEntityBlock:  # type: ignore[override]
+    def _run_pipeline_batch(self, texts: List[str], batch_size: int) -> List[List[Dict[str, Any]]]:
         """
-        Run NER on input text and return extracted entities in structured form.
+        Batched counterpart of `_run_pipeline`: runs the NER pipeline over many texts at once.
+
+        The Hugging Face pipeline pads each group of `batch_size` texts together and
+        runs the token-classification head once per group. With a fast tokenizer,
+        texts longer than the model limit are split into overlapping windows during
+        the pipeline's own tokenization, and entities are merged back per text.
 
         Args:
-            text (str): Raw biomedical text.
+            texts (List[str]): Input texts for NER.
+            batch_size (int): Number of texts per forward pass.
+
+        Returns:
+            List[List[Dict[str, Any]]]: Structured NER output, one list per input text.
+
+        Raises:
+            RuntimeError: If output format is unexpected.
+        """
+        window_kwargs = {"stride": WINDOW_STRIDE} if self.tokenizer.is_fast else {}
+        with torch.inference_mode(), inference_autocast(self.pipe.device):
+            results = self.pipe(texts, batch_size=batch_size, **window_kwargs)
+        if not isinstance(results, list) or len(results) != len(texts):
+            raise RuntimeError("Unexpected output from HuggingFace NER pipeline")
+        for result in results:
+            if not isinstance(result, list) or not all(isinstance(e, dict) for e in result):
+                raise RuntimeError("Unexpected output from HuggingFace NER pipeline")
+        return results
+
+    def _to_entity_block(self, entities: List[Dict[str, Any]], *, block_id: str, doc_id: str) -> BiomedicalEntityBlock:
+        """
+        Group raw pipeline entities by target category and build the response model.
+
+        Args:
+            entities (List[Dict[str, Any]]): Aggregated NER output for a single block.
             block_id (str): Unique identifier for the text block.
             doc_id (str): Identifier for the source document.
 
         Returns:
             BiomedicalEntityBlock: Structured representation of the extracted entities.
         """
-        chunks = self._chunk_text(text)
         categories = defaultdict(list)
-
-        for chunk in chunks:
-            entities = self._run_pipeline(chunk)
-            for ent in entities:
-                label = ent.get("entity_group")
-                value = ent.get("word")
-                key = self.label_map.get(label, "other")
-                categories[key].append(value)
+        for ent in entities:
+            label = ent.get("entity_group")
+            value = ent.get("word")
+            key = self.label_map.get(label, "other")
+            categories[key].append(value)
 
         valid_fields = BiomedicalEntityBlock.model_fields.keys()
         filtered = {k: v for k, v in categories.items() if k in valid_fields}
@@ -135,3 +166,70 @@ class BioBERTNER(BaseLocalAssistant[BiomedicalEntityBlock]):
             model="bert",
             **filtered
         )
+
+    def run(self, text: str, *, block_id: str, doc_id: str) -> BiomedicalEntityBlock:  # type: ignore[override]
+        """
+        Run NER on input text and return extracted entities in structured form.
+
+        Args:
+            text (str): Raw biomedical text.
+            block_id (str): Unique identifier for the text block.
+            doc_id (str): Identifier for the source document.
+
+        Returns:
+            BiomedicalEntityBlock: Structured representation of the extracted entities.
+        """
+        entities = []
+        for chunk in self._chunk_text(text):
+            entities.extend(self._run_pipeline(chunk))
+
+        return self._to_entity_block(entities, block_id=block_id, doc_id=doc_id)
+
+    def run_batch(
+        self,
+        texts: List[str],
+        *,
+        block_ids: List[str],
+        doc_ids: List[str],
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> List[BiomedicalEntityBlock]:
+        """
+        Run NER over many text blocks, batching the forward passes across blocks.
+
+        Texts go straight to the pipeline, which tokenizes each one once and
+        windows long texts itself. Only with a slow tokenizer are texts
+        pre-chunked as in `run`, then regrouped per block.
+
+        Args:
+            texts (List[str]): Raw biomedical text blocks.
+            block_ids (List[str]): Block ID for each text.
+            doc_ids (List[str]): Document ID for each text.
+            batch_size (int): Number of chunks per forward pass.
+
+        Returns:
+            List[BiomedicalEntityBlock]: One entity block per input text, in input order.
+        """
+        if not texts:
+            return []
+
+        chunks: List[str] = []
+        owners: List[int] = []
+        for idx, text in enumerate(texts):
+            if self.tokenizer.is_fast:
+                if text.strip():
+                    chunks.append(text)
+                    owners.append(idx)
+                continue
+            for chunk in self._chunk_text(text):
+                chunks.append(chunk)
+                owners.append(idx)
+
+        entities_per_text: List[List[Dict[str, Any]]] = [[] for _ in texts]
+        if chunks:
+            for owner, entities in zip(owners, self._run_pipeline_batch(chunks, batch_size)):
+                entities_per_text[owner].extend(entities)
+
+        return [
+            self._to_entity_block(entities, block_id=block_id, doc_id=doc_id)
+            for entities, block_id, doc_id in zip(entities_per_text, block_ids, doc_ids)
+        ]
@@ -0,0 +1,75 @@
+"""
+Module: quantization.py
+Purpose:
+    Reduced-precision helpers for the BioBERT assistants.
+
+    Transformer inference here is dominated by the Linear layers. On CPU those are
+    converted to int8 with PyTorch dynamic quantization; on CUDA the weights are
+    cast to half precision so matmuls run on tensor cores. Either way roughly half
+    the memory bandwidth per layer is needed.
+
+Functions:
+    quantize_for_inference: Returns a reduced-precision copy of a model suited to its device.
+    inference_autocast: Mixed-precision autocast context for CUDA forward passes.
+    compile_for_inference: Wraps a model in torch.compile with a mode suited to its device.
+"""
+
+import contextlib
+
+import torch
+
+from BFHTW.utils.logs import get_logger
+
+L = get_logger()
+
+
+def quantize_for_inference(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Convert a transformer model to a reduced-precision inference variant.
+
+    Args:
+        model (torch.nn.Module): A loaded Hugging Face model in eval mode.
+
+    Returns:
+        torch.nn.Module: int8 dynamically-quantized model on CPU, or an fp16 model on CUDA.
+    """
+    device = next(model.parameters()).device
+
+    if device.type == "cuda":
+        L.info("Casting model weights to float16 for CUDA inference")
+        return model.half().eval()
+
+    L.info("Applying int8 dynamic quantization to Linear layers for CPU inference")
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8).eval()
+
+
+def inference_autocast(device: torch.device) -> contextlib.AbstractContextManager:
+    """
+    Autocast context for a forward pass on ``device``.
+
+    On CUDA, matmuls run in bfloat16 where the GPU supports it (Ampere and newer),
+    otherwise float16; weights stay in their loaded dtype. On CPU this is a no-op.
+    """
+    if device.type != "cuda":
+        return contextlib.nullcontext()
+    dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+    return torch.autocast(device_type="cuda", dtype=dtype)
+
+
+def compile_for_inference(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Compile a model with torch.compile for repeated inference.
+
+    On CUDA the "reduce-overhead" mode captures CUDA graphs, removing per-kernel
+    launch overhead; graphs are recorded per input shape, so callers should pad
+    sequence lengths to a fixed multiple. On CPU the default mode with dynamic
+    shapes is used.
+    """
+    device = next(model.parameters()).device
+
+    if device.type == "cuda":
+        L.info("Compiling model with torch.compile (reduce-overhead)")
+        return torch.compile(model, mode="reduce-overhead")
+
+    L.info("Compiling model with torch.compile (dynamic shapes)")
+    return torch.compile(model, dynamic=True)
@@ -6,10 +6,11 @@ biomedical data processing pipelines.
 """
 
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, List, Dict, Any, Optional, Iterator, Union
+from typing import Generic, TypeVar, List, Dict, Any, Optional, Iterator, Union, NamedTuple
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
+from itertools import islice
 import uuid
 import time
 
@@ -34,6 +35,7 @@ class ValidationResult:
     is_valid: bool
     errors: List[str] = field(default_factory=list)
     warnings: List[str] = field(default_factory=list)
+    score: Optional[float] = None
     
     def add_error(self, error: str):
         """Add validation error."""
@@ -55,6 +57,13 @@ class PipelineResult:
     warnings: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+class _BatchCounts(NamedTuple):
+    """Lightweight per-batch tally, folded into a PipelineResult once per run."""
+    processed: int
+    failed: int
+    errors: List[str]
+    warnings: List[str]
+
 class DataValidator(ABC):
     """Abstract base class for data validators."""
     
@@ -62,6 +71,15 @@ class DataValidator(ABC):
     def validate(self, data: Any) -> ValidationResult:
         """Validate data and return validation result."""
         pass
+    
+    def validate_batch(self, items: List[Any]) -> List[ValidationResult]:
+        """
+        Validate several items, returning one result per item in order.
+        
+        Defaults to calling `validate` per item; validators that hit a database
+        override this to look up a whole batch in one query.
+        """
+        return [self.validate(item) for item in items]
 
 class DataSource(ABC):
     """Abstract base class for data sources."""
@@ -80,6 +98,15 @@ class DataSource(ABC):
     def fetch_metadata(self) -> List[Dict[str, Any]]:
         """Fetch metadata from data source."""
         pass
+    
+    def iter_metadata(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield metadata items one at a time.
+        
+        Defaults to iterating `fetch_metadata`; sources that can produce items
+        incrementally override this so pipelines never hold the full list.
+        """
+        yield from self.fetch_metadata()
 
 class BasePipeline(Generic[InputType, OutputType], ABC):
     """
@@ -118,6 +145,22 @@ class BasePipeline(Generic[InputType, OutputType], ABC):
         """Store processed item."""
         pass
     
+    def store_batch(self, items: List[OutputType]) -> int:
+        """
+        Store all processed items of a batch and return how many were stored.
+        
+        The default stores items one at a time with `store_item`; override it
+        when the backend can write a whole batch in fewer round-trips.
+        """
+        stored = 0
+        for item in items:
+            try:
+                if self.store_item(item):
+                    stored += 1
+            except Exception as e:
+                L.error(f"Error storing item: {str(e)}")
+        return stored
+    
     def validate_item(self, item: Any) -> ValidationResult:
         """Validate item using configured validators."""
         result = ValidationResult(is_valid=True)
@@ -126,11 +169,86 @@ class BasePipeline(Generic[InputType, OutputType], ABC):
             validation = validator.validate(item)
             if not validation.is_valid:
                 result.is_valid = False
-                result.errors.extend(validation.errors)
-            result.warnings.extend(validation.warnings)
+                if validation.errors:
+                    result.errors.extend(validation.errors)
+            if validation.warnings:
+                result.warnings.extend(validation.warnings)
         
         return result
     
+    def validate_batch(self, items: List[Any]) -> List[ValidationResult]:
+        """Validate a whole batch, letting each validator check all items at once."""
+        results = [ValidationResult(is_valid=True) for _ in items]
+        
+        for validator in self.validators:
+            for result, validation in zip(results, validator.validate_batch(items)):
+                if not validation.is_valid:
+                    result.is_valid = False
+                    if validation.errors:
+                        result.errors.extend(validation.errors)
+                if validation.warnings:
+                    result.warnings.extend(validation.warnings)
+        
+        return results
+    
+    def _process_batch(self, batch: List[Any], upcoming: Optional[List[Any]] = None) -> _BatchCounts:
+        """
+        Validate, process and store each item in a batch.
+        
+        ``upcoming`` holds the items of the following batch so subclasses can
+        start fetching them early; the base implementation ignores it.
+        """
+        processed = 0
+        failed = 0
+        errors: List[str] = []
+        warnings: List[str] = []
+        to_store: List[OutputType] = []
+        
+        # Validate the batch up front; fall back to per-item validation on error
+        try:
+            validations = self.validate_batch(batch)
+        except Exception as e:
+            L.error(f"Batch validation failed, validating items individually: {str(e)}")
+            validations = None
+        
+        for index, item in enumerate(batch):
+            try:
+                # Validate input
+                validation = validations[index] if validations is not None else self.validate_item(item)
+                if not validation.is_valid:
+                    L.warning("Validation failed for item: %s", validation.errors)
+                    warnings.extend(validation.errors)
+                    failed += 1
+                    continue
+                
+                # Process item
+                processed_item = self.process_item(item)
+                if processed_item is None:
+                    failed += 1
+                    continue
+                
+                to_store.append(processed_item)
+                    
+            except Exception as e:
+                error_msg = f"Error processing item: {str(e)}"
+                L.error(error_msg)
+                errors.append(error_msg)
+                failed += 1
+        
+        # Store results for the whole batch at once
+        if to_store:
+            try:
+                stored = self.store_batch(to_store)
+            except Exception as e:
+                error_msg = f"Error storing batch: {str(e)}"
+                L.error(error_msg)
+                errors.append(error_msg)
+                stored = 0
+            processed += stored
+            failed += len(to_store) - stored
+        
+        return _BatchCounts(processed, failed, errors, warnings)
+    
     def run(self) -> PipelineResult:
         """Execute the complete pipeline."""
         start_time = time.time()
@@ -143,49 +261,31 @@ class BasePipeline(Generic[InputType, OutputType], ABC):
             if not self.source.validate_connection():
                 raise ConnectionError(f"Cannot connect to data source: {self.source.get_identifier()}")
             
-            # Fetch data from source
-            raw_data = self.source.fetch_metadata()
-            L.info(f"Fetched {len(raw_data)} items from {self.source.get_identifier()}")
-            
-            # Process data in batches
-            total_items = len(raw_data)
+            # Stream data from source; only the current and next batch are held
+            items = iter(self.source.iter_metadata())
             processed = 0
             failed = 0
+            total_items = 0
+            batch_num = 0
             
-            for i in range(0, total_items, self.batch_size):
-                batch = raw_data[i:i + self.batch_size]
-                batch_num = (i // self.batch_size) + 1
-                total_batches = (total_items + self.batch_size - 1) // self.batch_size
+            batch = list(islice(items, self.batch_size))
+            while batch:
+                upcoming = list(islice(items, self.batch_size))
+                batch_num += 1
+                total_items += len(batch)
                 
-                L.info(f"Processing batch {batch_num}/{total_batches} ({len(batch)} items)")
+                L.info(f"Processing batch {batch_num} ({len(batch)} items)")
                 
-                for item in batch:
-                    try:
-                        # Validate input
-                        validation = self.validate_item(item)
-                        if not validation.is_valid:
-                            L.warning(f"Validation failed for item: {validation.errors}")
-                            result.warnings.extend(validation.errors)
-                            failed += 1
-                            continue
-                        
-                        # Process item
-                        processed_item = self.process_item(item)
-                        if processed_item is None:
-                            failed += 1
-                            continue
-                        
-                        # Store result
-                        if self.store_item(processed_item):
-                            processed += 1
-                        else:
-                            failed += 1
-                            
-                    except Exception as e:
-                        error_msg = f"Error processing item: {str(e)}"
-                        L.error(error_msg)
-                        result.errors.append(error_msg)
-                        failed += 1
+                counts = self._process_batch(batch, upcoming)
+                processed += counts.processed
+                failed += counts.failed
+                if counts.errors:
+                    result.errors.extend(counts.errors)
+                if counts.warnings:
+                    result.warnings.extend(counts.warnings)
+                batch = upcoming
+            
+            L.info(f"Fetched {total_items} items from {self.source.get_identifier()}")
             
             # Set final status
             if failed == 0:
@@ -5,12 +5,19 @@ Handles download, parsing, AI analysis, and storage of biomedical documents
 with comprehensive validation and error handling.
 """
 
-from typing import Optional, List, Tuple, Union
+from typing import Optional, List, Tuple, Union, Iterable
 from pathlib import Path
+import asyncio
+import functools
+import multiprocessing
+import os
 import shutil
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from urllib.parse import urljoin
 
-from BFHTW.pipelines.base_pipeline import BasePipeline, PipelineResult
+import torch
+
+from BFHTW.pipelines.base_pipeline import BasePipeline, PipelineResult, PipelineStatus, _BatchCounts
 from BFHTW.pipelines.data_sources import DatabaseSource
 from BFHTW.pipelines.validation import create_biomedical_document_validators, CompositeValidator
 from BFHTW.models.document_main import Document
@@ -22,15 +29,116 @@ from BFHTW.utils.crud.crud import CRUD
 from BFHTW.utils.io.tarball_fetcher import TarballFetcher
 from BFHTW.utils.pdf.pdf_metadata import PDFReadMeta
 from BFHTW.utils.pdf.pdf_block_extractor import PDFBlockExtractor
-from BFHTW.utils.nxml.pubmed_parser import PubMedNXMLParser
+from BFHTW.utils.nxml.nxml_parser import PubMedNXMLParser
 from BFHTW.ai_assistants.internal.bio_bert.biobert_ner import BioBERTNER
 from BFHTW.ai_assistants.internal.bio_bert.biobert_embeddings import BioBERTEmbedder
-from BFHTW.utils.qdrant.qdrant_crud import QdrantCRUD
+from BFHTW.ai_assistants.internal.bio_bert.quantization import quantize_for_inference, compile_for_inference
+from BFHTW.utils.qdrant.qdrant_crud import BLOCK_EMBEDDING_COLLECTION, QdrantCRUD
 from BFHTW.utils.logs import get_logger
-from qdrant_client.models import PointStruct
 
 L = get_logger()
 
+# Points are buffered across documents and uploaded to Qdrant in large batches.
+POINT_BUFFER_SIZE = 2048
+# Qdrant's default HNSW indexing threshold, restored after bulk ingest if the
+# collection had indexing disabled already (e.g. by an interrupted run).
+DEFAULT_INDEXING_THRESHOLD = 20000
+# Finished article directories are removed in groups of this size.
+TEMP_CLEANUP_INTERVAL = 32
+# SQLite rows are buffered across documents and written in one transaction.
+ROW_BUFFER_SIZE = 5000
+# Block checks that reject a block, mirroring create_biomedical_document_validators
+BLOCK_REQUIRED_FIELDS = ['block_id', 'doc_id', 'text']
+MIN_BLOCK_TEXT_LENGTH = 50
+# Worker processes are started from a clean server process rather than forked
+# from this one, which by then holds download threads, CUDA and HTTP sessions
+PROCESS_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+@functools.lru_cache(maxsize=None)
+def _get_block_validator(block_model) -> CompositeValidator:
+    """Build the strict block validator once per process and block model."""
+    return CompositeValidator(
+        create_biomedical_document_validators(
+            model=block_model,
+            required_fields=BLOCK_REQUIRED_FIELDS,
+            strict_schema=False
+        ),
+        stop_on_first_error=False
+    )
+
+@functools.lru_cache(maxsize=None)
+def _get_ner_model(quantize: bool = False, compile_model: bool = False) -> BioBERTNER:
+    """Load the NER model once per process and configuration."""
+    L.info("Initializing BioBERT NER model...")
+    model = BioBERTNER()
+    if quantize:
+        model.pipe.model = quantize_for_inference(model.pipe.model)
+    if compile_model:
+        model.pipe.model = compile_for_inference(model.pipe.model)
+    return model
+
+@functools.lru_cache(maxsize=None)
+def _get_embedding_model(quantize: bool = False, compile_model: bool = False) -> BioBERTEmbedder:
+    """Load the embedding model once per process and configuration."""
+    L.info("Initializing BioBERT embedding model...")
+    model = BioBERTEmbedder()
+    if quantize:
+        model.model = quantize_for_inference(model.model)
+    if compile_model:
+        model.model = compile_for_inference(model.model)
+    return model
+
+def _find_doc(root: Path) -> Tuple[Optional[Path], Optional[Path]]:
+    """
+    Return the first (PDF, NXML) found under ``root`` in one scandir pass.
+
+    A PDF wins over NXML downstream, so the walk stops at the first PDF.
+    """
+    if root.is_file():
+        suffix = root.suffix.lower()
+        return (root if suffix == '.pdf' else None), (root if suffix == '.nxml' else None)
+
+    nxml_path = None
+    stack = [str(root)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                    continue
+                name = entry.name.lower()
+                if name.endswith('.pdf'):
+                    return Path(entry.path), nxml_path
+                if nxml_path is None and name.endswith('.nxml'):
+                    nxml_path = Path(entry.path)
+    return None, nxml_path
+
+@functools.lru_cache(maxsize=None)
+def _worker_fetcher(base_dir: str) -> TarballFetcher:
+    """One fetcher (and HTTP session) per extraction worker process."""
+    return TarballFetcher(Path(base_dir))
+
+def _extract_in_worker(base_dir: str, tar_path: Path, extract_to: Path) -> Path:
+    """Extract a downloaded tarball inside an extraction worker process."""
+    return _worker_fetcher(base_dir).extract(tar_path, extract_to=extract_to)
+
+def _process_pool(max_workers: Optional[int]) -> ProcessPoolExecutor:
+    """
+    Create a process pool that never forks the calling process.
+
+    Workers start lazily, on the first submits from download threads, so they
+    come from a forkserver (or are spawned) instead of inheriting this
+    process's threads and locks.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context(PROCESS_START_METHOD)
+    )
+
 class DocumentProcessingPipeline(BasePipeline[Document, dict]):
     """
     Generic pipeline for processing biomedical documents from the documents table.
@@ -58,7 +166,16 @@ class DocumentProcessingPipeline(BasePipeline[Document, dict]):
         enable_ai_processing: bool = True,
         enable_embeddings: bool = True,
         temp_dir: Optional[str] = None,
-        cleanup_temp_files: bool = True
+        cleanup_temp_files: bool = True,
+        quantize_models: bool = False,
+        compile_models: bool = False,
+        parse_workers: Optional[int] = None,
+        strict_validation: bool = False,
+        qdrant_batch_size: int = 64,
+        qdrant_parallel: int = 1,
+        qdrant_flush_threshold: int = POINT_BUFFER_SIZE,
+        extract_workers: Optional[int] = None,
+        disable_indexing_during_upload: bool = True
     ):
         # Create database source for unprocessed documents from documents table
         db_source = DatabaseSource(
@@ -82,16 +199,64 @@ class DocumentProcessingPipeline(BasePipeline[Document, dict]):
         self.enable_ai_processing = enable_ai_processing
         self.enable_embeddings = enable_embeddings
         self.cleanup_temp_files = cleanup_temp_files
+        self.quantize_models = quantize_models
+        self.compile_models = compile_models
+        # None lets ProcessPoolExecutor use every core; 0 parses in-process
+        self.parse_workers = parse_workers
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        # Tarball decompression runs in worker processes; None sizes the pool to
+        # min(cores, max_concurrent_downloads), 0 extracts in the download thread
+        self.extract_workers = extract_workers
+        self._extract_pool: Optional[ProcessPoolExecutor] = None
+        # Thread pools are created by run() and shut down before it returns, so a
+        # scheduler that builds a pipeline per run does not accumulate threads
+        self._download_pool: Optional[ThreadPoolExecutor] = None
+        self._cleanup_pool: Optional[ThreadPoolExecutor] = None
+        self._ai_executor: Optional[ThreadPoolExecutor] = None
+        # doc_id -> (temp_dir, download future) for documents of the next batch
+        self._prefetched: dict = {}
+        # Run the full validator stack on every extracted block (slow; for untrusted extractors)
+        self.strict_validation = strict_validation
+        # Points per upload request and concurrent upload workers for Qdrant flushes
+        self.qdrant_batch_size = qdrant_batch_size
+        self.qdrant_parallel = qdrant_parallel
+        # Buffered points are uploaded once at least this many are pending
+        self.qdrant_flush_threshold = qdrant_flush_threshold
+        # Pause HNSW index building while the run uploads, then restore it
+        self.disable_indexing_during_upload = disable_indexing_during_upload
         
         # Setup temp directory
         base_dir = Path(__file__).parents[1]
         self.temp_root = Path(temp_dir) if temp_dir else base_dir / 'sources' / 'pubmed_pmc' / 'temp'
         self.temp_root.mkdir(parents=True, exist_ok=True)
+        # Articles extract into subdirectories of one per-run directory
+        self.run_temp_dir = self.temp_root / f"run_{self.pipeline_id}"
+        self.run_temp_dir.mkdir(exist_ok=True)
+        self._finished_temp_dirs: List[Path] = []
+        # Shared by all download threads so HTTP connections are reused
+        self.fetcher = TarballFetcher(self.temp_root.parent, max_connections=max_concurrent_downloads * 4)
         
         # Initialize AI models if needed
         self.ner_model = None
         self.embedding_model = None
         self.qdrant_client = None
+        # NER and embeddings run side by side on the AI threads, each on its own
+        # CUDA stream when available
+        self._ner_stream = None
+        self._embedding_stream = None
+        # Qdrant points buffered column-wise: ids, one vector matrix per document, payloads
+        self._point_ids: List[str] = []
+        self._point_vectors: List[torch.Tensor] = []
+        self._point_payloads: List[dict] = []
+        # Documents with points in the buffer, and those whose upload failed
+        self._point_doc_ids: set = set()
+        self._failed_point_doc_ids: set = set()
+        self._row_buffer: dict = {}
+        self._buffered_row_count = 0
+        self._pending_processed: List[str] = []
+        # Documents already counted as processed whose rows or vectors then failed to store
+        self._unwritten_documents = 0
+        self._write_errors: List[str] = []
         
         if self.enable_ai_processing:
             self._initialize_ai_models()
@@ -99,16 +264,19 @@ class DocumentProcessingPipeline(BasePipeline[Document, dict]):
     def _initialize_ai_models(self):
         """Initialize AI models for NER and embedding generation."""
         try:
+            if torch.cuda.is_available():
+                self._ner_stream = torch.cuda.Stream()
+                self._embedding_stream = torch.cuda.Stream()
+            
+            # Models are shared by every pipeline instance in the process
             if self.enable_ai_processing:
-                L.info("Initializing BioBERT NER model...")
-                self.ner_model = BioBERTNER()
+                self.ner_model = _get_ner_model(self.quantize_models, self.compile_models)
                 
             if self.enable_embeddings:
-                L.info("Initializing BioBERT embedding model...")
-                self.embedding_model = BioBERTEmbedder()
+                self.embedding_model = _get_embedding_model(self.quantize_models, self.compile_models)
                 
                 L.info("Initializing Qdrant client...")
-                self.qdrant_client = QdrantCRUD(collection_name='bio_blocks')
+                self.qdrant_client = QdrantCRUD(collection_name=BLOCK_EMBEDDING_COLLECTION)
                 
         except Exception as e:
             L.error(f"Failed to initialize AI models: {str(e)}")
@@ -118,6 +286,8 @@ class DocumentProcessingPipeline(BasePipeline[Document, dict]):
         """
         Process a single document through the complete pipeline.
         
+        Only valid while `run` is active, since run() owns the worker threads.
+        
         Args:
             item: Document from documents table
             
@@ -137,11 +307,38 @@ class DocumentProcessingPipeline(BasePipeline[Document, dict]):
             if not extracted_path:
                 return None
             
+            result = self._process_extracted(item, extracted_path)
+            # Uploads the document's points before its rows and flag are committed
+            self._flush_rows()
+            return result
+            
+        except Exception as e:
+            L.error(f"Failed to process article {article_id}: {str(e)}")
+            return None
+            
+        finally:
+            # Cleanup temp directory
+            if temp_dir and self.cleanup_temp_files:
+                self._cleanup_temp_dir(temp_dir)
+    
+    def _process_extracted(self, item: Document, extracted_path: Path) -> Optional[dict]:
+        """Run parsing, storage and AI steps on an already downloaded document."""
+        try:
             # Step 3: Detect document format and extract content
-            doc_info = self._extract_document_content(extracted_path, item)
+            doc_info = self._extract_document_content(extracted_path, item, self.strict_validation)
             if not doc_info:
                 return None
             
+            return self._process_parsed(item, doc_info)
+            
+        except Exception as e:
+            L.error(f"Failed to process article {item.external_id}: {str(e)}")
+            return None
+    
+    def _process_parsed(self, item: Document, doc_info: dict) -> Optional[dict]:
+        """Store a parsed document and run the AI models over its blocks."""
+        article_id = item.external_id
+        try:
             # Step 4: Store document metadata and blocks
             storage_result = self._store_document_data(doc_info, item)
             if not storage_result:
@@ -169,55 +366,155 @@ class DocumentProcessingPipeline(BasePipeline[Document, dict]):
         except Exception as e:
             L.error(f"Failed to process article {article_id}: {str(e)}")
             return None
+    
+    def _process_batch(self, batch: List[Document], upcoming: Optional[List[Document]] = None) -> _BatchCounts:
+        """
+        Process a batch as overlapping download, parse and AI stages.
+        
+        Up to ``max_concurrent_downloads`` documents are fetched at once. Each
+        finished download is handed straight to the process pool for parsing,
+        so several documents parse on separate cores, and parsed documents then
+        go through storage and the AI models one at a time, since the models
+        live in this process. Documents of the ``upcoming`` batch are queued
+        behind this batch's, so they download and parse while this batch is
+        still on the GPU.
+        """
+        return asyncio.run(self._process_batch_async(batch, upcoming or []))
+    
+    async def _process_batch_async(self, batch: List[Document], upcoming: List[Document]) -> _BatchCounts:
+        processed = 0
+        failed = 0
+        errors: List[str] = []
+        warnings: List[str] = []
+        
+        downloads = []
+        for item, validation in zip(batch, self.validate_batch(batch)):
+            if not validation.is_valid:
+                L.warning(f"Validation failed for item: {validation.errors}")
+                warnings.extend(validation.errors)
+                failed += 1
+                self._discard_prefetched(item.doc_id)
+                continue
+            download = self._prefetched.pop(item.doc_id, None) or self._submit_download(item)
+            downloads.append((item, download[0], download[2]))
+        
+        # Queued after this batch's downloads, so they only start as slots free up
+        pending = [item for item in upcoming if item.doc_id not in self._prefetched]
+        for item, validation in zip(pending, self.validate_batch(pending)):
+            if validation.is_valid:
+                self._prefetched[item.doc_id] = self._submit_download(item)
+        
+        ai_lock = asyncio.Lock()
+        documents = [
+            asyncio.create_task(self._process_document_async(item, temp_dir, parsed, ai_lock))
+            for item, temp_dir, parsed in downloads
+        ]
+        
+        for document in asyncio.as_completed(documents):
+            try:
+                processed_item = await document
+                if processed_item is not None and self.store_item(processed_item):
+                    processed += 1
+                else:
+                    failed += 1
+                    
+            except Exception as e:
+                error_msg = f"Error processing item: {str(e)}"
+                L.error(error_msg)
+                errors.append(error_msg)
+                failed += 1
+        
+        return _BatchCounts(processed, failed, errors, warnings)
+    
+    def _submit_download(self, item: Document) -> Tuple[Path, Future, Future]:
+        """
+        Queue a document for download and extraction, then parsing.
+        
+        Returns the temp directory, the download future (used to cancel) and
+        a future for the parsed document info. Without a parse pool the last is
+        the download future itself, and parsing happens in
+        `_process_document_async`.
+        """
+        temp_dir = self._create_temp_dir(item.external_id)
+        download = self._download_pool.submit(self._download_and_extract, item, temp_dir)
+        if self._parse_pool is None:
+            return temp_dir, download, download
+        return temp_dir, download, self._chain_parse(item, download)
+    
+    def _chain_parse(self, item: Document, download: Future) -> Future:
+        """Submit a document for parsing the moment its download finishes."""
+        parsed: Future = Future()
+        
+        def copy_result(source: Future):
+            if source.cancelled():
+                parsed.cancel()
+            elif source.exception() is not None:
+                parsed.set_exception(source.exception())
+            else:
+                parsed.set_result(source.result())
+        
+        def on_downloaded(finished: Future):
+            if finished.cancelled() or finished.exception() is not None or not finished.result():
+                copy_result(finished)
+                return
+            L.info(f"Processing document: {item.external_id} from {item.source_db}")
+            try:
+                # Only the path and the Document cross the process boundary
+                self._parse_pool.submit(
+                    type(self)._extract_document_content,
+                    finished.result(), item, self.strict_validation
+                ).add_done_callback(copy_result)
+            except Exception as e:
+                parsed.set_exception(e)
+        
+        download.add_done_callback(on_downloaded)
+        return parsed
+    
+    def _discard_prefetched(self, doc_id: str):
+        """Drop a prefetched download that will not be processed."""
+        prefetched = self._prefetched.pop(doc_id, None)
+        if prefetched:
+            temp_dir, download, parsed = prefetched
+            if not download.cancel():
+                wait([parsed])
+            if self.cleanup_temp_files:
+                self._cleanup_temp_dir(temp_dir)
+    
+    async def _process_document_async(
+        self,
+        item: Document,
+        temp_dir: Path,
+        parsed: Future,
+        ai_lock: asyncio.Lock
+    ) -> Optional[dict]:
+        """Store and run AI on one document as soon as it has been parsed."""
+        try:
+            doc_info = await asyncio.wrap_future(parsed)
+            if not doc_info:
+                return None
+            
+            if self._parse_pool is None:
+                # ``parsed`` was the download; parse here on the event loop, one
+                # document at a time, since PyMuPDF must not run on several threads
+                L.info(f"Processing document: {item.external_id} from {item.source_db}")
+                doc_info = self._extract_document_content(doc_info, item, self.strict_validation)
+                if not doc_info:
+                    return None
+            
+            async with ai_lock:
+                return await asyncio.to_thread(self._process_parsed, item, doc_info)
             
         finally:
-            # Cleanup temp directory
-            if temp_dir and self.cleanup_temp_files:
+            if self.cleanup_temp_files:
                 self._cleanup_temp_dir(temp_dir)
     
     def _create_temp_dir(self, article_id: str) -> Path:
         """Create temporary directory for article processing."""
-        temp_dir = self.temp_root / f"extract_{article_id}"
+        temp_dir = self.run_temp_dir / f"extract_{article_id}"
+        # parents=True only costs extra syscalls if the run directory is missing
         temp_dir.mkdir(parents=True, exist_ok=True)
         return temp_dir
     
-    def _download_pmc_document(self, item: Document, temp_dir: Path) -> Optional[Path]:
-        """Download and extract PMC document."""
-        try:
-            # Extract FTP path from notes field (temporary solution)
-            # TODO: Store FTP path in a proper field or lookup table
-            if not item.notes or "FTP Path:" not in item.notes:
-                L.error(f"No FTP path found for PMC document {item.external_id}")
-                return None
-            
-            ftp_path = item.notes.split("FTP Path: ")[1].split(",")[0].strip()
-            if not ftp_path:
-                L.error(f"Invalid FTP path for PMC document {item.external_id}")
-                return None
-                
-            base_url = "https://ftp.ncbi.nlm.nih.gov/pub/pmc/"
-            full_url = urljoin(base_url, ftp_path)
-            
-            tarball_filename = Path(ftp_path).name
-            tarball_path = temp_dir / tarball_filename
-            
-            L.debug(f"Downloading {full_url} to {tarball_path}")
-            
-            fetcher = TarballFetcher(self.temp_root.parent)
-            downloaded_path = fetcher.download(full_url, target_path=tarball_path)
-            
-            if not downloaded_path:
-                L.error(f"Failed to download {full_url}")
-                return None
-            
-            # Extract contents
-            extracted_path = fetcher.extract(downloaded_path, extract_to=temp_dir)
-            return extracted_path
-            
-        except Exception as e:
-            L.error(f"PMC download failed for {item.external_id}: {str(e)}")
-            return None
-    
     def _download_arxiv_document(self, item: Document, temp_dir: Path) -> Optional[Path]:
         """Download arXiv document (placeholder for future implementation)."""
         L.warning(f"arXiv download not yet implemented for {item.external_id}")
@@ -263,21 +560,29 @@ class DocumentProcessingPipeline(BasePipeline[Document, dict]):
             base_url = "https://ftp.ncbi.nlm.nih.gov/pub/pmc/"
             full_url = urljoin(base_url, ftp_path)
             
-            tarball_filename = Path(ftp_path).name
-            tarball_path = temp_dir / tarball_filename
+            tarball_path = temp_dir / Path(ftp_path).name
+            if self._extract_pool:
+                # Download over the shared session here, decompress in a worker process
+                L.debug(f"Downloading {full_url} to {tarball_path}")
+                self.fetcher.download(full_url, target_path=tarball_path)
+                extracted_path = self._extract_pool.submit(
+                    _extract_in_worker, str(self.temp_root.parent), tarball_path, temp_dir
+                ).result()
+                if self.cleanup_temp_files:
+                    tarball_path.unlink(missing_ok=True)
+                return extracted_path
             
-            L.debug(f"Downloading {full_url} to {tarball_path}")
-            
-            fetcher = TarballFetcher(self.temp_root.parent)
-            downloaded_path = fetcher.download(full_url, target_path=tarball_path)
+            if not self.cleanup_temp_files:
+                # Temp files are being kept, so keep the archive next to its contents
+                L.debug(f"Downloading {full_url} to {tarball_path}")
+                return self.fetcher.extract(
+                    self.fetcher.download(full_url, target_path=tarball_path), extract_to=temp_dir
+                )
             
-            if not downloaded_path:
-                L.error(f"Failed to download {full_url}")
-                return None
+            L.debug(f"Streaming {full_url} into {temp_dir}")
             
-            # Extract contents
-            extracted_path = fetcher.extract(downloaded_path, extract_to=temp_dir)
-            return extracted_path
+            # Extract while downloading; the tarball is never written to disk
+            return self.fetcher.stream_extract(full_url, extract_to=temp_dir)
             
         except Exception as e:
             L.error(f"PMC download failed for {item.external_id}: {str(e)}")
@@ -300,36 +605,36 @@ class DocumentProcessingPipeline(BasePipeline[Document, dict]):
                 L.error(f"Local file not found: {source_path}")
                 return None
             
-            # Copy to temp directory for processing
-            target_path = temp_dir / source_path.name
-            shutil.copy2(source_path, target_path)
-            
-            return temp_dir
+            # Parse in place; nothing is written to temp_dir for local files
+            return source_path
             
         except Exception as e:
             L.error(f"Local file processing failed for {item.external_id}: {str(e)}")
             return None
     
-    def _extract_document_content(self, extracted_path: Path, item: Document) -> Optional[dict]:
+    @classmethod
+    def _extract_document_content(
+        cls,
+        extracted_path: Path,
+        item: Document,
+        strict_validation: bool = False
+    ) -> Optional[dict]:
         """Extract content from PDF or NXML document."""
-        temp_dir = extracted_path
-        
-        # Look for PDF or NXML files
-        pdf_path = next(temp_dir.rglob("*.pdf"), None)
-        nxml_path = next(temp_dir.rglob("*.nxml"), None)
+        pdf_path, nxml_path = _find_doc(extracted_path)
         
         if not pdf_path and not nxml_path:
             L.warning(f"No PDF or NXML found for {item.external_id}")
             return None
         
         if pdf_path:
-            return self._process_pdf(pdf_path, item)
+            return cls._process_pdf(pdf_path, item, strict_validation)
         elif nxml_path:
-            return self._process_nxml(nxml_path, item)
+            return cls._process_nxml(nxml_path, item, strict_validation)
         
         return None
     
-    def _process_pdf(self, pdf_path: Path, item: Document) -> Optional[dict]:
+    @classmethod
+    def _process_pdf(cls, pdf_path: Path, item: Document, strict_validation: bool = False) -> Optional[dict]:
         """Process PDF document."""
         try:
             # Extract metadata
@@ -355,7 +660,7 @@ class DocumentProcessingPipeline(BasePipeline[Document, dict]):
                 return None
             
             # Validate blocks
-            validated_blocks = self._validate_blocks(text_blocks, PDFBlock)
+            validated_blocks = cls._validate_blocks(text_blocks, PDFBlock, strict_validation)
             
             return {
                 'format': 'pdf',
@@ -369,7 +674,8 @@ class DocumentProcessingPipeline(BasePipeline[Document, dict]):
             L.error(f"PDF processing failed for {item.external_id}: {str(e)}")
             return None
     
-    def _process_nxml(self, nxml_path: Path, item: Document) -> Optional[dict]:
+    @classmethod
+    def _process_nxml(cls, nxml_path: Path, item: Document, strict_validation: bool = False) -> Optional[dict]:
         """Process NXML document."""
         try:
             # Parse NXML with proper parameters
@@ -382,15 +688,12 @@ class DocumentProcessingPipeline(BasePipeline[Document, dict]):
             # Extract metadata
             nxml_metadata = parser.get_nxml_metadata()
             
-            # Extract blocks
             text_blocks = list(parser.extract_blocks())
-            
             if not text_blocks:
                 L.warning(f"No text blocks extracted from NXML: {item.external_id}")
                 return None
             
-            # Validate blocks
-            validated_blocks = self._validate_blocks(text_blocks, NXMLBlock)
+            validated_blocks = cls._validate_blocks(text_blocks, NXMLBlock, strict_validation)
             
             return {
                 'format': 'nxml',
@@ -404,27 +707,33 @@ class DocumentProcessingPipeline(BasePipeline[Document, dict]):
             L.error(f"NXML processing failed for {item.external_id}: {str(e)}")
             return None
     
-    def _validate_blocks(self, blocks: List, block_model) -> List:
-        """Validate extracted blocks using document validators."""
-        validators = create_biomedical_document_validators(
-            model=block_model,
-            required_fields=['block_id', 'doc_id', 'text'],
-            strict_schema=False
-        )
+    @staticmethod
+    def _validate_blocks(blocks: Iterable, block_model, strict_validation: bool = False) -> List:
+        """
+        Filter extracted blocks down to the ones worth storing.
         
-        composite_validator = CompositeValidator(validators, stop_on_first_error=False)
-        validated_blocks = []
+        Extractor output is trusted, so by default only the checks that can
+        reject a block are applied: required fields present and the minimum
+        text length (the biomedical vocabulary checks only ever warn). With
+        ``strict_validation`` every block goes through the full validators.
+        """
+        blocks = list(blocks)
+        if strict_validation:
+            composite_validator = _get_block_validator(block_model)
+            validated_blocks = [block for block in blocks if composite_validator.validate(block).is_valid]
+        else:
+            # Short texts fail on len() alone; only texts with padding pay for a strip() copy
+            validated_blocks = [
+                block for block in blocks
+                if block.block_id and block.doc_id and (text := block.text)
+                and len(text) >= MIN_BLOCK_TEXT_LENGTH
+                and (not (text[0].isspace() or text[-1].isspace())
+                     or len(text.strip()) >= MIN_BLOCK_TEXT_LENGTH)
+            ]
         
-        for block in blocks:
-            validation_result = composite_validator.validate(block)
-            
-            if validation_result.is_valid:
-                validated_blocks.append(block)
-            else:
-                L.warning(f"Block validation failed: {validation_result.errors}")
-                # Could choose to include blocks with warnings only
-                if not validation_result.errors and validation_result.warnings:
-                    validated_blocks.append(block)
+        rejected = len(blocks) - len(validated_blocks)
+        if rejected:
+            L.warning(f"Block validation rejected {rejected}/{len(blocks)} blocks")
         
         return validated_blocks
     
@@ -435,46 +744,19 @@ class DocumentProcessingPipeline(BasePipeline[Document, dict]):
             metadata = doc_info['metadata']
             blocks = doc_info['blocks']
             
-            # Store format-specific metadata in appropriate tables
+            # Ensure blocks carry the correct doc_id
+            for block in blocks:
+                block.doc_id = item.doc_id
+            
+            # Format-specific metadata goes to raw_pdf_metadata/raw_nxml_metadata,
+            # blocks to the generic blocks table. Rows are written on the next flush.
             if format_type == 'pdf':
-                # Store in raw_pdf_metadata table
-                CRUD.insert(
-                    table='raw_pdf_metadata',
-                    model=PDFMetadata,
-                    data=metadata
-                )
-                
-                # Store blocks in blocks table (generic)
-                for block in blocks:
-                    # Ensure block has correct doc_id
-                    block.doc_id = item.doc_id
-                
-                CRUD.bulk_insert(
-                    table='blocks',
-                    model=PDFBlock,
-                    data_list=blocks
-                )
-                
+                self._buffer_rows('raw_pdf_metadata', [metadata])
             elif format_type == 'nxml':
-                # Store in raw_nxml_metadata table
-                CRUD.insert(
-                    table='raw_nxml_metadata',
-                    model=NXMLMetadata,
-                    data=metadata
-                )
-                
-                # Store blocks in blocks table (generic)
-                for block in blocks:
-                    # Ensure block has correct doc_id
-                    block.doc_id = item.doc_id
-                
-                CRUD.bulk_insert(
-                    table='blocks',
-                    model=NXMLBlock,
-                    data_list=blocks
-                )
+                self._buffer_rows('raw_nxml_metadata', [metadata])
+            self._buffer_rows('blocks', blocks)
             
-            L.info(f"Stored {format_type} metadata and {len(blocks)} blocks for {item.external_id}")
+            L.info(f"Queued {format_type} metadata and {len(blocks)} blocks for {item.external_id}")
             return True
             
         except Exception as e:
@@ -485,99 +767,297 @@ class DocumentProcessingPipeline(BasePipeline[Document, dict]):
         """Process blocks with AI models for NER and embeddings."""
         try:
             ner_results = []
-            embeddings = []
+            embeddings = None
+            ner_future = None
+            embedding_future = None
             
-            # Process each block
-            for block in blocks:
-                # Named Entity Recognition
-                if self.ner_model:
-                    try:
-                        ner_result = self.ner_model.run(
-                            text=block.text,
-                            doc_id=block.doc_id,
-                            block_id=block.block_id
-                        )
-                        ner_results.append(ner_result)
-                    except Exception as e:
-                        L.warning(f"NER failed for block {block.block_id}: {str(e)}")
-                
-                # Embedding generation
-                if self.embedding_model:
-                    try:
-                        embedding = self.embedding_model.run(
-                            text=block.text,
-                            doc_id=block.doc_id,
-                            block_id=block.block_id,
-                            page=getattr(block, 'page', 1)
-                        )
-                        embeddings.append(embedding)
-                    except Exception as e:
-                        L.warning(f"Embedding generation failed for block {block.block_id}: {str(e)}")
+            texts = [block.text for block in blocks]
+            doc_ids = [block.doc_id for block in blocks]
+            block_ids = [block.block_id for block in blocks]
+            
+            # Named Entity Recognition, batched across all blocks of the document
+            if self.ner_model:
+                ner_future = self._ai_executor.submit(
+                    self._run_on_stream, self._ner_stream, self.ner_model.run_batch,
+                    texts, doc_ids=doc_ids, block_ids=block_ids, batch_size=32
+                )
+            
+            # Embedding generation, concurrently with NER
+            if self.embedding_model:
+                embedding_future = self._ai_executor.submit(
+                    self._run_on_stream, self._embedding_stream, self.embedding_model.embed_batch,
+                    texts, max_tokens_per_batch=8192
+                )
+            
+            if ner_future:
+                try:
+                    ner_results = ner_future.result()
+                except Exception as e:
+                    L.warning(f"NER failed for {len(blocks)} blocks: {str(e)}")
+            
+            if embedding_future:
+                try:
+                    embeddings = embedding_future.result()
+                except Exception as e:
+                    L.warning(f"Embedding generation failed for {len(blocks)} blocks: {str(e)}")
             
             # Store NER results
             if ner_results:
-                CRUD.bulk_insert(
-                    table='bio_blocks',
-                    model=BiomedicalEntityBlock,
-                    data_list=ner_results
-                )
+                self._buffer_rows('bio_blocks', ner_results)
             
-            # Store embeddings in Qdrant
-            if embeddings and self.qdrant_client:
-                points = [
-                    PointStruct(
-                        id=embedding.block_id,
-                        vector=embedding.embedding,
-                        payload={
-                            "doc_id": embedding.doc_id,
-                            "page": embedding.page,
-                            "text": embedding.text[:1000],  # Limit text size
-                        }
-                    )
-                    for embedding in embeddings
-                ]
-                
-                self.qdrant_client.upsert_embeddings_bulk(points)
+            # Store embeddings in Qdrant; vectors stay one matrix per document
+            if embeddings is not None and len(embeddings) and self.qdrant_client:
+                self._point_ids.extend(block_ids)
+                self._point_doc_ids.update(doc_ids)
+                self._point_vectors.append(embeddings)
+                # Text stays in SQLite; QdrantCRUD.get_similar_blocks joins it back
+                self._point_payloads.extend(
+                    {"doc_id": block.doc_id, "page": getattr(block, 'page', 1), "block_id": block.block_id, "table": "blocks"}
+                    for block in blocks
+                )
+                self._flush_points(min_size=self.qdrant_flush_threshold)
             
             return {
                 'ner_count': len(ner_results),
-                'embedding_count': len(embeddings)
+                'embedding_count': 0 if embeddings is None else len(embeddings)
             }
             
         except Exception as e:
             L.error(f"AI processing failed: {str(e)}")
             return None
     
-    def _mark_as_processed(self, item: Document):
-        """Mark document as processed in database."""
+    @staticmethod
+    def _run_on_stream(stream, fn, *args, **kwargs):
+        """Call ``fn`` with ``stream`` as the current CUDA stream (if any)."""
+        if stream is None:
+            return fn(*args, **kwargs)
+        with torch.cuda.stream(stream):
+            result = fn(*args, **kwargs)
+        stream.synchronize()
+        return result
+    
+    def _buffer_rows(self, table: str, rows: List):
+        """Queue rows for the next SQLite flush, grouped by table and model."""
+        if not rows:
+            return
+        self._row_buffer.setdefault((table, type(rows[0])), []).extend(rows)
+        self._buffered_row_count += len(rows)
+    
+    def _flush_rows(self, min_size: int = 0):
+        """
+        Write buffered rows in a single transaction once ``min_size`` are pending.
+        
+        Documents are only marked as processed after their rows are committed,
+        so a crash mid-run leaves them to be picked up again. Pending Qdrant
+        points are uploaded first; documents whose points failed to upload get
+        neither rows nor flag, so the next run processes them from scratch.
+        """
+        if not self._row_buffer and not self._pending_processed:
+            return
+        if self._buffered_row_count < min_size:
+            return
+        
+        self._flush_points()
+        failed_uploads, self._failed_point_doc_ids = self._failed_point_doc_ids, set()
+        
+        batches = [(table, rows) for (table, _), rows in self._row_buffer.items()]
+        doc_ids, self._pending_processed = self._pending_processed, []
+        self._row_buffer = {}
+        self._buffered_row_count = 0
+        
+        if failed_uploads:
+            batches = [
+                (table, [row for row in rows if row.doc_id not in failed_uploads])
+                for table, rows in batches
+            ]
+            unwritten = [doc_id for doc_id in doc_ids if doc_id in failed_uploads]
+            doc_ids = [doc_id for doc_id in doc_ids if doc_id not in failed_uploads]
+            if unwritten:
+                error_msg = f"Skipped storing {len(unwritten)} documents whose vectors failed to upload"
+                L.error(error_msg)
+                self._write_errors.append(error_msg)
+                self._unwritten_documents += len(unwritten)
+        
+        try:
+            # Rows and their processed flags commit together in one transaction
+            with CRUD.transaction() as conn:
+                for table, rows in batches:
+                    if rows:
+                        CRUD.insert_rows(conn, table, rows)
+                if doc_ids:
+                    CRUD.update_where_in(conn, 'documents', 'doc_id', doc_ids, {'processed': True})
+            L.debug(f"Flushed {sum(len(rows) for _, rows in batches)} rows for {len(doc_ids)} documents")
+        except Exception as e:
+            # Rows and flags were rolled back, so these documents stay unprocessed
+            # and are picked up again next run; run() reports them as failed
+            error_msg = f"Failed to flush rows for {len(doc_ids)} documents: {str(e)}"
+            L.error(error_msg)
+            self._write_errors.append(error_msg)
+            self._unwritten_documents += len(doc_ids)
+    
+    def _account_for_write_failures(self, result: PipelineResult) -> PipelineResult:
+        """Move documents whose buffered data was never stored from processed to failed."""
+        if not self._unwritten_documents:
+            return result
+        
+        unwritten = min(self._unwritten_documents, result.processed_count)
+        result.processed_count -= unwritten
+        result.failed_count += unwritten
+        result.errors.extend(self._write_errors)
+        if result.processed_count == 0:
+            result.status = PipelineStatus.FAILED
+        else:
+            result.warnings.append(f"{unwritten} processed documents could not be written to the database")
+        return result
+    
+    def _flush_points(self, min_size: int = 0):
+        """Upload buffered Qdrant points once at least ``min_size`` are pending."""
+        if not self.qdrant_client or not self._point_ids or len(self._point_ids) < min_size:
+            return
+        
+        ids, self._point_ids = self._point_ids, []
+        vectors, self._point_vectors = self._point_vectors, []
+        payloads, self._point_payloads = self._point_payloads, []
+        doc_ids, self._point_doc_ids = self._point_doc_ids, set()
         try:
-            CRUD.update(
-                table='documents',
-                model=Document,
-                updates={"processed": True},
-                id_field='doc_id',
-                id_value=item.doc_id
+            self.qdrant_client.upload_vectors_bulk(
+                ids,
+                torch.cat(vectors).numpy(),
+                payloads,
+                batch_size=self.qdrant_batch_size,
+                parallel=self.qdrant_parallel,
+                wait=False
             )
+            L.debug(f"Uploaded {len(ids)} points to Qdrant")
         except Exception as e:
-            L.error(f"Failed to mark document as processed: {str(e)}")
+            # _flush_rows keeps these documents unprocessed so they are retried
+            L.error(f"Failed to upload {len(ids)} points to Qdrant: {str(e)}")
+            self._failed_point_doc_ids.update(doc_ids)
     
-    def _cleanup_temp_dir(self, temp_dir: Path):
-        """Clean up temporary directory."""
+    def run(self) -> PipelineResult:
+        """Run the pipeline with Qdrant index building paused during ingest."""
+        # Parse jobs are submitted from download-thread callbacks, so these
+        # pools must not fork; see _process_pool
+        if self.parse_workers != 0:
+            self._parse_pool = _process_pool(self.parse_workers)
+        if self.extract_workers != 0:
+            self._extract_pool = _process_pool(
+                self.extract_workers or min(os.cpu_count() or 1, self.max_concurrent_downloads)
+            )
+        # Shared by all downloads, so max_concurrent_downloads also bounds prefetching
+        self._download_pool = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_downloads, thread_name_prefix="download"
+        )
+        # Finished directories are deleted off the processing threads, in order
+        self._cleanup_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cleanup")
+        self._ai_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ai")
+        
+        self._unwritten_documents = 0
+        self._write_errors = []
+        
+        restore_threshold = None
+        if self.qdrant_client and self.disable_indexing_during_upload:
+            try:
+                restore_threshold = self.qdrant_client.get_indexing_threshold() or DEFAULT_INDEXING_THRESHOLD
+                self.qdrant_client.set_indexing_threshold(0)
+            except Exception as e:
+                restore_threshold = None
+                L.warning(f"Could not disable Qdrant indexing: {str(e)}")
+        
         try:
-            if temp_dir.exists():
+            result = super().run()
+        finally:
+            # Anything still prefetched belongs to a batch that will never run
+            for doc_id in list(self._prefetched):
+                self._discard_prefetched(doc_id)
+            if self._parse_pool:
+                self._parse_pool.shutdown()
+                self._parse_pool = None
+            if self._extract_pool:
+                self._extract_pool.shutdown()
+                self._extract_pool = None
+            if self.cleanup_temp_files:
+                # Removals run in submission order, so the last one finishing means all have
+                self._flush_temp_dirs().result()
+                try:
+                    self.run_temp_dir.rmdir()
+                except OSError:
+                    pass
+            # Uploads the remaining points, then commits rows and flags
+            self._flush_rows()
+            if self.qdrant_client and restore_threshold is not None:
+                try:
+                    self.qdrant_client.set_indexing_threshold(restore_threshold)
+                except Exception as e:
+                    L.warning(f"Could not restore Qdrant indexing threshold: {str(e)}")
+            for pool in (self._download_pool, self._cleanup_pool, self._ai_executor):
+                pool.shutdown()
+            self._download_pool = self._cleanup_pool = self._ai_executor = None
+        
+        # The final flushes above can still fail documents counted as processed
+        return self._account_for_write_failures(result)
+    
+    def _mark_as_processed(self, item: Document):
+        """Mark document as processed once its buffered rows are committed."""
+        self._pending_processed.append(item.doc_id)
+        self._flush_rows(min_size=ROW_BUFFER_SIZE)
+    
+    def _cleanup_temp_dir(self, temp_dir: Path):
+        """Queue an article directory for removal; directories are removed in groups."""
+        # Only ever remove directories under the pipeline's own temp root
+        if self.temp_root not in temp_dir.parents:
+            L.warning(f"Refusing to clean up directory outside temp root: {temp_dir}")
+            return
+        self._finished_temp_dirs.append(temp_dir)
+        if len(self._finished_temp_dirs) >= TEMP_CLEANUP_INTERVAL:
+            self._flush_temp_dirs()
+    
+    def _flush_temp_dirs(self) -> Future:
+        """Hand all queued article directories to the cleanup thread for removal."""
+        temp_dirs, self._finished_temp_dirs = self._finished_temp_dirs, []
+        return self._cleanup_pool.submit(self._remove_temp_dirs, temp_dirs)
+    
+    @staticmethod
+    def _remove_temp_dirs(temp_dirs: List[Path]):
+        """Delete article directories; runs on the cleanup thread."""
+        for temp_dir in temp_dirs:
+            try:
                 shutil.rmtree(temp_dir)
-        except Exception as e:
-            L.warning(f"Failed to cleanup temp directory {temp_dir}: {str(e)}")
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                L.warning(f"Failed to cleanup temp directory {temp_dir}: {str(e)}")
     
     def store_item(self, item: dict) -> bool:
         """Store pipeline result (processing is handled in process_item)."""
         return item is not None
 
+def prewarm_ai_models(
+    enable_ai: bool = True,
+    enable_embeddings: bool = True,
+    quantize_models: bool = False,
+    compile_models: bool = False
+):
+    """
+    Load the BioBERT models into the process-wide cache ahead of the first run.
+    
+    Pipelines constructed later with the same settings reuse them instead of
+    loading from disk, which matters for long-lived processes like the scheduler.
+    """
+    if enable_ai:
+        _get_ner_model(quantize_models, compile_models)
+    if enable_embeddings:
+        _get_embedding_model(quantize_models, compile_models)
+
 def run_document_processing_pipeline(
     batch_size: int = 5,
     max_articles: Optional[int] = None,
+    max_concurrent_downloads: int = 3,
+    parse_workers: Optional[int] = None,
     enable_ai: bool = True,
-    enable_embeddings: bool = True
+    enable_embeddings: bool = True,
+    quantize_models: bool = False,
+    compile_models: bool = False
 ) -> PipelineResult:
     """
     Execute the document processing pipeline.
@@ -585,8 +1065,12 @@ def run_document_processing_pipeline(
     Args:
         batch_size: Number of documents to process simultaneously
         max_articles: Maximum documents to process (None for all)
+        max_concurrent_downloads: Number of documents downloaded at the same time
+        parse_workers: Parser processes (None for one per core, 0 to parse in-process)
         enable_ai: Whether to run AI processing (NER/embeddings)
         enable_embeddings: Whether to generate embeddings
+        quantize_models: Run BioBERT models in int8 (CPU) / fp16 (CUDA)
+        compile_models: Compile BioBERT models with torch.compile
         
     Returns:
         PipelineResult with execution statistics
@@ -625,8 +1109,12 @@ def run_document_processing_pipeline(
     # Initialize and run pipeline
     pipeline = DocumentProcessingPipeline(
         batch_size=batch_size,
+        max_concurrent_downloads=max_concurrent_downloads,
+        parse_workers=parse_workers,
         enable_ai_processing=enable_ai,
-        enable_embeddings=enable_embeddings
+        enable_embeddings=enable_embeddings,
+        quantize_models=quantize_models,
+        compile_models=compile_models
     )
     
     result = pipeline.run()
@@ -649,16 +1137,24 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run document processing pipeline")
     parser.add_argument("--batch-size", type=int, default=5, help="Batch size")
     parser.add_argument("--max-articles", type=int, help="Maximum articles to process")
+    parser.add_argument("--max-downloads", type=int, default=3, help="Concurrent document downloads")
+    parser.add_argument("--parse-workers", type=int, help="Parser processes (default: one per core, 0 disables)")
     parser.add_argument("--no-ai", action="store_true", help="Disable AI processing")
     parser.add_argument("--no-embeddings", action="store_true", help="Disable embeddings")
+    parser.add_argument("--quantize", action="store_true", help="Run BioBERT models in reduced precision")
+    parser.add_argument("--compile", action="store_true", help="Compile BioBERT models with torch.compile")
     
     args = parser.parse_args()
     
     result = run_document_processing_pipeline(
         batch_size=args.batch_size,
         max_articles=args.max_articles,
+        max_concurrent_downloads=args.max_downloads,
+        parse_workers=args.parse_workers,
         enable_ai=not args.no_ai,
-        enable_embeddings=not args.no_embeddings
+        enable_embeddings=not args.no_embeddings,
+        quantize_models=args.quantize,
+        compile_models=args.compile
     )
     
     exit(0 if result.status.value == "success" else 1)
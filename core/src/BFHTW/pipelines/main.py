@@ -12,7 +12,6 @@ from typing import Optional
 
 from BFHTW.pipelines.pipeline_manager import PipelineManager, create_pipeline_manager
 from BFHTW.pipelines.pubmed_pmc.pubmed_metadata_pipeline import run_pubmed_metadata_pipeline
-from BFHTW.pipelines.document_processing_pipeline import run_document_processing_pipeline
 from BFHTW.utils.logs import get_logger
 
 L = get_logger()
@@ -96,6 +95,8 @@ def run_pipeline_command(args) -> int:
             strict_validation=not args.lenient
         )
     elif args.pipeline == 'document_processing':
+        # Imported here so commands that never touch documents skip loading torch
+        from BFHTW.pipelines.document_processing_pipeline import run_document_processing_pipeline
         result = run_document_processing_pipeline(
             batch_size=args.batch_size,
             max_articles=args.max_articles,
@@ -126,6 +127,17 @@ def run_scheduler_command(args) -> int:
     
     try:
         manager = create_pipeline_manager(args.config)
+        
+        # Load BioBERT once up front; every scheduled run reuses the cached models
+        doc_config = manager.pipelines.get('document_processing')
+        if doc_config and doc_config.enabled and doc_config.parameters.get('enable_ai_processing', True):
+            from BFHTW.pipelines.document_processing_pipeline import prewarm_ai_models
+            prewarm_ai_models(
+                enable_embeddings=doc_config.parameters.get('enable_embeddings', True),
+                quantize_models=doc_config.parameters.get('quantize_models', False),
+                compile_models=doc_config.parameters.get('compile_models', False)
+            )
+        
         manager.start_scheduler()  # Runs indefinitely
         return 0
     except Exception as e:
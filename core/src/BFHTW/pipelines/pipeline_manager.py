@@ -4,21 +4,35 @@ Pipeline configuration and management utilities.
 Provides centralized configuration, scheduling, and monitoring for all pipelines.
 """
 
-from typing import Dict, List, Any, Optional, Type, Union
+from typing import Deque, Dict, List, Any, Optional, Tuple, Type, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
+from collections import deque
 from pathlib import Path
+import functools
+import importlib
+import itertools
 import json
 import yaml
 from datetime import datetime, timedelta
 import schedule
-import time
+import threading
+import uuid
 
 from BFHTW.pipelines.base_pipeline import BasePipeline, PipelineResult, PipelineStatus
 from BFHTW.utils.logs import get_logger
 
 L = get_logger()
 
+# Executions kept in memory for status reporting
+MAX_EXECUTION_HISTORY = 10_000
+
+# libyaml's C loader when PyYAML was built with it, the pure-Python one otherwise
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 class ScheduleType(Enum):
     """Pipeline schedule types."""
     MANUAL = "manual"
@@ -27,7 +41,7 @@ class ScheduleType(Enum):
     WEEKLY = "weekly"
     CRON = "cron"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PipelineConfig:
     """Configuration for a single pipeline."""
     name: str
@@ -41,14 +55,15 @@ class PipelineConfig:
     dependencies: Optional[List[str]] = None
     
     def __post_init__(self):
+        # Frozen, so defaults are filled in through object.__setattr__
         if self.schedule_params is None:
-            self.schedule_params = {}
+            object.__setattr__(self, 'schedule_params', {})
         if self.parameters is None:
-            self.parameters = {}
+            object.__setattr__(self, 'parameters', {})
         if self.dependencies is None:
-            self.dependencies = []
+            object.__setattr__(self, 'dependencies', [])
 
-@dataclass
+@dataclass(slots=True)
 class PipelineExecution:
     """Record of pipeline execution."""
     pipeline_name: str
@@ -67,11 +82,27 @@ class PipelineManager:
     def __init__(self, config_file: Optional[str] = None):
         self.config_file = Path(config_file) if config_file else Path("pipeline_config.yaml")
         self.pipelines: Dict[str, PipelineConfig] = {}
-        self.executions: List[PipelineExecution] = []
+        # Bounded so long-running schedulers do not accumulate history forever
+        self.executions: Deque[PipelineExecution] = deque(maxlen=MAX_EXECUTION_HISTORY)
+        # Most recently started execution per pipeline
+        self._last_by_name: Dict[str, PipelineExecution] = {}
         self.running_pipelines: Dict[str, PipelineExecution] = {}
+        # Most recent successful execution per pipeline, for dependency checks
+        self._last_success: Dict[str, PipelineExecution] = {}
+        # Bumped whenever an execution starts or finishes; status dicts are cached per version
+        self._status_version = 0
+        self._status_cache: Tuple[int, Dict[Optional[str], Dict[str, Any]]] = (-1, {})
+        self._stop = threading.Event()
+        # Runs that outlived their timeout; the pipeline stays in running_pipelines
+        # until its thread really finishes, so it cannot be started twice
+        self._abandoned: Dict[str, threading.Thread] = {}
+        self._abandoned_lock = threading.Lock()
+        # Scheduled jobs are tagged per manager so a reload only clears its own
+        self._schedule_tag = f"pipeline-manager-{id(self)}"
         
         # Load configuration
         self.load_config()
+        self._config_mtime = self._read_config_mtime()
         
         # Setup scheduling
         self.setup_schedules()
@@ -84,11 +115,7 @@ class PipelineManager:
             return
         
         try:
-            with open(self.config_file, 'r') as f:
-                if self.config_file.suffix.lower() == '.yaml':
-                    config_data = yaml.safe_load(f)
-                else:
-                    config_data = json.load(f)
+            config_data = self._read_config_data()
             
             for name, config in config_data.get('pipelines', {}).items():
                 self.pipelines[name] = PipelineConfig(
@@ -102,6 +129,69 @@ class PipelineManager:
             L.error(f"Failed to load pipeline config: {str(e)}")
             self.create_default_config()
     
+    def _read_config_data(self) -> Dict[str, Any]:
+        """
+        Read the config file, preferring a JSON cache of a YAML config.
+        
+        The cache sits next to the YAML file and is reused while it is at least
+        as new as the YAML; otherwise the YAML is parsed and the cache rewritten.
+        """
+        if self.config_file.suffix.lower() != '.yaml':
+            with open(self.config_file, 'r') as f:
+                return json.load(f)
+        
+        cache_file = self.config_file.with_suffix('.yaml.json')
+        try:
+            if cache_file.stat().st_mtime >= self.config_file.stat().st_mtime:
+                with open(cache_file, 'r') as f:
+                    return json.load(f)
+        except (OSError, ValueError):
+            pass
+        
+        with open(self.config_file, 'r') as f:
+            config_data = yaml.load(f, Loader=SafeLoader)
+        try:
+            cache_file.write_text(json.dumps(config_data))
+        except (OSError, TypeError) as e:
+            L.debug(f"Could not write config cache {cache_file}: {str(e)}")
+        return config_data
+    
+    def _read_config_mtime(self) -> Optional[float]:
+        """Modification time of the config file, or None if it does not exist."""
+        try:
+            return self.config_file.stat().st_mtime
+        except OSError:
+            return None
+    
+    def config_changed(self) -> bool:
+        """Whether the config file was modified since it was last loaded."""
+        return self._read_config_mtime() != self._config_mtime
+    
+    def reload_config(self):
+        """
+        Re-read the config file and re-register scheduled jobs.
+        
+        Execution history, running pipelines and dependency state are kept, so
+        a reload never lets a running pipeline start a second time. If the file
+        cannot be read the current configuration stays in place.
+        """
+        self._config_mtime = self._read_config_mtime()
+        try:
+            config_data = self._read_config_data()
+            pipelines = {
+                name: PipelineConfig(name=name, **config)
+                for name, config in config_data.get('pipelines', {}).items()
+            }
+        except Exception as e:
+            L.error(f"Failed to reload pipeline config, keeping the current one: {str(e)}")
+            return
+        
+        schedule.clear(self._schedule_tag)
+        self.pipelines = pipelines
+        self.setup_schedules()
+        self._status_version += 1
+        L.info(f"Reloaded pipeline configuration from {self.config_file}")
+    
     def create_default_config(self):
         """Create default pipeline configuration."""
         default_config = {
@@ -155,16 +245,16 @@ class PipelineManager:
             
             try:
                 if config.schedule_type == ScheduleType.HOURLY:
-                    schedule.every().hour.do(self.run_pipeline, pipeline_name)
+                    schedule.every().hour.do(self.run_pipeline, pipeline_name).tag(self._schedule_tag)
                     
                 elif config.schedule_type == ScheduleType.DAILY:
                     time_str = config.schedule_params.get('time', '02:00')
-                    schedule.every().day.at(time_str).do(self.run_pipeline, pipeline_name)
+                    schedule.every().day.at(time_str).do(self.run_pipeline, pipeline_name).tag(self._schedule_tag)
                     
                 elif config.schedule_type == ScheduleType.WEEKLY:
                     day = config.schedule_params.get('day', 'monday')
                     time_str = config.schedule_params.get('time', '02:00')
-                    getattr(schedule.every(), day).at(time_str).do(self.run_pipeline, pipeline_name)
+                    getattr(schedule.every(), day).at(time_str).do(self.run_pipeline, pipeline_name).tag(self._schedule_tag)
                 
                 L.info(f"Scheduled pipeline '{pipeline_name}' for {config.schedule_type.value} execution")
                 
@@ -202,7 +292,7 @@ class PipelineManager:
             L.error(f"Dependencies not satisfied for pipeline '{pipeline_name}'")
             return None
         
-        execution_id = f"{pipeline_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        execution_id = f"{pipeline_name}_{uuid.uuid4().hex[:12]}"
         execution = PipelineExecution(
             pipeline_name=pipeline_name,
             execution_id=execution_id,
@@ -211,6 +301,8 @@ class PipelineManager:
         
         self.running_pipelines[pipeline_name] = execution
         self.executions.append(execution)
+        self._last_by_name[pipeline_name] = execution
+        self._status_version += 1
         
         L.info(f"Starting pipeline '{pipeline_name}' (execution: {execution_id})")
         
@@ -219,7 +311,7 @@ class PipelineManager:
             pipeline_instance = self._create_pipeline_instance(config, override_params)
             
             # Run pipeline with timeout
-            result = self._run_with_timeout(pipeline_instance, config.max_runtime_minutes)
+            result = self._run_with_timeout(pipeline_name, pipeline_instance, config.max_runtime_minutes)
             
             # Update execution record
             execution.end_time = datetime.now()
@@ -228,6 +320,7 @@ class PipelineManager:
             
             # Log result
             if result and result.status == PipelineStatus.SUCCESS:
+                self._last_success[pipeline_name] = execution
                 L.info(f"Pipeline '{pipeline_name}' completed successfully")
             else:
                 L.error(f"Pipeline '{pipeline_name}' failed")
@@ -245,26 +338,22 @@ class PipelineManager:
             return None
             
         finally:
-            # Remove from running pipelines
-            if pipeline_name in self.running_pipelines:
-                del self.running_pipelines[pipeline_name]
+            # Remove from running pipelines, unless a timed-out run is still going
+            with self._abandoned_lock:
+                if pipeline_name not in self._abandoned:
+                    self.running_pipelines.pop(pipeline_name, None)
+                self._status_version += 1
     
     def _check_dependencies(self, config: PipelineConfig) -> bool:
         """Check if pipeline dependencies are satisfied."""
         if not config.dependencies:
             return True
         
+        cutoff = datetime.now() - timedelta(hours=24)
         for dep_name in config.dependencies:
             # Check if dependency ran successfully recently
-            recent_executions = [
-                ex for ex in self.executions
-                if ex.pipeline_name == dep_name
-                and ex.status == PipelineStatus.SUCCESS
-                and ex.end_time
-                and ex.end_time > datetime.now() - timedelta(hours=24)
-            ]
-            
-            if not recent_executions:
+            last_success = self._last_success.get(dep_name)
+            if not last_success or last_success.end_time <= cutoff:
                 L.warning(f"Dependency '{dep_name}' has no recent successful executions")
                 return False
         
@@ -272,10 +361,7 @@ class PipelineManager:
     
     def _create_pipeline_instance(self, config: PipelineConfig, override_params: Dict) -> BasePipeline:
         """Create pipeline instance from configuration."""
-        # Import pipeline class
-        module_path, class_name = config.pipeline_class.rsplit('.', 1)
-        module = __import__(module_path, fromlist=[class_name])
-        pipeline_class = getattr(module, class_name)
+        pipeline_class = _resolve_class(config.pipeline_class)
         
         # Merge parameters
         params = {**config.parameters, **override_params}
@@ -283,15 +369,91 @@ class PipelineManager:
         # Create instance
         return pipeline_class(**params)
     
-    def _run_with_timeout(self, pipeline: BasePipeline, timeout_minutes: int) -> Optional[PipelineResult]:
-        """Run pipeline with timeout."""
-        # TODO: Implement proper timeout handling
-        # For now, just run the pipeline normally
-        return pipeline.run()
+    def _run_with_timeout(
+        self,
+        pipeline_name: str,
+        pipeline: BasePipeline,
+        timeout_minutes: int
+    ) -> Optional[PipelineResult]:
+        """
+        Run pipeline with timeout.
+        
+        The pipeline runs on a daemon watchdog thread. If it is still running after
+        ``timeout_minutes`` a FAILED result is returned so the caller and any
+        dependent pipelines can move on. Python cannot kill the thread, so the
+        run is recorded as abandoned and ``pipeline_name`` stays marked running
+        until the thread finishes, which keeps the scheduler from starting a
+        second run against the same database and collection.
+        """
+        if not timeout_minutes or timeout_minutes <= 0:
+            return pipeline.run()
+        
+        outcome: Dict[str, Any] = {}
+        
+        def target():
+            try:
+                outcome["result"] = pipeline.run()
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                with self._abandoned_lock:
+                    outcome["done"] = True
+                    if self._abandoned.get(pipeline_name) is threading.current_thread():
+                        del self._abandoned[pipeline_name]
+                        self.running_pipelines.pop(pipeline_name, None)
+                        self._status_version += 1
+                        L.warning(f"Abandoned run of pipeline '{pipeline_name}' has finished")
+        
+        worker = threading.Thread(target=target, name=f"pipeline-{pipeline.name}", daemon=True)
+        worker.start()
+        worker.join(timeout_minutes * 60)
+        
+        with self._abandoned_lock:
+            timed_out = not outcome.get("done")
+            if timed_out:
+                self._abandoned[pipeline_name] = worker
+        
+        if timed_out:
+            error_msg = (
+                f"Pipeline '{pipeline.name}' exceeded {timeout_minutes} minute timeout; "
+                f"its thread {worker.name} is still running and blocks new runs until it finishes"
+            )
+            L.error(error_msg)
+            return PipelineResult(
+                status=PipelineStatus.FAILED,
+                execution_time=timeout_minutes * 60.0,
+                errors=[error_msg]
+            )
+        
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome.get("result")
     
     def get_pipeline_status(self, pipeline_name: Optional[str] = None) -> Dict[str, Any]:
-        """Get status of pipelines."""
+        """
+        Get status of pipelines.
+        
+        Results are cached until an execution starts or finishes, so treat the
+        returned dict as read-only.
+        """
+        version, cached = self._status_cache
+        if version != self._status_version:
+            cached = {}
+            self._status_cache = (self._status_version, cached)
+        if pipeline_name not in cached:
+            cached[pipeline_name] = self._build_pipeline_status(pipeline_name)
+        return cached[pipeline_name]
+    
+    def _build_pipeline_status(self, pipeline_name: Optional[str]) -> Dict[str, Any]:
+        """Serialize the current state of one or all pipelines."""
         if pipeline_name:
+            abandoned = self._abandoned.get(pipeline_name)
+            if abandoned is not None:
+                return {
+                    "status": "abandoned",
+                    "thread": abandoned.name,
+                    "execution": asdict(self.running_pipelines[pipeline_name])
+                }
             if pipeline_name in self.running_pipelines:
                 return {
                     "status": "running",
@@ -306,33 +468,72 @@ class PipelineManager:
         else:
             return {
                 "running": {name: asdict(ex) for name, ex in self.running_pipelines.items()},
-                "recent_executions": [asdict(ex) for ex in self.executions[-10:]]
+                # Timed-out runs whose threads are still alive, by pipeline name
+                "abandoned": {name: worker.name for name, worker in self._abandoned.items()},
+                "recent_executions": [
+                    asdict(ex)
+                    for ex in itertools.islice(self.executions, max(0, len(self.executions) - 10), None)
+                ]
             }
     
     def _get_recent_execution(self, pipeline_name: str) -> Optional[PipelineExecution]:
         """Get most recent execution for a pipeline."""
-        executions = [ex for ex in self.executions if ex.pipeline_name == pipeline_name]
-        return max(executions, key=lambda x: x.start_time) if executions else None
+        return self._last_by_name.get(pipeline_name)
     
     def start_scheduler(self):
         """Start the pipeline scheduler."""
         L.info("Starting pipeline scheduler...")
+        self._stop.clear()
         
-        while True:
+        while not self._stop.is_set():
             try:
+                # Sleep until the next job is due (hourly re-check if nothing is scheduled)
+                idle = schedule.idle_seconds()
+                if idle is None:
+                    idle = 3600
+                if idle > 0 and self._stop.wait(timeout=idle):
+                    break
                 schedule.run_pending()
-                time.sleep(60)  # Check every minute
             except KeyboardInterrupt:
-                L.info("Pipeline scheduler stopped")
                 break
             except Exception as e:
                 L.error(f"Scheduler error: {str(e)}")
-                time.sleep(60)
+                self._stop.wait(timeout=60)
+        
+        L.info("Pipeline scheduler stopped")
+    
+    def stop_scheduler(self):
+        """Wake and stop a running `start_scheduler` loop."""
+        self._stop.set()
+
+@functools.lru_cache(maxsize=None)
+def _resolve_class(dotted_path: str) -> Type:
+    """Import and return the class named by a dotted path."""
+    module_path, class_name = dotted_path.rsplit('.', 1)
+    return getattr(importlib.import_module(module_path), class_name)
+
+# Managers shared per resolved config path
+_managers: Dict[Path, PipelineManager] = {}
+_managers_lock = threading.Lock()
 
 # Convenience functions
-def create_pipeline_manager(config_file: Optional[str] = None) -> PipelineManager:
-    """Create and configure pipeline manager."""
-    return PipelineManager(config_file)
+def create_pipeline_manager(config_file: Optional[str] = None, reload: bool = False) -> PipelineManager:
+    """
+    Return the pipeline manager for a config file, creating it on first use.
+    
+    Managers are shared per resolved config path, so jobs are registered with
+    the global scheduler only once and execution history (used for dependency
+    checks) survives across calls. The shared manager re-reads its config when
+    the file has changed since it was loaded, or when ``reload`` is True.
+    """
+    config_path = Path(config_file if config_file else "pipeline_config.yaml").resolve()
+    with _managers_lock:
+        manager = _managers.get(config_path)
+        if manager is None:
+            manager = _managers[config_path] = PipelineManager(str(config_path))
+        elif reload or manager.config_changed():
+            manager.reload_config()
+        return manager
 
 def run_pipeline_by_name(pipeline_name: str, manager: Optional[PipelineManager] = None) -> Optional[PipelineResult]:
     """Run a specific pipeline by name."""
@@ -2,167 +2,222 @@ from BFHTW.utils.logs import get_logger
 from BFHTW.utils.crud.crud import CRUD
 from BFHTW.models.pubmed_pmc import PMCArticleMetadata
 from BFHTW.utils.io.tarball_fetcher import TarballFetcher
-from BFHTW.ai_assistants.internal.bio_bert.biobert_ner import BioBERTNER
-from BFHTW.ai_assistants.internal.bio_bert.biobert_embeddings import BioBERTEmbedder
 from BFHTW.utils.pdf.pdf_metadata import PDFReadMeta
 from BFHTW.utils.pdf.pdf_block_extractor import PDFBlockExtractor
 from BFHTW.models.pdf_models import PDFMetadata, PDFBlock
-from BFHTW.utils.qdrant.qdrant_crud import QdrantCRUD
 
 import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from urllib.parse import urljoin
-from qdrant_client.models import PointStruct
 
 
 L = get_logger()
 
-# Step 1: Get next unprocessed path
-unprocessed_paths = CRUD.get(
-    table='pubmed_fulltext_links',
-    model=PMCArticleMetadata,
-    id_field='full_text_downloaded',
-    id_value=False
-)
-
-if not unprocessed_paths:
-    L.info("No unprocessed files left.")
-    exit()
+BASE_URL = "https://ftp.ncbi.nlm.nih.gov/pub/pmc/"
+# Articles downloaded and extracted at once while earlier ones are parsed and embedded
+DOWNLOAD_WORKERS = 4
+# Points are buffered across articles and uploaded to Qdrant in groups of at least this size
+QDRANT_UPLOAD_THRESHOLD = 1024
+
+base_dir = Path(__file__).parents[1]
+temp_root = base_dir / 'sources' / 'pubmed_pmc' / 'temp'
+
+# One pooled HTTP session shared by the download workers. The PDF readers use
+# PyMuPDF, which is not thread-safe, so they are only called from the main thread
+fetcher = TarballFetcher(base_dir)
+meta_reader = PDFReadMeta()
+block_extractor = PDFBlockExtractor()
+
+# IDs whose status flags are set at the end of the run, one IN-query update per table
+downloaded = []
+processed_blocks = []
+# Qdrant points buffered column-wise: one vector matrix per article, not one list per point
+pending_ids = []
+pending_vectors = []
+pending_payloads = []
+
+
+def flush_points(qdrant_client, min_size=0):
+    """Upload buffered points once at least ``min_size`` are pending."""
+    global pending_ids, pending_vectors, pending_payloads
+    if not pending_ids or len(pending_ids) < min_size:
+        return
+    ids, pending_ids = pending_ids, []
+    vectors, pending_vectors = pending_vectors, []
+    payloads, pending_payloads = pending_payloads, []
+    qdrant_client.upload_vectors_bulk(
+        ids, torch.cat(vectors).numpy(), payloads, batch_size=256, wait=False
+    )
+    L.info(f"Uploaded {len(ids)} embeddings to Qdrant")
 
-for path in unprocessed_paths[:5]:
-    path_info = path
 
-    base_dir = Path(__file__).parents[1]
+def download_pdf(path_info):
+    """
+    Download one article and extract its PDF; runs on the download pool.
 
+    Returns (path_info, doc_temp_dir, pdf_path), or None when the article has
+    no PDF (its temp dir is already removed).
+    """
     # Step 2: Create temp dir (use pmcid for a clean folder name)
-    temp_root = base_dir / 'sources' / 'pubmed_pmc' / 'temp'
     doc_temp_dir = temp_root / f"extract_{path_info.pmcid}"
     doc_temp_dir.mkdir(parents=True, exist_ok=True)
 
-    # Step 3: Download TAR.GZ
-    BASE_URL = "https://ftp.ncbi.nlm.nih.gov/pub/pmc/"
+    # Steps 3-5: Stream the TAR.GZ and write out only its PDF; nothing else is used
     full_url = urljoin(BASE_URL, path_info.ftp_path)
 
-    tarball_filename = Path(path_info.ftp_path).name  # e.g., "PMC17774.tar.gz"
-    tarball_file_path = doc_temp_dir / tarball_filename
+    pdf_path = fetcher.stream_extract_first(full_url, extract_to=doc_temp_dir, suffix=".pdf")
 
-    fetcher = TarballFetcher(base_dir)
-    tarball_path = fetcher.download(full_url, target_path=tarball_file_path)
+    # Mark article as downloaded
+    downloaded.append(path_info.ftp_path)
 
-    if tarball_path:
-        # Mark article as downloaded
-        CRUD.update(
-        table='pubmed_fulltext_links',
-        model=PMCArticleMetadata,
-        updates={"full_text_downloaded": True},
-        id_field='ftp_path',
-        id_value=path_info.ftp_path
-    )
-    
-    import pdb; pdb.set_trace()
+    if not pdf_path:
+        # No PDF, and we haven't implemented NXML support yet
+        L.warning(f"No PDF available for {path_info.pmcid} — skipping until NXML support is added.")
+        shutil.rmtree(doc_temp_dir)
+        return None
 
-    # Step 4: Extract contents
-    extracted_path = fetcher.extract(tarball_path, extract_to=doc_temp_dir)
+    return path_info, doc_temp_dir, pdf_path
 
-    # Step 5: Locate PDF or NXML
-    pdf_path = next(doc_temp_dir.rglob("*.pdf"), None)
-    nxml_path = next(doc_temp_dir.rglob("*.nxml"), None)
 
-    if not pdf_path and not nxml_path:
-        L.warning(f"No PDF or NXML found for {path_info.ftp_path} in {tarball_path}")
-        CRUD.update(
-            table='pubmed_fulltext_links',
-            model=PMCArticleMetadata,
-            updates={"full_text_downloaded": True},
-            id_field='ftp_path',
-            id_value=path_info.ftp_path
-        )
-        shutil.rmtree(doc_temp_dir)
-        continue
+def extract_blocks(doc_temp_dir, pdf_path):
+    """
+    Parse a downloaded PDF on the main thread.
 
+    Returns (pdf_metadata, text_blocks), or None when there is nothing to embed
+    (the temp dir is already removed).
+    """
     # Step 6: PDF-only branch for now
-    if pdf_path:
-        # Safe: we *do* have a PDF path, so now do the PDF logic
-        meta_reader = PDFReadMeta()
-        pdf_metadata = meta_reader.extract_metadata(pdf_path=pdf_path)
+    pdf_metadata = meta_reader.extract_metadata(pdf_path=pdf_path)
 
-        block_extractor = PDFBlockExtractor()
-        text_blocks = block_extractor.extract_blocks(doc_id=pdf_metadata.doc_id, pdf_path=pdf_path)
+    text_blocks = block_extractor.extract_blocks(doc_id=pdf_metadata.doc_id, pdf_path=pdf_path)
 
-        if not text_blocks:
-            L.warning(f"No text blocks extracted for {pdf_metadata.doc_id} — skipping.")
-            shutil.rmtree(doc_temp_dir)
-            continue
-    else:
-        # No PDF, and we haven't implemented NXML support yet
-        L.warning(f"No PDF available for {path_info.pmcid} — skipping until NXML support is added.")
+    if not text_blocks:
+        L.warning(f"No text blocks extracted for {pdf_metadata.doc_id} — skipping.")
         shutil.rmtree(doc_temp_dir)
-        continue
-
-        
-    # Step 8: Insert metadata and blocks
-    CRUD.insert(
-        table='pdf_metadata',
-        model=PDFMetadata,
-        data=pdf_metadata
-    )
+        return None
 
-    CRUD.bulk_insert(
-        table='pdf_blocks',
-        model=PDFBlock,
-        data_list=text_blocks
-    )
+    return pdf_metadata, text_blocks
 
-    # Step 9: Named Entity Recognition
-    ner = BioBERTNER()
-    keywords = []
-    for block in text_blocks:
-        result = ner.run(text=block.text, doc_id=block.doc_id, block_id=block.block_id)
-        keywords.append(result)
-    
-
-    # Step 10: Embedding generation
-    embedder = BioBERTEmbedder()
-    embeddings = [
-        embedder.run(text=block.text, doc_id=block.doc_id, block_id=block.block_id, page=block.page)
-        for block in text_blocks
-    ]
-
-    # Step 11: Save NER and embeddings
-    if keywords:
-        CRUD.bulk_insert(
-            table='keywords',
-            model=type(keywords[0]),
-            data_list=keywords
-        )
 
-        if embeddings:
-            qdrant_client = QdrantCRUD(collection_name='bio_blocks')
-            qdrant_client.upsert_embeddings_bulk(
-                points=[
-                    PointStruct(
-                        id=embedding.block_id,
-                        vector=embedding.embedding,
-                        payload={
-                            "doc_id": embedding.doc_id,
-                            "page": embedding.page,
-                            "text": embedding.text,
-                        }
-                    )
-                    for embedding in embeddings
-                ]
+# Step 1: Get next unprocessed path
+unprocessed_paths = CRUD.get(
+    table='pubmed_fulltext_links',
+    model=PMCArticleMetadata,
+    id_field='full_text_downloaded',
+    id_value=False
+)
+
+if not unprocessed_paths:
+    L.info("No unprocessed files left.")
+    exit()
+
+# Imported only once there is work to do; these pull in torch, transformers and qdrant_client
+import torch
+from BFHTW.ai_assistants.internal.bio_bert.biobert_ner import BioBERTNER
+from BFHTW.ai_assistants.internal.bio_bert.biobert_embeddings import BioBERTEmbedder
+from BFHTW.utils.qdrant.qdrant_crud import BLOCK_EMBEDDING_COLLECTION, QdrantCRUD
+
+qdrant_client = QdrantCRUD(collection_name=BLOCK_EMBEDDING_COLLECTION)
+
+# Downloads run ahead on the pool; parsing and writes stay on this thread, and
+# NER runs on its own thread alongside the embedder
+try:
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as download_pool, \
+            ThreadPoolExecutor(max_workers=1) as ner_pool:
+        futures = [download_pool.submit(download_pdf, path) for path in unprocessed_paths[:5]]
+
+        # Models are loaded once, while the first downloads run, and reused for every article
+        ner = BioBERTNER()
+        # Full precision, like the document pipeline, since both write the same collection
+        embedder = BioBERTEmbedder()
+
+        for future in as_completed(futures):
+            try:
+                downloaded_pdf = future.result()
+            except Exception as e:
+                L.error(f"Failed to download article: {e}")
+                continue
+            if downloaded_pdf is None:
+                continue
+            path_info, doc_temp_dir, pdf_path = downloaded_pdf
+
+            try:
+                parsed = extract_blocks(doc_temp_dir, pdf_path)
+            except Exception as e:
+                L.error(f"Failed to parse {path_info.ftp_path}: {e}")
+                shutil.rmtree(doc_temp_dir, ignore_errors=True)
+                continue
+            if parsed is None:
+                continue
+            pdf_metadata, text_blocks = parsed
+
+            # Step 8: Insert metadata and blocks
+            CRUD.insert(
+                table='pdf_metadata',
+                model=PDFMetadata,
+                data=pdf_metadata
             )
-            L.info(f"Inserted {len(embeddings)} embeddings into Qdrant for doc {pdf_metadata.doc_id}")
 
+            CRUD.bulk_insert(
+                table='pdf_blocks',
+                model=PDFBlock,
+                data_list=text_blocks
+            )
 
-    # Step 12: Cleanup
-    shutil.rmtree(doc_temp_dir)
+            texts = [block.text for block in text_blocks]
+            doc_ids = [block.doc_id for block in text_blocks]
+            block_ids = [block.block_id for block in text_blocks]
+
+            # Step 9: Named Entity Recognition, batched across all blocks.
+            # The NER model is a different encoder from BioBERT, so the two
+            # forward passes cannot be shared; they run concurrently instead.
+            ner_future = ner_pool.submit(ner.run_batch, texts, doc_ids=doc_ids, block_ids=block_ids)
+
+            # Step 10: Embedding generation, batched across all blocks, as one matrix
+            embeddings = embedder.embed_batch(texts)
+            keywords = ner_future.result()
+
+            # Step 11: Save NER and embeddings
+            if keywords:
+                CRUD.bulk_insert(
+                    table='keywords',
+                    model=type(keywords[0]),
+                    data_list=keywords
+                )
+
+                if len(embeddings):
+                    pending_ids.extend(block_ids)
+                    pending_vectors.append(embeddings)
+                    pending_payloads.extend(
+                        {"doc_id": block.doc_id, "page": block.page, "block_id": block.block_id, "table": "pdf_blocks"}
+                        for block in text_blocks
+                    )
+                    flush_points(qdrant_client, min_size=QDRANT_UPLOAD_THRESHOLD)
 
-    # Step 13: Mark block as processed
-    CRUD.bulk_update(
-        table='pdf_blocks',
-        id_field='block_id',
-        data_list=[(embedding.block_id, {"processed": True}) for embedding in embeddings]
-    )
 
-    L.info(f"Successfully processed and cleaned up {path_info.ftp_path}")
\ No newline at end of file
+            # Step 12: Cleanup
+            shutil.rmtree(doc_temp_dir)
+
+            # Step 13: Mark block as processed
+            processed_blocks.extend(block_ids)
+
+            L.info(f"Successfully processed and cleaned up {path_info.ftp_path}")
+finally:
+    flush_points(qdrant_client)
+
+    # One round-trip per table, even if an article failed part way
+    if downloaded:
+        CRUD.bulk_set(
+            table='pubmed_fulltext_links',
+            id_field='ftp_path',
+            id_values=downloaded,
+            updates={"full_text_downloaded": True}
+        )
+    if processed_blocks:
+        CRUD.bulk_set(
+            table='pdf_blocks',
+            id_field='block_id',
+            id_values=processed_blocks,
+            updates={"processed": True}
+        )
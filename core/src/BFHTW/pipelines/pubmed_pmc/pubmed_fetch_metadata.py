@@ -47,12 +47,14 @@ field_map = {
     "PMID_y":            "pmid_mapped"
 }
 
-rows = []
-
-for _, row in article_paths.iterrows():
-    model_data = {model_field: row[source_field] for source_field, model_field in field_map.items()}
-    model_data["full_text_downloaded"] = False
-    rows.append(PMCArticleMetadata(**model_data))
+# Rename and select columns once for the whole frame instead of boxing cells row by row
+records = (
+    article_paths[list(field_map)]
+    .rename(columns=field_map)
+    .assign(full_text_downloaded=False)
+    .to_dict('records')
+)
+rows = [PMCArticleMetadata(**record) for record in records]
 
 # Insert into SQL
 CRUD.bulk_insert(
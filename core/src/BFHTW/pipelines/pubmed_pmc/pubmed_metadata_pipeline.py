@@ -5,9 +5,13 @@ Demonstrates how to use the base pipeline architecture for reliable,
 validated data processing with comprehensive error handling.
 """
 
-from typing import Optional, List
+from typing import Iterator, Optional, List, Set
 from pathlib import Path
-import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, fields as dataclass_fields
+import logging
+import math
+import os
 
 from BFHTW.pipelines.base_pipeline import BasePipeline, PipelineResult
 from BFHTW.pipelines.data_sources import PubMedCentralSource
@@ -18,7 +22,48 @@ from BFHTW.utils.logs import get_logger
 
 L = get_logger()
 
-class PubMedMetadataPipeline(BasePipeline[dict, Document]):
+# Document ids drawn from one os.urandom call at a time
+UUID_CHUNK = 256
+
+def _uuid4_stream(chunk: int = UUID_CHUNK) -> Iterator[str]:
+    """Yield random (version 4) UUID strings, generating ``chunk`` of them per urandom call."""
+    while True:
+        blob = bytearray(os.urandom(16 * chunk))
+        for i in range(0, len(blob), 16):
+            blob[i + 6] = (blob[i + 6] & 0x0F) | 0x40  # version 4
+            blob[i + 8] = (blob[i + 8] & 0x3F) | 0x80  # RFC 4122 variant
+        hexed = blob.hex()
+        for i in range(0, len(hexed), 32):
+            yield f"{hexed[i:i + 8]}-{hexed[i + 8:i + 12]}-{hexed[i + 12:i + 16]}-{hexed[i + 16:i + 20]}-{hexed[i + 20:i + 32]}"
+
+@dataclass(slots=True)
+class _DocumentRow:
+    """
+    The Document columns this pipeline sets, carried from process_item to the insert.
+    
+    Columns not listed here are left NULL, as they were None on the Document.
+    """
+    doc_id: str
+    source_db: str
+    external_id: str
+    format: str
+    title: Optional[str]
+    source_file: Optional[str]
+    notes: str
+    ingest_pipeline: str
+    license_type: Optional[str]
+    processed: bool = False
+    qdrant_synced: bool = False
+
+_DOCUMENT_ROW_FIELDS = [f.name for f in dataclass_fields(_DocumentRow)]
+
+def _optional_str(value) -> Optional[str]:
+    """Return ``value`` as a string, or None for missing values (None or a pandas NaN)."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return str(value)
+
+class PubMedMetadataPipeline(BasePipeline[dict, _DocumentRow]):
     """
     Pipeline for fetching and validating PubMed Central article metadata.
     
@@ -60,8 +105,53 @@ class PubMedMetadataPipeline(BasePipeline[dict, Document]):
         )
         
         self.strict_validation = strict_validation
+        self._id_stream = _uuid4_stream()
+        # external_ids already stored, loaded once per run for strict duplicate checks
+        self._known_ids: Set[str] = set()
+        self._known_ids_future: Optional[Future] = None
+        # One SQLite connection per run; each batch is its own transaction on it
+        self._conn = None
+    
+    def run(self) -> PipelineResult:
+        """
+        Run the pipeline, loading the stored external_ids in the background.
+        
+        The SQLite read overlaps with the PMC metadata fetch; the first
+        store_batch waits for it. Batches are written on one connection held
+        for the whole run.
+        """
+        self._conn = CRUD.connect()
+        try:
+            if not self.strict_validation:
+                return super().run()
+            
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                self._known_ids = set()
+                self._known_ids_future = pool.submit(
+                    CRUD.select_column, table='documents', column='external_id'
+                )
+                try:
+                    return super().run()
+                finally:
+                    self._known_ids_future = None
+        finally:
+            self._conn.close()
+            self._conn = None
+    
+    def _resolve_known_ids(self) -> Set[str]:
+        """Collect the background external_id load on first use."""
+        future, self._known_ids_future = self._known_ids_future, None
+        if future is not None:
+            try:
+                self._known_ids = future.result()
+                L.info(f"Loaded {len(self._known_ids)} existing external_ids")
+            except Exception as e:
+                # Unique index still rejects duplicates; only the early skip is lost
+                L.warning(f"Could not load existing external_ids: {str(e)}")
+                self._known_ids = set()
+        return self._known_ids
     
-    def process_item(self, item: dict) -> Optional[Document]:
+    def process_item(self, item: dict) -> Optional[_DocumentRow]:
         """
         Process a single metadata item from PMC source.
         
@@ -69,81 +159,104 @@ class PubMedMetadataPipeline(BasePipeline[dict, Document]):
             item: Raw metadata dict from PMC source
             
         Returns:
-            Document instance or None if processing fails
+            Document row or None if processing fails
         """
         try:
-            # Create Document instance according to schema
-            document = Document(
-                doc_id=str(uuid.uuid4()),
+            ftp_path = _optional_str(item.get('ftp_path')) or ''
+            license_type = _optional_str(item.get('license_type'))
+            title = _optional_str(item.get('title'))
+            row = _DocumentRow(
+                doc_id=next(self._id_stream),
                 source_db="PMC",
-                external_id=item.get('pmcid', ''),
+                external_id=str(item.get('pmcid') or ''),
                 format="nxml",
-                title=item.get('title'),
-                source_file=item.get('ftp_path', '').split('/')[-1] if item.get('ftp_path') else None,
-                retrieved_at=None,
-                processed=False,
-                has_figures=None,
-                qdrant_synced=False,
-                notes=f"FTP Path: {item.get('ftp_path', '')}, License: {item.get('license_type', '')}",
-                search_tags=None,
-                retrival_context=None,
+                title=title,
+                source_file=ftp_path.rpartition('/')[2] or None,
+                notes=f"FTP Path: {ftp_path}, License: {license_type or ''}",
                 ingest_pipeline="pubmed_metadata_pipeline",
-                license_type=item.get('license_type'),
-                publication_date=None,
-                authors=None,
-                journal=None,
-                abstract=None,
-                clinical_trial_ref=None,
-                doi=None
+                license_type=license_type
             )
             
-            return document
+            # Strict runs still check the row against the Document schema;
+            # lenient runs rely on the validators already applied to the raw item
+            if self.strict_validation:
+                Document(retrieved_at=None, **{name: getattr(row, name) for name in _DOCUMENT_ROW_FIELDS})
+            
+            return row
             
         except Exception as e:
-            L.error(f"Failed to process metadata item: {str(e)}")
-            L.error(f"Item data: {item}")
+            # Per-item path: let logging format only records that are emitted,
+            # and dump the full item only at DEBUG
+            L.error("Failed to process metadata item %s: %s", item.get('pmcid'), e)
+            if L.isEnabledFor(logging.DEBUG):
+                L.debug("Item data: %r", item)
             return None
     
-    def store_item(self, item: Document) -> bool:
+    def store_item(self, item: _DocumentRow) -> bool:
         """
         Store processed document in database.
         
         Args:
-            item: Validated Document instance
+            item: Validated document row
             
         Returns:
             True if storage successful, False otherwise
         """
-        try:
-            # Check for existing record to avoid duplicates
-            existing = CRUD.get(
-                table='documents',
-                model=Document,
-                id_field='external_id',
-                id_value=item.external_id
-            )
+        return self.store_batch([item]) == 1
+    
+    def store_batch(self, items: List[_DocumentRow]) -> int:
+        """
+        Store a batch of documents with a single insert.
+        
+        In strict mode documents whose external_id is already known are
+        skipped in memory. In both modes the unique index on external_id
+        (INSERT OR IGNORE) keeps existing rows, so their doc_id and processed
+        flag survive and blocks keyed by them are not orphaned.
+        
+        Args:
+            items: Validated document rows
             
-            if existing and self.strict_validation:
-                L.warning(f"Duplicate external_id found, skipping: {item.external_id}")
-                return False
+        Returns:
+            Number of documents stored
+        """
+        try:
+            to_insert = items
+            known_ids = None
+            if self.strict_validation:
+                known_ids = self._resolve_known_ids()
+                batch_ids = set()
+                to_insert = []
+                for item in items:
+                    if item.external_id in known_ids or item.external_id in batch_ids:
+                        continue
+                    batch_ids.add(item.external_id)
+                    to_insert.append(item)
             
-            # Store in database
-            result = CRUD.insert(
-                table='documents',
-                model=Document,
-                data=item
-            )
+            stored = 0
+            if to_insert:
+                with CRUD.transaction(self._conn) as conn:
+                    stored = CRUD.insert_rows(
+                        conn, 'documents', to_insert, on_conflict="IGNORE", fields=_DOCUMENT_ROW_FIELDS
+                    )
+                # Only a fully written batch is remembered; otherwise some ids may have
+                # failed to insert and must stay eligible (the unique index covers the rest)
+                if known_ids is not None and stored == len(to_insert):
+                    known_ids.update(batch_ids)
             
-            if result:
-                L.debug(f"Stored document for external_id: {item.external_id}")
-                return True
-            else:
-                L.error(f"Failed to store document for external_id: {item.external_id}")
-                return False
+            skipped = len(items) - len(to_insert)
+            if skipped:
+                L.info(f"Skipped {skipped} documents with an external_id already stored")
+            if stored < len(to_insert):
+                L.warning(
+                    f"{len(to_insert) - stored} of {len(to_insert)} documents were not written "
+                    f"(external_id already in the database, or the insert failed)"
+                )
+            L.debug("Stored %d/%d documents", stored, len(items))
+            return stored
                 
         except Exception as e:
-            L.error(f"Error storing document for external_id {item.external_id}: {str(e)}")
-            return False
+            L.error(f"Error storing batch of {len(items)} documents: {str(e)}")
+            return 0
 
 def run_pubmed_metadata_pipeline(
     search_terms_file: Optional[str] = None,
@@ -178,23 +291,32 @@ def run_pubmed_metadata_pipeline(
     CRUD.create_table_if_not_exists(
         table='documents',
         model=Document,
-        primary_key='doc_id'
+        primary_key='doc_id',
+        unique_fields=['external_id']
     )
+    # Tables created before the UNIQUE constraint get it as an index
+    try:
+        CRUD.create_index_if_not_exists(table='documents', fields=['external_id'], unique=True)
+    except Exception as e:
+        L.error(f"Could not add unique index on documents.external_id, duplicates will not be skipped: {str(e)}")
     
     # Execute pipeline
     result = pipeline.run()
     
     # Log summary
     if result.status.value == "success":
-        L.info(f"PubMed metadata pipeline completed successfully:")
-        L.info(f"  - Processed: {result.processed_count} articles")
-        L.info(f"  - Execution time: {result.execution_time:.2f} seconds")
-        L.info(f"  - Rate: {result.processed_count/result.execution_time:.1f} articles/second")
+        if L.isEnabledFor(logging.INFO):
+            rate = result.processed_count / result.execution_time if result.execution_time > 0 else 0.0
+            L.info(
+                f"PubMed metadata pipeline completed successfully: "
+                f"processed={result.processed_count} articles, "
+                f"time={result.execution_time:.2f}s, rate={rate:.1f} articles/second"
+            )
     else:
-        L.error(f"PubMed metadata pipeline failed:")
-        L.error(f"  - Processed: {result.processed_count} articles")
-        L.error(f"  - Failed: {result.failed_count} articles")
-        L.error(f"  - Errors: {len(result.errors)}")
+        L.error(
+            f"PubMed metadata pipeline failed: processed={result.processed_count}, "
+            f"failed={result.failed_count}, errors={len(result.errors)}"
+        )
     
     return result
 
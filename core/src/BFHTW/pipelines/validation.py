@@ -5,12 +5,15 @@ Provides validators for data quality, content integrity, schema compliance,
 and domain-specific biomedical validation rules.
 """
 
-from typing import List, Dict, Any, Optional, Type, Union
+from typing import List, Dict, Any, Optional, Set, Type, Union
 from pydantic import BaseModel, ValidationError
 import re
 from datetime import datetime
 from pathlib import Path
+import hashlib
 import json
+import os
+import tempfile
 
 from BFHTW.pipelines.base_pipeline import DataValidator, ValidationResult
 from BFHTW.utils.logs import get_logger
@@ -20,23 +23,114 @@ L = get_logger()
 # Cache for BioBERT vocabulary to avoid repeated loading
 _biobert_vocab_cache = None
 
+# Tokenizer whose vocabulary is filtered for biomedical terms (same model as NER)
+BIOBERT_VOCAB_MODEL = "dmis-lab/biobert-base-cased-v1.1"
+
+# On-disk copies of the filtered BioBERT vocabulary so new processes skip loading
+# the tokenizer; see _vocab_cache_path for how files are keyed
+BIOBERT_VOCAB_CACHE_DIR = Path.home() / '.cache' / 'bfhtw'
+
+# Bump when the filtering code in _load_biobert_vocabulary changes; changes to the
+# patterns and keywords below already change the cache key on their own
+_VOCAB_FILTER_VERSION = 1
+
+# Biomedical patterns used to pick terms out of the BioBERT vocabulary, compiled
+# once into two alternations so each token is scanned twice rather than 14 times
+_BIOMED_SUFFIX_RE = re.compile(
+    r'[a-z]+oma'            # tumors: hepatoma, carcinoma, etc.
+    r'|[a-z]*cancer'        # cancers
+    r'|[a-z]*therapy'       # therapies
+    r'|[a-z]*treatment'     # treatments
+    r'|[a-z]*osis'          # conditions: fibrosis, etc.
+    r'|[a-z]*itis'          # inflammations
+    r'|[a-z]*pathy'         # diseases: neuropathy, etc.
+    r'|[a-z]*gene'          # genes
+    r'|[a-z]*protein'       # proteins
+)
+_BIOMED_SUBSTR_RE = re.compile(r'surgical|clinical|medical|diagnostic|therapeutic')
+
+# Tokens longer than five characters containing one of these roots are kept;
+# a single alternation replaces a Python loop over the roots per token
+_BIOMED_ROOTS_RE = re.compile(
+    'cardio|neuro|gastro|hepato|pulmo|nephro'
+    '|osteo|arthro|dermato|ophthalmo|oto|rhino'
+    '|endo|exo|hypo|hyper|inter|intra|trans'
+    '|anti|pro|pre|post|sub|super|micro|macro'
+    '|onco|patho|bio|pharmaco|toxico|immuno'
+    '|hemato|lympho|angio|vaso|myo|adeno|cyto'
+)
+
+# Medical/biomedical keywords always included in the vocabulary
+_BIOMEDICAL_KEYWORDS = frozenset({
+    'patient', 'patients', 'treatment', 'therapy', 'clinical', 'medical',
+    'disease', 'diagnosis', 'symptoms', 'medication', 'drug', 'cancer',
+    'tumor', 'gene', 'protein', 'cell', 'tissue', 'surgery', 'surgical',
+    'hepatoblastoma', 'liver', 'pediatric', 'oncology', 'chemotherapy',
+    'cisplatin', 'doxorubicin', 'metastasis', 'prognosis', 'biopsy',
+    'malignant', 'benign', 'carcinoma', 'sarcoma', 'lymphoma', 'leukemia',
+    'radiotherapy', 'immunotherapy', 'pathology', 'histology', 'cytology',
+    'pharmaceutical', 'pharmacology', 'therapeutic', 'diagnostic',
+    'anesthesia', 'antibiotic', 'antiviral', 'vaccine', 'immunization',
+    'syndrome', 'disorder', 'condition', 'chronic', 'acute', 'inflammatory',
+    'infection', 'viral', 'bacterial', 'fungal', 'parasitic',
+    'cardiovascular', 'pulmonary', 'neurological', 'gastrointestinal',
+    'endocrine', 'metabolic', 'genetic', 'hereditary', 'congenital',
+    'molecular', 'cellular', 'biochemical', 'physiological', 'anatomical'
+})
+
+def _vocab_cache_path(model_name: str) -> Path:
+    """
+    Cache file for the vocabulary filtered from ``model_name``'s tokenizer.
+
+    The name includes the model and a digest of the filter (version, patterns
+    and keywords), so a changed filter or tokenizer never reads a stale file.
+    """
+    filter_key = hashlib.sha1(repr((
+        _VOCAB_FILTER_VERSION,
+        _BIOMED_SUFFIX_RE.pattern,
+        _BIOMED_SUBSTR_RE.pattern,
+        _BIOMED_ROOTS_RE.pattern,
+        sorted(_BIOMEDICAL_KEYWORDS),
+    )).encode()).hexdigest()[:12]
+    model_key = re.sub(r'[^A-Za-z0-9._-]', '_', model_name)
+    return BIOBERT_VOCAB_CACHE_DIR / f'biobert_vocab_{model_key}_{filter_key}.json'
+
+# Word tokenizer for biomedical scoring
+_WORD_RE = re.compile(r'\b\w+\b')
+
+# Whitespace control characters that do not count as non-printable
+_STRIP_WHITESPACE_CONTROLS = str.maketrans('', '', '\n\r\t')
+
+def _as_dict(data: Any) -> Optional[Dict[str, Any]]:
+    """Field values of a dict or Pydantic model; None for other formats."""
+    if isinstance(data, dict):
+        return data
+    if hasattr(data, 'model_dump'):
+        return data.model_dump()
+    return None
+
 class SchemaValidator(DataValidator):
     """Validates data against Pydantic model schemas."""
     
     def __init__(self, model: Type[BaseModel], strict: bool = True):
         self.model = model
         self.strict = strict
+        # The model's compiled core validator, called directly per record
+        self._validate_python = model.__pydantic_validator__.validate_python
     
     def validate(self, data: Any) -> ValidationResult:
         """Validate data against the specified Pydantic model."""
         try:
-            if isinstance(data, dict):
-                self.model(**data)
+            if isinstance(data, self.model):
+                # Instances may come from model_construct, which skips validation,
+                # so check the stored field values; pydantic would pass the
+                # instance itself through unchecked
+                self._validate_python(data.__dict__)
             elif hasattr(data, 'model_dump'):
-                # Already a Pydantic model, validate fields
-                self.model(**data.model_dump())
+                # A different Pydantic model, validate its fields
+                self._validate_python(data.model_dump())
             else:
-                self.model.model_validate(data)
+                self._validate_python(data)
             
             return ValidationResult(is_valid=True, errors=[], warnings=[])
             
@@ -81,25 +175,28 @@ class BiomedicalContentValidator(DataValidator):
         self.require_biomedical_terms = require_biomedical_terms
         self.use_biobert_vocab = use_biobert_vocab
         
-        # Load biomedical vocabulary
+        # Load biomedical vocabulary, frozen since it is only used for lookups
         if self.use_biobert_vocab:
-            self.biomedical_vocabulary = self._load_biobert_vocabulary()
+            self.biomedical_vocabulary = frozenset(self._load_biobert_vocabulary())
         else:
-            self.biomedical_vocabulary = self._load_biomedical_vocabulary(biomedical_vocabulary_file)
+            self.biomedical_vocabulary = frozenset(self._load_biomedical_vocabulary(biomedical_vocabulary_file))
     
-    def _load_biobert_vocabulary(self) -> set:
+    def _load_biobert_vocabulary(self) -> frozenset:
         """Load biomedical vocabulary from BioBERT tokenizer."""
         global _biobert_vocab_cache
         
         if _biobert_vocab_cache is not None:
             return _biobert_vocab_cache
         
+        cached = self._read_vocabulary_cache(BIOBERT_VOCAB_MODEL)
+        if cached is not None:
+            _biobert_vocab_cache = cached
+            return cached
+        
         try:
             from transformers import AutoTokenizer
             
-            # Use the same BioBERT model as in the NER pipeline
-            model_name = "dmis-lab/biobert-base-cased-v1.1"
-            tokenizer = AutoTokenizer.from_pretrained(model_name)
+            tokenizer = AutoTokenizer.from_pretrained(BIOBERT_VOCAB_MODEL)
             
             # Extract vocabulary and filter for biomedical terms
             vocab = tokenizer.get_vocab()
@@ -107,44 +204,8 @@ class BiomedicalContentValidator(DataValidator):
             # Filter vocabulary for meaningful biomedical terms
             biomedical_vocab = set()
             
-            # Biomedical patterns to identify relevant terms
-            biomedical_patterns = [
-                r'^[a-z]+oma$',  # tumors: hepatoma, carcinoma, etc.
-                r'^[a-z]*cancer$',  # cancers
-                r'^[a-z]*therapy$',  # therapies
-                r'^[a-z]*treatment$',  # treatments
-                r'^[a-z]*osis$',  # conditions: fibrosis, etc.
-                r'^[a-z]*itis$',  # inflammations
-                r'^[a-z]*pathy$',  # diseases: neuropathy, etc.
-                r'^[a-z]*gene$',  # genes
-                r'^[a-z]*protein$',  # proteins
-                r'.*surgical.*',  # surgical terms
-                r'.*clinical.*',  # clinical terms
-                r'.*medical.*',  # medical terms
-                r'.*diagnostic.*',  # diagnostic terms
-                r'.*therapeutic.*',  # therapeutic terms
-            ]
-            
-            # Medical/biomedical keywords to include
-            biomedical_keywords = {
-                'patient', 'patients', 'treatment', 'therapy', 'clinical', 'medical',
-                'disease', 'diagnosis', 'symptoms', 'medication', 'drug', 'cancer',
-                'tumor', 'gene', 'protein', 'cell', 'tissue', 'surgery', 'surgical',
-                'hepatoblastoma', 'liver', 'pediatric', 'oncology', 'chemotherapy',
-                'cisplatin', 'doxorubicin', 'metastasis', 'prognosis', 'biopsy',
-                'malignant', 'benign', 'carcinoma', 'sarcoma', 'lymphoma', 'leukemia',
-                'radiotherapy', 'immunotherapy', 'pathology', 'histology', 'cytology',
-                'pharmaceutical', 'pharmacology', 'therapeutic', 'diagnostic',
-                'anesthesia', 'antibiotic', 'antiviral', 'vaccine', 'immunization',
-                'syndrome', 'disorder', 'condition', 'chronic', 'acute', 'inflammatory',
-                'infection', 'viral', 'bacterial', 'fungal', 'parasitic',
-                'cardiovascular', 'pulmonary', 'neurological', 'gastrointestinal',
-                'endocrine', 'metabolic', 'genetic', 'hereditary', 'congenital',
-                'molecular', 'cellular', 'biochemical', 'physiological', 'anatomical'
-            }
-            
             # Add all biomedical keywords
-            biomedical_vocab.update(biomedical_keywords)
+            biomedical_vocab.update(_BIOMEDICAL_KEYWORDS)
             
             # Filter vocabulary using patterns and common biomedical prefixes/suffixes
             for token in vocab.keys():
@@ -154,29 +215,18 @@ class BiomedicalContentValidator(DataValidator):
                 
                 token_lower = token.lower()
                 
-                # Check against biomedical patterns
-                for pattern in biomedical_patterns:
-                    if re.match(pattern, token_lower):
-                        biomedical_vocab.add(token_lower)
-                        break
-                
-                # Include tokens that contain biomedical roots
-                biomedical_roots = [
-                    'cardio', 'neuro', 'gastro', 'hepato', 'pulmo', 'nephro',
-                    'osteo', 'arthro', 'dermato', 'ophthalmo', 'oto', 'rhino',
-                    'endo', 'exo', 'hypo', 'hyper', 'inter', 'intra', 'trans',
-                    'anti', 'pro', 'pre', 'post', 'sub', 'super', 'micro', 'macro',
-                    'onco', 'patho', 'bio', 'pharmaco', 'toxico', 'immuno',
-                    'hemato', 'lympho', 'angio', 'vaso', 'myo', 'adeno', 'cyto'
-                ]
-                
-                for root in biomedical_roots:
-                    if root in token_lower and len(token_lower) > 5:
-                        biomedical_vocab.add(token_lower)
-                        break
+                # Check against biomedical patterns, then biomedical roots
+                if (
+                    _BIOMED_SUFFIX_RE.fullmatch(token_lower)
+                    or _BIOMED_SUBSTR_RE.search(token_lower)
+                    or (len(token_lower) > 5 and _BIOMED_ROOTS_RE.search(token_lower))
+                ):
+                    biomedical_vocab.add(token_lower)
             
-            # Cache the vocabulary
+            # Cache the vocabulary frozen so validators share it without copying
+            biomedical_vocab = frozenset(biomedical_vocab)
             _biobert_vocab_cache = biomedical_vocab
+            self._write_vocabulary_cache(BIOBERT_VOCAB_MODEL, biomedical_vocab)
             
             L.info(f"Loaded {len(biomedical_vocab)} biomedical terms from BioBERT vocabulary")
             return biomedical_vocab
@@ -186,6 +236,45 @@ class BiomedicalContentValidator(DataValidator):
             # Fallback to default vocabulary
             return self._load_default_vocabulary()
     
+    @staticmethod
+    def _read_vocabulary_cache(model_name: str) -> Optional[frozenset]:
+        """Load the filtered BioBERT vocabulary from the on-disk cache, if present."""
+        cache_path = _vocab_cache_path(model_name)
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                vocab = frozenset(json.load(f))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            L.warning(f"Ignoring unreadable BioBERT vocabulary cache {cache_path}: {e}")
+            return None
+        
+        L.info(f"Loaded {len(vocab)} biomedical terms from {cache_path}")
+        return vocab
+    
+    @staticmethod
+    def _write_vocabulary_cache(model_name: str, vocab: frozenset) -> None:
+        """Persist the filtered BioBERT vocabulary; failures only cost the next process a rebuild."""
+        cache_path = _vocab_cache_path(model_name)
+        tmp_name = None
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Each writer gets its own temp file and renames it into place, so
+            # concurrent writers never interleave and readers never see a partial file
+            with tempfile.NamedTemporaryFile(
+                'w', encoding='utf-8', dir=cache_path.parent, suffix='.tmp', delete=False
+            ) as f:
+                tmp_name = f.name
+                json.dump(sorted(vocab), f)
+            os.replace(tmp_name, cache_path)
+        except Exception as e:
+            L.warning(f"Could not write BioBERT vocabulary cache {cache_path}: {e}")
+            if tmp_name:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+    
     def _load_biomedical_vocabulary(self, vocab_file: Optional[str]) -> set:
         """Load biomedical vocabulary from file (fallback method)."""
         if vocab_file and Path(vocab_file).exists():
@@ -234,14 +323,19 @@ class BiomedicalContentValidator(DataValidator):
             warnings.append(f"Text very long: {text_length} > {self.max_text_length} characters")
         
         # Character encoding validation
-        if not text_content.isprintable():
-            non_printable = sum(1 for c in text_content if not c.isprintable() and c not in '\n\r\t')
+        # Almost all text is printable once newlines and tabs are dropped, which
+        # str.isprintable confirms in C; only then count characters one by one
+        stripped = text_content.translate(_STRIP_WHITESPACE_CONTROLS)
+        if not stripped.isprintable():
+            non_printable = sum(1 for c in stripped if not c.isprintable())
             if non_printable > text_length * 0.1:  # More than 10% non-printable
                 warnings.append(f"High non-printable character count: {non_printable}")
         
         # Biomedical content validation
         if self.require_biomedical_terms:
-            biomedical_score = self._calculate_biomedical_score(text_content)
+            # Tokenize once here; the score only needs the lowercased word list
+            words = _WORD_RE.findall(text_content.lower())
+            biomedical_score = self._calculate_biomedical_score(words)
             if biomedical_score < 0.001:  # Very low biomedical term frequency
                 warnings.append(f"Low biomedical content score: {biomedical_score:.4f}")
             elif biomedical_score > 0.05:  # Good biomedical content
@@ -274,25 +368,23 @@ class BiomedicalContentValidator(DataValidator):
         
         return ""
     
-    def _calculate_biomedical_score(self, text: str) -> float:
-        """Calculate biomedical relevance score based on vocabulary overlap."""
-        if not text or not self.biomedical_vocabulary:
-            return 0.0
-        
-        # Tokenize text (simple word splitting)
-        words = re.findall(r'\b\w+\b', text.lower())
-        if not words:
+    def _calculate_biomedical_score(self, words: List[str]) -> float:
+        """Calculate biomedical relevance score of lowercased words based on vocabulary overlap."""
+        if not words or not self.biomedical_vocabulary:
             return 0.0
         
         # Count biomedical terms
-        biomedical_count = sum(1 for word in words if word in self.biomedical_vocabulary)
+        vocab = self.biomedical_vocabulary
+        biomedical_count = sum(1 for word in words if word in vocab)
         
         return biomedical_count / len(words)
     
     def _detect_non_english_content(self, text: str) -> bool:
         """Basic non-English content detection."""
-        # Count non-ASCII characters
-        non_ascii = sum(1 for c in text if ord(c) > 127)
+        if text.isascii():
+            return False
+        # Count non-ASCII characters as those dropped by an ASCII encode
+        non_ascii = len(text) - len(text.encode('ascii', 'ignore'))
         return non_ascii > len(text) * 0.1  # More than 10% non-ASCII
 
 class MetadataCompletenessValidator(DataValidator):
@@ -307,6 +399,10 @@ class MetadataCompletenessValidator(DataValidator):
         self.required_fields = required_fields
         self.recommended_fields = recommended_fields or []
         self.field_patterns = field_patterns or {}
+        # Patterns are compiled once rather than looked up in re's cache per record
+        self._compiled_patterns = [
+            (field, pattern, re.compile(pattern)) for field, pattern in self.field_patterns.items()
+        ]
     
     def validate(self, data: Any) -> ValidationResult:
         """Validate metadata completeness."""
@@ -321,21 +417,19 @@ class MetadataCompletenessValidator(DataValidator):
             errors.append("Data format not supported for metadata validation")
             return ValidationResult(is_valid=False, errors=errors, warnings=warnings)
         
-        # Check required fields
-        for field in self.required_fields:
-            if field not in data_dict or not data_dict[field]:
-                errors.append(f"Missing required field: {field}")
+        get = data_dict.get
+        
+        # Check required fields (a missing key and an empty value both count)
+        errors.extend(f"Missing required field: {field}" for field in self.required_fields if not get(field))
         
         # Check recommended fields
-        for field in self.recommended_fields:
-            if field not in data_dict or not data_dict[field]:
-                warnings.append(f"Missing recommended field: {field}")
+        warnings.extend(f"Missing recommended field: {field}" for field in self.recommended_fields if not get(field))
         
         # Validate field patterns
-        for field, pattern in self.field_patterns.items():
-            if field in data_dict and data_dict[field]:
-                if not re.match(pattern, str(data_dict[field])):
-                    errors.append(f"Field '{field}' does not match required pattern: {pattern}")
+        for field, pattern, compiled in self._compiled_patterns:
+            value = get(field)
+            if value and not compiled.match(str(value)):
+                errors.append(f"Field '{field}' does not match required pattern: {pattern}")
         
         return ValidationResult(
             is_valid=len(errors) == 0,
@@ -353,108 +447,148 @@ class ForeignKeyValidator(DataValidator):
     ):
         self.foreign_keys = foreign_keys
         self.allow_missing = allow_missing
+        # Key values per (table, column) already confirmed to exist; only hits are
+        # cached, so memory grows with the keys validated, not the table size
+        self._known_keys: Dict[tuple, Set[Any]] = {}
     
-    def validate(self, data: Any) -> ValidationResult:
-        """Validate foreign key relationships."""
-        errors = []
-        warnings = []
-        
-        if isinstance(data, dict):
-            data_dict = data
-        elif hasattr(data, 'model_dump'):
-            data_dict = data.model_dump()
-        else:
-            errors.append("Data format not supported for foreign key validation")
-            return ValidationResult(is_valid=False, errors=errors, warnings=warnings)
+    def _existing_references(self, field_name: str, table_name: str, values: Set[Any]) -> Set[Any]:
+        """
+        Return the subset of ``values`` present in the referenced column.
         
+        Values not yet confirmed are looked up with batched IN queries; misses
+        are not cached, so parents inserted later are still found.
+        """
         from BFHTW.utils.crud.crud import CRUD
         
+        known = self._known_keys.setdefault((table_name, field_name), set())
+        unknown = values - known
+        if unknown:
+            known.update(CRUD.select_existing(table=table_name, column=field_name, values=unknown))
+        return values & known
+    
+    def validate_batch(self, items: List[Any]) -> List[ValidationResult]:
+        """Validate foreign keys of a whole batch with one lookup per referenced table."""
+        dicts = [_as_dict(data) for data in items]
+        results = []
+        for data_dict in dicts:
+            if data_dict is None:
+                results.append(ValidationResult(
+                    is_valid=False, errors=["Data format not supported for foreign key validation"], warnings=[]
+                ))
+            else:
+                results.append(ValidationResult(is_valid=True, errors=[], warnings=[]))
+        
         for field_name, table_name in self.foreign_keys.items():
-            if field_name not in data_dict:
-                if not self.allow_missing:
-                    errors.append(f"Foreign key field missing: {field_name}")
-                continue
+            values = {d[field_name] for d in dicts if d is not None and d.get(field_name)}
+            existing: Set[Any] = set()
+            lookup_error = None
+            if values:
+                try:
+                    # Assumes the key column shares the field name
+                    existing = self._existing_references(field_name, table_name, values)
+                except Exception as e:
+                    lookup_error = f"Could not validate foreign key {field_name}: {str(e)}"
             
-            foreign_key_value = data_dict[field_name]
-            if not foreign_key_value:
-                if not self.allow_missing:
-                    errors.append(f"Foreign key field empty: {field_name}")
-                continue
-            
-            try:
-                # Check if referenced record exists
-                result = CRUD.get(
-                    table=table_name,
-                    model=None,  # We just want to check existence
-                    id_field=field_name.replace('_id', '_id'),  # Assume standard naming
-                    id_value=foreign_key_value
-                )
+            for data_dict, result in zip(dicts, results):
+                if data_dict is None:
+                    continue
+                if field_name not in data_dict:
+                    if not self.allow_missing:
+                        result.add_error(f"Foreign key field missing: {field_name}")
+                    continue
                 
-                if not result:
-                    errors.append(f"Foreign key reference not found: {field_name}={foreign_key_value} in {table_name}")
-                    
-            except Exception as e:
-                warnings.append(f"Could not validate foreign key {field_name}: {str(e)}")
+                foreign_key_value = data_dict[field_name]
+                if not foreign_key_value:
+                    if not self.allow_missing:
+                        result.add_error(f"Foreign key field empty: {field_name}")
+                elif lookup_error is not None:
+                    result.add_warning(lookup_error)
+                elif foreign_key_value not in existing:
+                    result.add_error(f"Foreign key reference not found: {field_name}={foreign_key_value} in {table_name}")
         
-        return ValidationResult(
-            is_valid=len(errors) == 0,
-            errors=errors,
-            warnings=warnings
-        )
+        return results
+    
+    def validate(self, data: Any) -> ValidationResult:
+        """Validate foreign key relationships."""
+        return self.validate_batch([data])[0]
 
 class DuplicateDetectionValidator(DataValidator):
-    """Detects potential duplicate entries."""
+    """
+    Detects potential duplicate entries.
+    
+    By default an item is only compared against the table, so validate_batch()
+    gives each item the same result validate() would. With
+    flag_batch_duplicates=True, an item repeating a value used by an earlier
+    item of the same batch is also reported, as a "within batch" duplicate;
+    the first item carrying the value stays valid.
+    """
     
     def __init__(
         self,
         table_name: str,
         unique_fields: List[str],
-        similarity_threshold: float = 0.95
+        similarity_threshold: float = 0.95,
+        flag_batch_duplicates: bool = False
     ):
         self.table_name = table_name
         self.unique_fields = unique_fields
         self.similarity_threshold = similarity_threshold
+        self.flag_batch_duplicates = flag_batch_duplicates
     
-    def validate(self, data: Any) -> ValidationResult:
-        """Check for potential duplicates."""
-        errors = []
-        warnings = []
-        
-        if isinstance(data, dict):
-            data_dict = data
-        elif hasattr(data, 'model_dump'):
-            data_dict = data.model_dump()
-        else:
-            errors.append("Data format not supported for duplicate detection")
-            return ValidationResult(is_valid=False, errors=errors, warnings=warnings)
+    def validate_batch(self, items: List[Any]) -> List[ValidationResult]:
+        """
+        Check a batch for duplicates with one IN query per unique field.
         
+        Items repeating a value already in the table are reported as
+        duplicates; see the class docstring for repeats within the batch.
+        """
         from BFHTW.utils.crud.crud import CRUD
         
+        dicts = [_as_dict(data) for data in items]
+        
+        # Look up every value of each unique field across the batch at once
+        existing: Dict[str, Set[Any]] = {}
+        lookup_error = None
         try:
-            # Check exact matches on unique fields
             for field in self.unique_fields:
-                if field in data_dict and data_dict[field]:
-                    existing = CRUD.get(
-                        table=self.table_name,
-                        model=None,
-                        id_field=field,
-                        id_value=data_dict[field]
-                    )
-                    
-                    if existing:
-                        errors.append(f"Duplicate found for {field}={data_dict[field]} in {self.table_name}")
-            
-            # TODO: Implement similarity-based duplicate detection
-            # This would require more sophisticated text comparison
-            
+                values = {d[field] for d in dicts if d is not None and d.get(field)}
+                existing[field] = CRUD.select_existing(table=self.table_name, column=field, values=values) if values else set()
         except Exception as e:
-            warnings.append(f"Could not check for duplicates: {str(e)}")
+            lookup_error = f"Could not check for duplicates: {str(e)}"
         
-        return ValidationResult(
-            is_valid=len(errors) == 0,
-            errors=errors,
-            warnings=warnings
-        )
+        # Values claimed by earlier items of this batch
+        seen: Dict[str, Set[Any]] = {field: set() for field in self.unique_fields}
+        results = []
+        for data_dict in dicts:
+            if data_dict is None:
+                results.append(ValidationResult(
+                    is_valid=False, errors=["Data format not supported for duplicate detection"], warnings=[]
+                ))
+                continue
+            if lookup_error is not None:
+                results.append(ValidationResult(is_valid=True, errors=[], warnings=[lookup_error]))
+                continue
+            
+            errors = []
+            for field in self.unique_fields:
+                value = data_dict.get(field)
+                if not value:
+                    continue
+                if value in existing[field]:
+                    errors.append(f"Duplicate found for {field}={value} in {self.table_name}")
+                elif self.flag_batch_duplicates and value in seen[field]:
+                    errors.append(f"Duplicate found for {field}={value} within batch")
+                else:
+                    seen[field].add(value)
+            results.append(ValidationResult(is_valid=len(errors) == 0, errors=errors, warnings=[]))
+        
+        return results
+    
+    def validate(self, data: Any) -> ValidationResult:
+        """Check for potential duplicates."""
+        # TODO: Implement similarity-based duplicate detection
+        # This would require more sophisticated text comparison
+        return self.validate_batch([data])[0]
 
 class CompositeValidator(DataValidator):
     """Combines multiple validators into a single validation step."""
@@ -463,29 +597,71 @@ class CompositeValidator(DataValidator):
         self.validators = validators
         self.stop_on_first_error = stop_on_first_error
     
+    def validate_batch(self, items: List[Any]) -> List[ValidationResult]:
+        """Run each validator over the whole batch and combine results per item."""
+        per_validator = [validator.validate_batch(items) for validator in self.validators]
+        
+        results = []
+        for index in range(len(items)):
+            errors: List[str] = []
+            warnings: List[str] = []
+            score_total = 0.0
+            score_count = 0
+            
+            for validator_results in per_validator:
+                result = validator_results[index]
+                errors.extend(result.errors)
+                warnings.extend(result.warnings)
+                if result.score is not None:
+                    score_total += result.score
+                    score_count += 1
+                
+                # Ignore later validators after the first error if configured
+                if self.stop_on_first_error and result.errors:
+                    break
+            
+            results.append(ValidationResult(
+                is_valid=not errors,
+                errors=errors,
+                warnings=warnings,
+                score=score_total / score_count if score_count else None
+            ))
+        
+        return results
+    
     def validate(self, data: Any) -> ValidationResult:
         """Run all validators and combine results."""
-        all_errors = []
-        all_warnings = []
-        scores = []
+        # Lists are only allocated once a validator actually reports something,
+        # so the common all-valid path does no extend() work at all
+        all_errors = None
+        all_warnings = None
+        score_total = 0.0
+        score_count = 0
         
         for validator in self.validators:
             result = validator.validate(data)
-            all_errors.extend(result.errors)
-            all_warnings.extend(result.warnings)
+            if result.errors:
+                if all_errors is None:
+                    all_errors = []
+                all_errors.extend(result.errors)
+            if result.warnings:
+                if all_warnings is None:
+                    all_warnings = []
+                all_warnings.extend(result.warnings)
             
             if result.score is not None:
-                scores.append(result.score)
+                score_total += result.score
+                score_count += 1
             
             # Stop on first error if configured
             if self.stop_on_first_error and result.errors:
                 break
         
         return ValidationResult(
-            is_valid=len(all_errors) == 0,
-            errors=all_errors,
-            warnings=all_warnings,
-            score=sum(scores) / len(scores) if scores else None
+            is_valid=all_errors is None,
+            errors=all_errors if all_errors is not None else [],
+            warnings=all_warnings if all_warnings is not None else [],
+            score=score_total / score_count if score_count else None
         )
 
 # Factory functions for common validator combinations
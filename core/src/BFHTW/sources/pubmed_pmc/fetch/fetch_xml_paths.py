@@ -43,11 +43,12 @@ class FetchXML:
 
         # Normalize and filter by PMID
         todays_data["PMID_y"] = todays_data["PMID_y"].astype(str).str.replace(r"\.\d+$", "", regex=True)
-        cleaned_pmids = [str(pmid).replace(".0", "") for pmid in pmids]
+        cleaned_pmids = {str(pmid).replace(".0", "") for pmid in pmids}
         
+        # Boolean-mask indexing already returns a new frame, no extra copy needed
         article_paths = todays_data[
             todays_data["PMID_x"].isin(cleaned_pmids) |
             todays_data["PMID_y"].isin(cleaned_pmids)
-        ].copy()
+        ]
 
         return article_paths
@@ -9,6 +9,12 @@ L = get_logger()
 
 ROOT_DIR = Path(__file__).parents[2]
 
+# orjson decodes the (up to 1M id) esearch responses several times faster when installed
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 
 class PMCAPIClient:
     def __init__(
@@ -31,8 +37,7 @@ class PMCAPIClient:
     def get_search_terms(self) -> List[str]:
         file_path = ROOT_DIR / "sources" / "pubmed_pmc" / self.search_terms_file_path
         
-        with open(file_path, "r") as f:
-            search_terms = json.load(f)
+        search_terms = json_loads(file_path.read_bytes())
 
         if not isinstance(search_terms, list) or not search_terms:
             raise ValueError("search_terms.json must contain a non-empty list of strings.")
@@ -67,7 +72,7 @@ class PMCAPIClient:
 
         response = requests.get(self.url, params=params)
         response.raise_for_status()
-        data = response.json()
+        data = json_loads(response.content)
         L.info(f"Search retrieved {len(data.get('esearchresult', {}).get('idlist', []))} results")
 
         return data.get("esearchresult", {}).get("idlist", [])
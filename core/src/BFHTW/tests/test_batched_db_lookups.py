@@ -0,0 +1,199 @@
+"""
+Tests for the batched SQLite lookups used by the pipelines and validators.
+
+Each test points the CRUD layer at a throwaway database, so no shared data
+is touched. Sizes above MAX_IN_PARAMS make sure the chunked IN queries are
+exercised across several chunks.
+"""
+
+import sqlite3
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from pydantic import BaseModel
+
+from BFHTW.utils.crud import crud as crud_module
+from BFHTW.utils.crud.crud import CRUD, MAX_IN_PARAMS
+from BFHTW.utils.db import sql_connection_wrapper
+from BFHTW.pipelines.validation import DuplicateDetectionValidator
+
+TABLE = "test_documents"
+# Enough rows for three IN chunks
+ROW_COUNT = 2 * MAX_IN_PARAMS + 50
+
+
+class DocumentRow(BaseModel):
+    external_id: str
+    processed: bool
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch: MonkeyPatch):
+    """Point CRUD at a fresh database holding ROW_COUNT unprocessed documents."""
+    path = tmp_path / "test.db"
+    monkeypatch.setattr(sql_connection_wrapper, "DB_PATH", path)
+
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute(f"CREATE TABLE {TABLE} (external_id TEXT PRIMARY KEY, processed INTEGER)")
+        conn.executemany(
+            f"INSERT INTO {TABLE} VALUES (?, 0)",
+            [(f"PMC{i}",) for i in range(ROW_COUNT)]
+        )
+    conn.close()
+    return path
+
+
+def _processed_ids(path) -> set:
+    conn = sqlite3.connect(path)
+    try:
+        return {row[0] for row in conn.execute(f"SELECT external_id FROM {TABLE} WHERE processed = 1")}
+    finally:
+        conn.close()
+
+
+@pytest.mark.unit
+def test_select_existing_spans_chunks(db_path):
+    present = [f"PMC{i}" for i in range(ROW_COUNT)]
+    missing = [f"missing{i}" for i in range(100)]
+
+    found = CRUD.select_existing(table=TABLE, column="external_id", values=present + missing)
+
+    assert found == set(present)
+
+
+@pytest.mark.unit
+def test_select_existing_with_small_chunks(db_path, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(crud_module, "MAX_IN_PARAMS", 3)
+
+    found = CRUD.select_existing(
+        table=TABLE, column="external_id", values=["PMC1", "PMC2", "nope", "PMC3", "PMC4", "PMC5", "PMC6"]
+    )
+
+    assert found == {"PMC1", "PMC2", "PMC3", "PMC4", "PMC5", "PMC6"}
+
+
+@pytest.mark.unit
+def test_select_existing_empty(db_path):
+    assert CRUD.select_existing(table=TABLE, column="external_id", values=[]) == set()
+
+
+@pytest.mark.unit
+def test_bulk_set_updates_every_chunk(db_path):
+    ids = [f"PMC{i}" for i in range(0, ROW_COUNT, 2)]
+
+    updated = CRUD.bulk_set(TABLE, "external_id", ids, {"processed": True})
+
+    assert updated == len(ids)
+    assert _processed_ids(db_path) == set(ids)
+
+
+@pytest.mark.unit
+def test_update_where_in_leaves_room_for_set_params(db_path, monkeypatch: MonkeyPatch):
+    # One SET parameter leaves two IDs per statement under a limit of 3
+    monkeypatch.setattr(crud_module, "MAX_IN_PARAMS", 3)
+    conn = sqlite3.connect(db_path)
+    try:
+        statements = []
+        conn.set_trace_callback(statements.append)
+        with conn:
+            updated = CRUD.update_where_in(conn, TABLE, "external_id", ["PMC1", "PMC2", "PMC3"], {"processed": True})
+    finally:
+        conn.close()
+
+    assert updated == 3
+    assert sum(1 for sql in statements if sql.startswith("UPDATE")) == 2
+    assert _processed_ids(db_path) == {"PMC1", "PMC2", "PMC3"}
+
+
+@pytest.mark.unit
+def test_update_where_in_ignores_empty_input(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        assert CRUD.update_where_in(conn, TABLE, "external_id", [], {"processed": True}) == 0
+        assert CRUD.update_where_in(conn, TABLE, "external_id", ["PMC1"], {}) == 0
+    finally:
+        conn.close()
+
+
+@pytest.mark.unit
+def test_get_by_id_values_spans_chunks(db_path):
+    ids = [f"PMC{i}" for i in range(ROW_COUNT)] + ["missing"]
+
+    rows = CRUD.get(table=TABLE, model=DocumentRow, id_field="external_id", id_values=ids)
+
+    assert len(rows) == ROW_COUNT
+    assert {row.external_id for row in rows} == set(ids[:-1])
+    assert all(isinstance(row, DocumentRow) for row in rows)
+
+
+@pytest.mark.unit
+def test_get_by_empty_id_values(db_path):
+    assert CRUD.get(table=TABLE, model=DocumentRow, id_field="external_id", id_values=[]) == []
+
+
+@pytest.mark.unit
+def test_duplicate_validator_batch(db_path):
+    validator = DuplicateDetectionValidator(table_name=TABLE, unique_fields=["external_id"])
+    batch = [
+        {"external_id": "PMC5"},            # already stored
+        {"external_id": "new-1"},
+        {"external_id": "new-1"},           # repeats an earlier item, not flagged by default
+        DocumentRow(external_id="new-2", processed=False),
+        {"external_id": ""},                # empty values are not checked
+        42,                                 # unsupported format
+    ]
+
+    results = validator.validate_batch(batch)
+
+    assert [result.is_valid for result in results] == [False, True, True, True, True, False]
+    assert "in test_documents" in results[0].errors[0]
+    assert results[5].errors == ["Data format not supported for duplicate detection"]
+
+
+@pytest.mark.unit
+def test_duplicate_validator_flags_batch_duplicates_when_asked(db_path):
+    validator = DuplicateDetectionValidator(
+        table_name=TABLE, unique_fields=["external_id"], flag_batch_duplicates=True
+    )
+    batch = [{"external_id": "new-1"}, {"external_id": "PMC5"}, {"external_id": "new-1"}]
+
+    results = validator.validate_batch(batch)
+
+    assert [result.is_valid for result in results] == [True, False, False]
+    assert results[1].errors == ["Duplicate found for external_id=PMC5 in test_documents"]
+    assert results[2].errors == ["Duplicate found for external_id=new-1 within batch"]
+
+
+@pytest.mark.unit
+def test_duplicate_validator_batch_matches_single_item(db_path):
+    validator = DuplicateDetectionValidator(table_name=TABLE, unique_fields=["external_id"])
+    items = [{"external_id": "PMC7"}, {"external_id": "unseen"}, {"external_id": "unseen"}]
+
+    batch_results = validator.validate_batch(items)
+    single_results = [validator.validate(item) for item in items]
+
+    assert [r.is_valid for r in batch_results] == [r.is_valid for r in single_results]
+
+
+@pytest.mark.unit
+def test_duplicate_validator_batch_spans_chunks(db_path):
+    validator = DuplicateDetectionValidator(table_name=TABLE, unique_fields=["external_id"])
+    batch = [{"external_id": f"PMC{i}"} for i in range(ROW_COUNT)] + [{"external_id": "fresh"}]
+
+    results = validator.validate_batch(batch)
+
+    assert all(not result.is_valid for result in results[:-1])
+    assert results[-1].is_valid
+
+
+@pytest.mark.unit
+def test_duplicate_validator_batch_reports_lookup_failure(tmp_path, monkeypatch: MonkeyPatch):
+    # No such table: the lookup fails and every item gets a warning instead of an error
+    monkeypatch.setattr(sql_connection_wrapper, "DB_PATH", tmp_path / "empty.db")
+    validator = DuplicateDetectionValidator(table_name=TABLE, unique_fields=["external_id"])
+
+    results = validator.validate_batch([{"external_id": "PMC1"}])
+
+    assert results[0].is_valid
+    assert results[0].warnings and "Could not check for duplicates" in results[0].warnings[0]
@@ -0,0 +1,88 @@
+"""
+Tests for BioBERTEmbedder pooling and batching.
+
+A tiny randomly initialised BERT and a word-level vocabulary are saved to a
+temporary directory and loaded through the embedder's normal from_pretrained
+path, so no model download is needed.
+"""
+
+import pytest
+import torch
+from transformers import BertConfig, BertModel, BertTokenizerFast
+
+from BFHTW.ai_assistants.internal.bio_bert.biobert_embeddings import BioBERTEmbedder
+
+WORDS = ["liver", "tumour", "cells", "patients", "were", "treated", "with", "cisplatin"]
+
+
+@pytest.fixture(scope="module")
+def embedder(tmp_path_factory):
+    model_dir = tmp_path_factory.mktemp("tiny-bert")
+    vocab = model_dir / "vocab.txt"
+    vocab.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *WORDS]))
+    BertTokenizerFast(vocab_file=str(vocab)).save_pretrained(model_dir)
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=len(WORDS) + 5, hidden_size=16, num_hidden_layers=1,
+        num_attention_heads=2, intermediate_size=32, max_position_embeddings=512
+    )
+    BertModel(config).save_pretrained(model_dir)
+    return BioBERTEmbedder(model_name=str(model_dir))
+
+
+def _masked_mean(embedder, text: str) -> torch.Tensor:
+    encoded = embedder.tokenizer(text, return_tensors="pt")
+    with torch.inference_mode():
+        return embedder.model(**encoded).last_hidden_state[0].mean(dim=0)
+
+
+@pytest.mark.unit
+def test_embedding_is_mean_over_real_tokens(embedder):
+    text = "liver tumour cells"
+
+    embedding = embedder.embed_batch([text])
+
+    assert embedding.shape == (1, 16)
+    assert embedding.dtype == torch.float32
+    assert torch.allclose(embedding[0], _masked_mean(embedder, text), atol=1e-5)
+
+
+@pytest.mark.unit
+def test_embedding_does_not_depend_on_batch_padding(embedder):
+    short = "liver cells"
+    long = " ".join(WORDS * 4)
+
+    alone = embedder.embed_batch([short])
+    batched = embedder.embed_batch([long, short])
+
+    assert torch.allclose(batched[1], alone[0], atol=1e-5)
+
+
+@pytest.mark.unit
+def test_long_text_averages_its_chunks(embedder):
+    # 600 words become two chunks under the 512-token limit
+    text = " ".join(WORDS * 75)
+
+    embedding = embedder.embed_batch([text], max_tokens_per_batch=1024)
+
+    encoded = embedder.tokenizer(text, truncation=True, max_length=512, return_overflowing_tokens=True)
+    assert len(encoded["input_ids"]) == 2
+    with torch.inference_mode():
+        chunk_means = [
+            embedder.model(input_ids=torch.tensor([ids])).last_hidden_state[0].mean(dim=0)
+            for ids in encoded["input_ids"]
+        ]
+    expected = torch.stack(chunk_means).mean(dim=0)
+    assert torch.allclose(embedding[0], expected, atol=1e-4)
+
+
+@pytest.mark.unit
+def test_run_batch_keeps_input_order(embedder):
+    texts = ["liver", "patients were treated with cisplatin", "tumour cells"]
+
+    results = embedder.run_batch(texts, block_ids=["b1", "b2", "b3"], doc_ids=["d"] * 3, pages=[1, 2, 3])
+
+    assert [result.block_id for result in results] == ["b1", "b2", "b3"]
+    expected = embedder.embed_batch(texts)
+    for result, row in zip(results, expected):
+        assert torch.allclose(torch.tensor(result.embedding), row, atol=1e-5)
@@ -0,0 +1,74 @@
+"""
+Tests for CRUD.insert_rows, the bulk insert used by the pipelines' flushes.
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from BFHTW.utils.crud.crud import CRUD
+from BFHTW.utils.db import sql_connection_wrapper
+
+TABLE = "test_rows"
+FIELDS = ["row_id", "value"]
+
+
+@dataclass
+class Row:
+    row_id: str
+    value: Any
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch: MonkeyPatch):
+    path = tmp_path / "test.db"
+    monkeypatch.setattr(sql_connection_wrapper, "DB_PATH", path)
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute(f"CREATE TABLE {TABLE} (row_id TEXT PRIMARY KEY, value TEXT)")
+    conn.close()
+    return path
+
+
+def _stored_ids(path) -> list:
+    conn = sqlite3.connect(path)
+    try:
+        return sorted(row[0] for row in conn.execute(f"SELECT row_id FROM {TABLE}"))
+    finally:
+        conn.close()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("on_conflict", ["REPLACE", "IGNORE"])
+def test_insert_rows_counts_rows_once_after_a_failed_batch(db_path, on_conflict):
+    # Row 3 cannot be bound, so executemany fails after writing rows 1 and 2
+    rows = [Row("r1", "a"), Row("r2", "b"), Row("r3", {"not": "bindable"}), Row("r4", "d")]
+
+    with CRUD.transaction() as conn:
+        written = CRUD.insert_rows(conn, TABLE, rows, on_conflict=on_conflict, fields=FIELDS)
+
+    assert written == 3
+    assert _stored_ids(db_path) == ["r1", "r2", "r4"]
+
+
+@pytest.mark.unit
+def test_insert_rows_ignore_skips_existing_rows(db_path):
+    with CRUD.transaction() as conn:
+        CRUD.insert_rows(conn, TABLE, [Row("r1", "a")], fields=FIELDS)
+        written = CRUD.insert_rows(conn, TABLE, [Row("r1", "x"), Row("r2", "b")], on_conflict="IGNORE", fields=FIELDS)
+
+    assert written == 1
+    assert _stored_ids(db_path) == ["r1", "r2"]
+
+
+@pytest.mark.unit
+def test_insert_rows_failure_keeps_earlier_writes_in_the_transaction(db_path):
+    # The savepoint only undoes the failed batch, not what the transaction wrote before it
+    with CRUD.transaction() as conn:
+        CRUD.insert_rows(conn, TABLE, [Row("r0", "z")], fields=FIELDS)
+        CRUD.insert_rows(conn, TABLE, [Row("r1", "a"), Row("r2", {"bad": 1})], fields=FIELDS)
+
+    assert _stored_ids(db_path) == ["r0", "r1"]
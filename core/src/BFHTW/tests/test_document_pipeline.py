@@ -0,0 +1,216 @@
+"""
+Unit tests for DocumentProcessingPipeline internals that need no network,
+no AI models and no Qdrant server.
+"""
+
+import sqlite3
+import threading
+from uuid import uuid4
+
+import fitz
+import pytest
+import torch
+from _pytest.monkeypatch import MonkeyPatch
+from pydantic import BaseModel
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, VectorParams
+
+from BFHTW.models.document_main import Document
+from BFHTW.pipelines import document_processing_pipeline as dpp
+from BFHTW.pipelines.base_pipeline import PipelineResult, PipelineStatus
+from BFHTW.pipelines.document_processing_pipeline import DocumentProcessingPipeline
+from BFHTW.utils.db import sql_connection_wrapper
+from BFHTW.utils.qdrant.qdrant_crud import QdrantCRUD
+
+PARAGRAPH = "Hepatoblastoma is the most common primary liver tumour in young children."
+
+
+class BlockRow(BaseModel):
+    block_id: str
+    doc_id: str
+    text: str
+
+
+def _document(**overrides) -> Document:
+    fields = dict(
+        source_db="LOCAL", external_id="PMC1", format="pdf", title=None,
+        source_file=None, retrieved_at=None
+    )
+    fields.update(overrides)
+    return Document(**fields)
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "article.pdf"
+    pdf = fitz.open()
+    pdf.new_page().insert_text((72, 72), PARAGRAPH)
+    pdf.save(path)
+    pdf.close()
+    return path
+
+
+@pytest.mark.unit
+def test_parse_in_worker_process(pdf_path):
+    # Parse jobs cross the process boundary as a path and a Document only
+    item = _document()
+    pool = dpp._process_pool(1)
+    try:
+        doc_info = pool.submit(
+            DocumentProcessingPipeline._extract_document_content, pdf_path.parent, item, False
+        ).result(timeout=120)
+    finally:
+        pool.shutdown()
+
+    assert doc_info["format"] == "pdf"
+    assert [block.text for block in doc_info["blocks"]] == [PARAGRAPH]
+    assert all(block.doc_id == item.doc_id for block in doc_info["blocks"])
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch: MonkeyPatch):
+    """A pipeline without AI models, writing to a throwaway database."""
+    monkeypatch.setattr(sql_connection_wrapper, "DB_PATH", tmp_path / "test.db")
+    conn = sqlite3.connect(tmp_path / "test.db")
+    with conn:
+        conn.execute("CREATE TABLE documents (doc_id TEXT PRIMARY KEY, processed INTEGER)")
+        conn.execute("CREATE TABLE blocks (block_id TEXT PRIMARY KEY, doc_id TEXT, text TEXT)")
+        conn.executemany("INSERT INTO documents VALUES (?, 0)", [("doc-1",), ("doc-2",)])
+    conn.close()
+    return DocumentProcessingPipeline(
+        enable_ai_processing=False, enable_embeddings=False, temp_dir=str(tmp_path / "temp")
+    )
+
+
+def _block(doc_id: str, block_id: str) -> BlockRow:
+    return BlockRow(block_id=block_id, doc_id=doc_id, text=PARAGRAPH)
+
+
+def _processed_docs(tmp_path) -> set:
+    conn = sqlite3.connect(tmp_path / "test.db")
+    try:
+        return {row[0] for row in conn.execute("SELECT doc_id FROM documents WHERE processed = 1")}
+    finally:
+        conn.close()
+
+
+def _count_rows(tmp_path, table: str) -> int:
+    conn = sqlite3.connect(tmp_path / "test.db")
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.mark.unit
+def test_flush_rows_commits_rows_and_flags(pipeline, tmp_path):
+    pipeline._buffer_rows("blocks", [_block("doc-1", "b1"), _block("doc-2", "b2")])
+    pipeline._pending_processed.extend(["doc-1", "doc-2"])
+
+    pipeline._flush_rows()
+
+    assert _processed_docs(tmp_path) == {"doc-1", "doc-2"}
+    assert _count_rows(tmp_path, "blocks") == 2
+    assert pipeline._unwritten_documents == 0
+
+
+@pytest.mark.unit
+def test_failed_flush_is_reported_as_failed_documents(pipeline, tmp_path):
+    # The processed flags cannot be written, so the blocks roll back with them
+    conn = sqlite3.connect(tmp_path / "test.db")
+    with conn:
+        conn.execute("ALTER TABLE documents RENAME TO documents_old")
+    conn.close()
+    pipeline._buffer_rows("blocks", [_block("doc-1", "b1")])
+    pipeline._pending_processed.extend(["doc-1", "doc-2"])
+
+    pipeline._flush_rows()
+    result = pipeline._account_for_write_failures(
+        PipelineResult(status=PipelineStatus.SUCCESS, processed_count=3, failed_count=0)
+    )
+
+    assert _count_rows(tmp_path, "blocks") == 0
+    assert (result.processed_count, result.failed_count) == (1, 2)
+    assert result.status is PipelineStatus.SUCCESS
+    assert result.errors and "2 documents" in result.errors[0]
+
+
+@pytest.mark.unit
+def test_run_fails_when_no_document_was_written(pipeline):
+    pipeline._unwritten_documents = 2
+    pipeline._write_errors = ["Failed to flush rows for 2 documents: boom"]
+
+    result = pipeline._account_for_write_failures(
+        PipelineResult(status=PipelineStatus.SUCCESS, processed_count=2, failed_count=0)
+    )
+
+    assert result.status is PipelineStatus.FAILED
+    assert (result.processed_count, result.failed_count) == (0, 2)
+
+
+def _in_memory_qdrant(collection_name: str, create: bool = True) -> QdrantCRUD:
+    # Local-mode client; skips QdrantCRUD.__init__, which needs a server
+    qdrant = QdrantCRUD.__new__(QdrantCRUD)
+    qdrant.client = QdrantClient(":memory:")
+    qdrant.collection_name = collection_name
+    if create:
+        qdrant.client.create_collection(collection_name, vectors_config=VectorParams(size=4, distance=Distance.COSINE))
+    return qdrant
+
+
+def _buffer_document(pipeline, doc_id: str, with_points: bool = True) -> str:
+    block = _block(doc_id, str(uuid4()))
+    pipeline._buffer_rows("blocks", [block])
+    if with_points:
+        pipeline._point_ids.append(block.block_id)
+        pipeline._point_doc_ids.add(doc_id)
+        pipeline._point_vectors.append(torch.ones(1, 4))
+        pipeline._point_payloads.append({"doc_id": doc_id, "page": 1, "block_id": block.block_id})
+    pipeline._pending_processed.append(doc_id)
+    return block.block_id
+
+
+@pytest.mark.unit
+def test_flush_rows_uploads_points_first(pipeline, tmp_path):
+    pipeline.qdrant_client = _in_memory_qdrant("bio_blocks")
+    _buffer_document(pipeline, "doc-1")
+    _buffer_document(pipeline, "doc-2")
+
+    pipeline._flush_rows()
+
+    assert pipeline.qdrant_client.client.count("bio_blocks").count == 2
+    assert _processed_docs(tmp_path) == {"doc-1", "doc-2"}
+    assert not pipeline._point_ids
+
+
+@pytest.mark.unit
+def test_failed_upload_leaves_documents_unprocessed(pipeline, tmp_path):
+    # The collection does not exist, so the upload fails
+    pipeline.qdrant_client = _in_memory_qdrant("bio_blocks", create=False)
+    _buffer_document(pipeline, "doc-1")
+    _buffer_document(pipeline, "doc-2", with_points=False)
+
+    pipeline._flush_rows()
+
+    assert _processed_docs(tmp_path) == {"doc-2"}
+    assert _count_rows(tmp_path, "blocks") == 1
+    assert pipeline._unwritten_documents == 1
+    assert "vectors failed to upload" in pipeline._write_errors[0]
+
+
+@pytest.mark.unit
+def test_run_shuts_down_its_threads(pipeline):
+    # No unprocessed documents: run() still starts and stops every pool
+    pipeline.parse_workers = 0
+    pipeline.extract_workers = 0
+    conn = sqlite3.connect(sql_connection_wrapper.DB_PATH)
+    with conn:
+        conn.execute("DELETE FROM documents")
+    conn.close()
+
+    for _ in range(2):
+        pipeline.run()
+
+    assert pipeline._download_pool is None and pipeline._cleanup_pool is None and pipeline._ai_executor is None
+    names = [thread.name for thread in threading.enumerate()]
+    assert not [name for name in names if name.startswith(("download", "cleanup", "ai_"))]
@@ -0,0 +1,119 @@
+"""
+Tests for the streaming PubMed NXML parser.
+
+A small article covering nested sections, titles, empty paragraphs and
+inline markup is written to a temporary file. The BioBERT tokenizer is
+replaced with a whitespace tokenizer so no model download is needed.
+"""
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from BFHTW.utils.nxml import nxml_parser
+from BFHTW.utils.nxml.nxml_parser import PubMedNXMLParser
+
+ARTICLE = b"""<?xml version="1.0" encoding="UTF-8"?>
+<?properties open_access?>
+<article>
+  <front>
+    <journal-meta><journal-title-group><journal-title>Journal of Tests</journal-title></journal-title-group></journal-meta>
+    <article-meta>
+      <article-id pub-id-type="pmc">PMC123</article-id>
+      <article-id pub-id-type="doi">10.1000/test.1</article-id>
+      <title-group><article-title>Streaming Parser Fixture</article-title></title-group>
+      <pub-date><year>2024</year></pub-date>
+      <abstract><p>Abstract text.</p></abstract>
+    </article-meta>
+  </front>
+  <body>
+    <sec>
+      <title>Introduction</title>
+      <p>First paragraph.</p>
+      <p>   </p>
+      <sec>
+        <title>Background</title>
+        <p>Nested <italic>paragraph</italic> here.</p>
+        <sec>
+          <p>Untitled deep paragraph.</p>
+        </sec>
+      </sec>
+      <p>Closing intro paragraph.</p>
+    </sec>
+    <sec>
+      <title>Methods</title>
+      <p/>
+      <p>Methods paragraph.</p>
+    </sec>
+  </body>
+  <back><ref-list><ref><p>Not a body paragraph.</p></ref></ref-list></back>
+</article>
+"""
+
+
+class _WhitespaceTokenizer:
+    def encode(self, text, add_special_tokens=True):
+        return text.split()
+
+
+@pytest.fixture
+def parser(tmp_path, monkeypatch: MonkeyPatch):
+    path = tmp_path / "article.nxml"
+    path.write_bytes(ARTICLE)
+    monkeypatch.setattr(
+        nxml_parser.AutoTokenizer, "from_pretrained", staticmethod(lambda *args, **kwargs: _WhitespaceTokenizer())
+    )
+    return PubMedNXMLParser(path, doc_id="doc-1", source_db="pubmed", source_file="PMC123.tar.gz")
+
+
+@pytest.mark.unit
+def test_blocks_follow_section_order(parser):
+    blocks = list(parser.extract_blocks())
+
+    assert [(b.section_index, b.section_title, b.text) for b in blocks] == [
+        (1, "Introduction", "First paragraph."),
+        (1, "Introduction", "Closing intro paragraph."),
+        (2, "Background", "Nested paragraph here."),
+        (3, None, "Untitled deep paragraph."),
+        (4, "Methods", "Methods paragraph."),
+    ]
+
+
+@pytest.mark.unit
+def test_block_offsets_and_fields(parser):
+    blocks = list(parser.extract_blocks())
+
+    char_start = 0
+    for block in blocks:
+        assert block.char_start == char_start
+        assert block.char_end == char_start + len(block.text)
+        assert block.token_count == len(block.text.split())
+        assert block.doc_id == "doc-1"
+        assert block.block_type == "paragraph"
+        char_start = block.char_end + 1
+    assert len({block.block_id for block in blocks}) == len(blocks)
+
+
+@pytest.mark.unit
+def test_nxml_metadata_from_header(parser):
+    metadata = parser.get_nxml_metadata()
+
+    assert metadata.title == "Streaming Parser Fixture"
+    assert metadata.external_id == "PMC123"
+    assert metadata.doi == "10.1000/test.1"
+    assert metadata.journal == "Journal of Tests"
+    assert metadata.publication_date == "2024"
+    assert metadata.open_access
+    # Only the header was parsed
+    assert parser._tree is None
+
+
+@pytest.mark.unit
+def test_header_scope_does_not_hide_the_body(parser):
+    with parser.header_scope():
+        assert parser.tree is parser._header_tree
+        assert parser.get_text(".//article-title") == "Streaming Parser Fixture"
+
+    # Outside the scope lookups go to the full article again
+    assert parser.tree is not parser._header_tree
+    assert parser.root.find(".//body/sec/title").text == "Introduction"
+    assert parser.extract_abstract() == "Abstract text."
@@ -0,0 +1,171 @@
+"""
+Tests for PipelineManager config loading and the run timeout watchdog.
+
+Configs are written to a temporary directory and only declare manual
+pipelines, so nothing is registered with the global scheduler.
+"""
+
+import json
+import os
+import threading
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from BFHTW.pipelines.base_pipeline import PipelineResult, PipelineStatus
+from BFHTW.pipelines.pipeline_manager import PipelineManager
+
+CONFIG_YAML = """\
+pipelines:
+  slow:
+    pipeline_class: some.module.SlowPipeline
+    schedule_type: manual
+    max_runtime_minutes: {runtime}
+"""
+
+
+def _write_config(path, runtime=5, mtime=None):
+    path.write_text(CONFIG_YAML.format(runtime=runtime))
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    return _write_config(tmp_path / "pipelines.yaml", mtime=1_000_000)
+
+
+@pytest.mark.unit
+def test_yaml_config_writes_json_cache(config_file):
+    manager = PipelineManager(str(config_file))
+
+    cache_file = config_file.with_suffix(".yaml.json")
+    assert manager.pipelines["slow"].max_runtime_minutes == 5
+    assert json.loads(cache_file.read_text()) == {
+        "pipelines": {
+            "slow": {
+                "pipeline_class": "some.module.SlowPipeline",
+                "schedule_type": "manual",
+                "max_runtime_minutes": 5,
+            }
+        }
+    }
+
+
+@pytest.mark.unit
+def test_fresh_cache_is_used(config_file):
+    PipelineManager(str(config_file))
+    cache_file = config_file.with_suffix(".yaml.json")
+    cache_file.write_text(json.dumps({"pipelines": {"cached": {"pipeline_class": "some.module.Cached"}}}))
+
+    manager = PipelineManager(str(config_file))
+
+    assert list(manager.pipelines) == ["cached"]
+
+
+@pytest.mark.unit
+def test_stale_cache_is_rebuilt(config_file):
+    PipelineManager(str(config_file))
+    cache_file = config_file.with_suffix(".yaml.json")
+
+    # The YAML is edited after the cache was written
+    _write_config(config_file, runtime=9, mtime=cache_file.stat().st_mtime + 10)
+    manager = PipelineManager(str(config_file))
+
+    assert manager.pipelines["slow"].max_runtime_minutes == 9
+    assert json.loads(cache_file.read_text())["pipelines"]["slow"]["max_runtime_minutes"] == 9
+
+
+@pytest.mark.unit
+def test_unreadable_cache_falls_back_to_yaml(config_file):
+    cache_file = config_file.with_suffix(".yaml.json")
+    cache_file.write_text("{not json")
+
+    manager = PipelineManager(str(config_file))
+
+    assert manager.pipelines["slow"].max_runtime_minutes == 5
+    assert json.loads(cache_file.read_text())["pipelines"]["slow"]["max_runtime_minutes"] == 5
+
+
+@pytest.mark.unit
+def test_json_config_is_read_without_cache(tmp_path):
+    config_file = tmp_path / "pipelines.json"
+    config_file.write_text(json.dumps({"pipelines": {"slow": {"pipeline_class": "some.module.SlowPipeline"}}}))
+
+    manager = PipelineManager(str(config_file))
+
+    assert list(manager.pipelines) == ["slow"]
+    assert not (tmp_path / "pipelines.yaml.json").exists()
+    assert not (tmp_path / "pipelines.json.json").exists()
+
+
+class _BlockingPipeline:
+    """Stands in for a pipeline whose run() waits until released."""
+
+    name = "slow"
+
+    def __init__(self, error=None):
+        self.release = threading.Event()
+        self.error = error
+
+    def run(self):
+        self.release.wait(10)
+        if self.error is not None:
+            raise self.error
+        return PipelineResult(status=PipelineStatus.SUCCESS, processed_count=1)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    # A 0.6 second timeout
+    return PipelineManager(str(_write_config(tmp_path / "pipelines.yaml", runtime=0.01)))
+
+
+def _start(manager, monkeypatch: MonkeyPatch, pipeline):
+    monkeypatch.setattr(manager, "_create_pipeline_instance", lambda config, params: pipeline)
+    return manager.run_pipeline("slow")
+
+
+@pytest.mark.unit
+def test_run_within_timeout_returns_result(manager, monkeypatch: MonkeyPatch):
+    pipeline = _BlockingPipeline()
+    pipeline.release.set()
+
+    result = _start(manager, monkeypatch, pipeline)
+
+    assert result.status == PipelineStatus.SUCCESS
+    assert manager.running_pipelines == {}
+    assert manager.get_pipeline_status("slow")["status"] == "idle"
+
+
+@pytest.mark.unit
+def test_pipeline_error_is_raised_to_the_caller(manager):
+    pipeline = _BlockingPipeline(error=RuntimeError("boom"))
+    pipeline.release.set()
+
+    with pytest.raises(RuntimeError, match="boom"):
+        manager._run_with_timeout("slow", pipeline, 0.01)
+    assert manager._abandoned == {}
+
+
+@pytest.mark.unit
+def test_timed_out_run_stays_running_until_its_thread_exits(manager, monkeypatch: MonkeyPatch):
+    pipeline = _BlockingPipeline()
+
+    result = _start(manager, monkeypatch, pipeline)
+
+    assert result.status == PipelineStatus.FAILED
+    assert "exceeded" in result.errors[0]
+    assert "slow" in manager.running_pipelines
+    assert manager.get_pipeline_status("slow")["status"] == "abandoned"
+    # A second run is refused while the first thread is alive
+    assert _start(manager, monkeypatch, _BlockingPipeline()) is None
+
+    worker = manager._abandoned["slow"]
+    pipeline.release.set()
+    worker.join(5)
+
+    assert manager._abandoned == {}
+    assert manager.running_pipelines == {}
+    assert manager.get_pipeline_status("slow")["status"] == "idle"
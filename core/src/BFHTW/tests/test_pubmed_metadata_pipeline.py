@@ -0,0 +1,125 @@
+"""
+Tests for the PubMed metadata pipeline's document rows and id stream.
+
+Rows are written to a throwaway database created with the same schema
+the pipeline runner uses; the PMC source is never contacted.
+"""
+
+import sqlite3
+import uuid
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from BFHTW.models.document_main import Document
+from BFHTW.pipelines.pubmed_pmc import pubmed_metadata_pipeline as pmp
+from BFHTW.utils.crud.crud import CRUD
+from BFHTW.utils.db import sql_connection_wrapper
+
+ITEMS = [
+    {"pmcid": "PMC1", "title": "First", "ftp_path": "oa_package/00/01/PMC1.tar.gz", "license_type": "CC BY"},
+    {"pmcid": "PMC2", "title": float("nan"), "ftp_path": float("nan"), "license_type": None},
+]
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch: MonkeyPatch):
+    """A strict pipeline writing to a fresh documents table."""
+    path = tmp_path / "test.db"
+    monkeypatch.setattr(sql_connection_wrapper, "DB_PATH", path)
+    CRUD.create_table_if_not_exists(table="documents", model=Document, primary_key="doc_id", unique_fields=["external_id"])
+
+    pipeline = pmp.PubMedMetadataPipeline(update_reference_files=False)
+    pipeline._conn = CRUD.connect()
+    yield pipeline
+    pipeline._conn.close()
+
+
+def _stored_rows(pipeline) -> dict:
+    conn = sqlite3.connect(sql_connection_wrapper.DB_PATH)
+    conn.row_factory = sqlite3.Row
+    try:
+        return {row["external_id"]: dict(row) for row in conn.execute("SELECT * FROM documents")}
+    finally:
+        conn.close()
+
+
+@pytest.mark.unit
+def test_uuid4_stream_yields_valid_unique_ids():
+    stream = pmp._uuid4_stream(chunk=4)
+    # Several urandom calls
+    ids = [next(stream) for _ in range(10)]
+
+    assert len(set(ids)) == len(ids)
+    for value in ids:
+        parsed = uuid.UUID(value)
+        assert parsed.version == 4
+        assert parsed.variant == uuid.RFC_4122
+        assert str(parsed) == value
+
+
+@pytest.mark.unit
+def test_process_item_builds_row(pipeline):
+    row = pipeline.process_item(ITEMS[0])
+
+    assert isinstance(row, pmp._DocumentRow)
+    assert uuid.UUID(row.doc_id).version == 4
+    assert row.external_id == "PMC1"
+    assert row.source_file == "PMC1.tar.gz"
+    assert row.notes == "FTP Path: oa_package/00/01/PMC1.tar.gz, License: CC BY"
+    assert not row.processed and not row.qdrant_synced
+
+
+@pytest.mark.unit
+def test_process_item_treats_nan_as_missing(pipeline):
+    row = pipeline.process_item(ITEMS[1])
+
+    assert row.title is None
+    assert row.source_file is None
+    assert row.license_type is None
+    assert row.notes == "FTP Path: , License: "
+
+
+@pytest.mark.unit
+def test_store_batch_writes_document_columns(pipeline):
+    rows = [pipeline.process_item(item) for item in ITEMS]
+
+    assert pipeline.store_batch(rows) == 2
+
+    stored = _stored_rows(pipeline)
+    assert stored["PMC1"]["doc_id"] == rows[0].doc_id
+    assert stored["PMC1"]["source_file"] == "PMC1.tar.gz"
+    assert stored["PMC1"]["ingest_pipeline"] == "pubmed_metadata_pipeline"
+    assert stored["PMC1"]["processed"] == 0
+    # Columns the row does not carry are left NULL
+    assert stored["PMC1"]["authors"] is None
+    assert stored["PMC2"]["title"] is None
+    # Stored rows load back as Documents
+    documents = CRUD.get(table="documents", model=Document, id_field="external_id", id_values=["PMC1", "PMC2"])
+    assert {document.external_id for document in documents} == {"PMC1", "PMC2"}
+
+
+@pytest.mark.unit
+def test_store_batch_skips_known_and_repeated_ids(pipeline):
+    first = pipeline.process_item(ITEMS[0])
+    assert pipeline.store_batch([first]) == 1
+
+    again = pipeline.process_item(ITEMS[0])
+    new = pipeline.process_item(ITEMS[1])
+    repeat = pipeline.process_item(ITEMS[1])
+
+    assert pipeline.store_batch([again, new, repeat]) == 1
+    # The first doc_id for PMC1 is kept
+    assert _stored_rows(pipeline)["PMC1"]["doc_id"] == first.doc_id
+    assert {"PMC1", "PMC2"} <= pipeline._known_ids
+
+
+@pytest.mark.unit
+def test_lenient_store_keeps_existing_rows(pipeline):
+    pipeline.strict_validation = False
+    first = pipeline.process_item(ITEMS[0])
+    pipeline.store_batch([first])
+
+    # The unique index ignores the second row for the same external_id
+    assert pipeline.store_batch([pipeline.process_item(ITEMS[0])]) == 0
+    assert _stored_rows(pipeline)["PMC1"]["doc_id"] == first.doc_id
@@ -0,0 +1,76 @@
+"""
+Tests for resolving Qdrant hits back to the SQLite blocks they embed.
+
+Uses qdrant_client's in-memory mode and a throwaway SQLite database.
+"""
+
+import sqlite3
+from uuid import uuid4
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from BFHTW.utils.db import sql_connection_wrapper
+from BFHTW.utils.qdrant.qdrant_crud import QdrantCRUD, load_blocks
+
+PIPELINE_BLOCK = str(uuid4())
+SCRIPT_BLOCK = str(uuid4())
+LEGACY_BLOCK = str(uuid4())
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch: MonkeyPatch):
+    path = tmp_path / "test.db"
+    monkeypatch.setattr(sql_connection_wrapper, "DB_PATH", path)
+    conn = sqlite3.connect(path)
+    with conn:
+        for table in ("blocks", "pdf_blocks"):
+            conn.execute(f"CREATE TABLE {table} (block_id TEXT PRIMARY KEY, doc_id TEXT, text TEXT)")
+        conn.execute("INSERT INTO blocks VALUES (?, 'doc-1', 'pipeline text')", (PIPELINE_BLOCK,))
+        conn.execute("INSERT INTO pdf_blocks VALUES (?, 'doc-2', 'script text')", (SCRIPT_BLOCK,))
+        conn.execute("INSERT INTO pdf_blocks VALUES (?, 'doc-3', 'legacy text')", (LEGACY_BLOCK,))
+    conn.close()
+    return path
+
+
+@pytest.mark.unit
+def test_load_blocks_reads_each_table(db_path):
+    blocks = load_blocks([("blocks", PIPELINE_BLOCK), ("pdf_blocks", SCRIPT_BLOCK), ("blocks", "missing")])
+
+    assert {block_id: block.text for block_id, block in blocks.items()} == {
+        PIPELINE_BLOCK: "pipeline text",
+        SCRIPT_BLOCK: "script text",
+    }
+
+
+@pytest.mark.unit
+def test_load_blocks_searches_all_tables_for_untagged_points(db_path):
+    blocks = load_blocks([(None, LEGACY_BLOCK)])
+
+    assert blocks[LEGACY_BLOCK].text == "legacy text"
+
+
+@pytest.mark.unit
+def test_load_blocks_skips_missing_tables(db_path):
+    blocks = load_blocks([("no_such_table", PIPELINE_BLOCK), (None, PIPELINE_BLOCK)])
+
+    assert blocks[PIPELINE_BLOCK].text == "pipeline text"
+
+
+@pytest.mark.unit
+def test_get_similar_blocks_resolves_both_tables(db_path):
+    qdrant = QdrantCRUD.__new__(QdrantCRUD)
+    qdrant.client = QdrantClient(":memory:")
+    qdrant.collection_name = "bio_blocks"
+    qdrant.client.create_collection("bio_blocks", vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+    qdrant.client.upsert("bio_blocks", points=[
+        PointStruct(id=PIPELINE_BLOCK, vector=[1.0, 0.0], payload={"block_id": PIPELINE_BLOCK, "table": "blocks"}),
+        PointStruct(id=SCRIPT_BLOCK, vector=[0.9, 0.1], payload={"block_id": SCRIPT_BLOCK, "table": "pdf_blocks"}),
+        PointStruct(id=LEGACY_BLOCK, vector=[0.8, 0.2], payload={"block_id": LEGACY_BLOCK}),
+    ])
+
+    results = qdrant.get_similar_blocks([1.0, 0.0], top_k=3)
+
+    assert [block.text for _, block in results] == ["pipeline text", "script text", "legacy text"]
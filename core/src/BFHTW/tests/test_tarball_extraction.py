@@ -0,0 +1,188 @@
+"""
+Tests for tarball extraction, in-process, while streaming a download, and
+in the pipeline's worker pool.
+
+Archives are built on the fly in a temporary directory and streamed from a
+local HTTP server, so no network access or fixture files are needed.
+"""
+
+import functools
+import io
+import tarfile
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from BFHTW.utils.io.tarball_fetcher import TarballFetcher
+from BFHTW.pipelines import document_processing_pipeline as dpp
+
+ARTICLE_FILES = {
+    "PMC123/article.nxml": b"<article><body><p>Text</p></body></article>",
+    "PMC123/figure1.jpg": b"\xff\xd8\xff",
+    "PMC123/paper.pdf": b"%PDF-1.4 minimal",
+}
+
+
+def _make_tarball(path, files=ARTICLE_FILES):
+    with tarfile.open(path, "w:gz") as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return path
+
+
+@pytest.fixture
+def tarball(tmp_path):
+    return _make_tarball(tmp_path / "PMC123.tar.gz")
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def served(tmp_path):
+    """Serve tmp_path/www over HTTP; yields (directory, base URL)."""
+    root = tmp_path / "www"
+    root.mkdir()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_QuietHandler, directory=str(root)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield root, f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.unit
+def test_extract_writes_every_member(tmp_path, tarball):
+    fetcher = TarballFetcher(tmp_path / "fetcher")
+
+    extracted = fetcher.extract(tarball, extract_to=tmp_path / "out")
+
+    for name, data in ARTICLE_FILES.items():
+        assert (extracted / name).read_bytes() == data
+
+
+@pytest.mark.unit
+def test_extract_rejects_corrupt_archive(tmp_path):
+    broken = tmp_path / "broken.tar.gz"
+    broken.write_bytes(b"not a tarball")
+
+    with pytest.raises(Exception):
+        TarballFetcher(tmp_path / "fetcher").extract(broken, extract_to=tmp_path / "out")
+
+
+@pytest.mark.unit
+def test_stream_extract_writes_every_member(tmp_path, served):
+    root, base_url = served
+    _make_tarball(root / "PMC123.tar.gz")
+    fetcher = TarballFetcher(tmp_path / "fetcher")
+
+    extracted = fetcher.stream_extract(f"{base_url}/PMC123.tar.gz", tmp_path / "out")
+
+    for name, data in ARTICLE_FILES.items():
+        assert (extracted / name).read_bytes() == data
+    # Nothing but the extracted files is written
+    assert list((tmp_path / "fetcher").iterdir()) == []
+
+
+@pytest.mark.unit
+def test_stream_extract_rejects_corrupt_archive(tmp_path, served):
+    root, base_url = served
+    (root / "broken.tar.gz").write_bytes(b"not a tarball")
+
+    with pytest.raises(RuntimeError, match="Tar extraction error"):
+        TarballFetcher(tmp_path / "fetcher").stream_extract(f"{base_url}/broken.tar.gz", tmp_path / "out")
+
+
+@pytest.mark.unit
+def test_stream_extract_raises_for_http_errors(tmp_path, served):
+    _, base_url = served
+
+    with pytest.raises(requests.HTTPError):
+        TarballFetcher(tmp_path / "fetcher").stream_extract(f"{base_url}/missing.tar.gz", tmp_path / "out")
+
+
+@pytest.mark.unit
+def test_stream_extract_first_writes_only_the_match(tmp_path, served):
+    root, base_url = served
+    _make_tarball(root / "PMC123.tar.gz")
+
+    pdf = TarballFetcher(tmp_path / "fetcher").stream_extract_first(
+        f"{base_url}/PMC123.tar.gz", tmp_path / "out", ".PDF"
+    )
+
+    assert pdf == tmp_path / "out" / "paper.pdf"
+    assert pdf.read_bytes() == ARTICLE_FILES["PMC123/paper.pdf"]
+    assert list((tmp_path / "out").iterdir()) == [pdf]
+
+
+@pytest.mark.unit
+def test_stream_extract_first_stops_at_the_match(tmp_path, served):
+    root, base_url = served
+    archive = _make_tarball(root / "PMC123.tar.gz", {
+        "PMC123/paper.pdf": b"%PDF-1.4 minimal",
+        "PMC123/movie.bin": bytes(range(256)) * 40_000,
+    })
+    # Cut the archive inside the second member; a full read would fail
+    archive.write_bytes(archive.read_bytes()[:4096])
+
+    pdf = TarballFetcher(tmp_path / "fetcher").stream_extract_first(
+        f"{base_url}/PMC123.tar.gz", tmp_path / "out", ".pdf"
+    )
+
+    assert pdf.read_bytes() == b"%PDF-1.4 minimal"
+
+
+@pytest.mark.unit
+def test_stream_extract_first_keeps_members_inside_target(tmp_path, served):
+    root, base_url = served
+    _make_tarball(root / "evil.tar.gz", {"../../escape.pdf": b"%PDF"})
+
+    pdf = TarballFetcher(tmp_path / "fetcher").stream_extract_first(
+        f"{base_url}/evil.tar.gz", tmp_path / "out", ".pdf"
+    )
+
+    assert pdf == tmp_path / "out" / "escape.pdf"
+    assert not (tmp_path / "escape.pdf").exists()
+
+
+@pytest.mark.unit
+def test_stream_extract_first_without_match(tmp_path, served):
+    root, base_url = served
+    _make_tarball(root / "PMC123.tar.gz", {"PMC123/article.nxml": b"<article/>"})
+
+    assert TarballFetcher(tmp_path / "fetcher").stream_extract_first(
+        f"{base_url}/PMC123.tar.gz", tmp_path / "out", ".pdf"
+    ) is None
+    assert list((tmp_path / "out").iterdir()) == []
+
+
+@pytest.mark.unit
+def test_process_pool_does_not_fork():
+    pool = dpp._process_pool(1)
+    try:
+        assert pool._mp_context.get_start_method() in ("forkserver", "spawn")
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.unit
+def test_extract_in_worker_process(tmp_path, tarball):
+    pool = dpp._process_pool(1)
+    try:
+        extracted = pool.submit(
+            dpp._extract_in_worker, str(tmp_path / "fetcher"), tarball, tmp_path / "out"
+        ).result(timeout=120)
+    finally:
+        pool.shutdown()
+
+    for name, data in ARTICLE_FILES.items():
+        assert (extracted / name).read_bytes() == data
+    assert dpp._find_doc(extracted)[0] == extracted / "PMC123/paper.pdf"
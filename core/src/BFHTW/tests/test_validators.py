@@ -0,0 +1,163 @@
+"""
+Unit tests for the validators in BFHTW.pipelines.validation.
+
+These cover behaviour that the demo-style checks in
+test_validation_framework.py do not reach and that runs without PyMuPDF.
+"""
+
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from BFHTW.models.pdf_models import PDFBlock
+from BFHTW.pipelines import validation
+from BFHTW.pipelines.validation import BiomedicalContentValidator, ForeignKeyValidator, SchemaValidator
+from BFHTW.utils.db import sql_connection_wrapper
+
+
+@pytest.mark.unit
+def test_schema_validator_checks_constructed_instances():
+    # model_construct skips validation, so the validator has to check the fields
+    validator = SchemaValidator(PDFBlock, strict=True)
+
+    result = validator.validate(PDFBlock.model_construct(block_id=None, doc_id=123, text=None))
+
+    assert not result.is_valid
+    assert any(error.startswith("Field 'doc_id'") for error in result.errors)
+
+
+@pytest.mark.unit
+def test_schema_validator_accepts_valid_instances_and_dicts():
+    validator = SchemaValidator(PDFBlock, strict=True)
+
+    assert validator.validate(PDFBlock(doc_id="doc-1", text="Some text")).is_valid
+    assert validator.validate({"doc_id": "doc-1", "text": "Some text"}).is_valid
+    assert not validator.validate({"doc_id": "doc-1"}).is_valid
+
+
+@pytest.fixture
+def vocab_cache_dir(tmp_path, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(validation, "BIOBERT_VOCAB_CACHE_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.mark.unit
+def test_vocab_cache_path_is_keyed_on_model_and_filter(vocab_cache_dir, monkeypatch: MonkeyPatch):
+    path = validation._vocab_cache_path("dmis-lab/biobert-base-cased-v1.1")
+
+    assert path.parent == vocab_cache_dir
+    assert "dmis-lab_biobert-base-cased-v1.1" in path.name
+    assert validation._vocab_cache_path("other/model") != path
+
+    monkeypatch.setattr(validation, "_VOCAB_FILTER_VERSION", validation._VOCAB_FILTER_VERSION + 1)
+    assert validation._vocab_cache_path("dmis-lab/biobert-base-cased-v1.1") != path
+
+
+@pytest.mark.unit
+def test_vocab_cache_round_trip(vocab_cache_dir):
+    vocab = frozenset({"hepatoblastoma", "cisplatin"})
+
+    BiomedicalContentValidator._write_vocabulary_cache("some/model", vocab)
+
+    assert BiomedicalContentValidator._read_vocabulary_cache("some/model") == vocab
+    assert BiomedicalContentValidator._read_vocabulary_cache("other/model") is None
+
+
+@pytest.mark.unit
+def test_concurrent_vocab_cache_writers(vocab_cache_dir):
+    vocabularies = [frozenset({f"term{i}", f"other{i}"}) for i in range(16)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda vocab: BiomedicalContentValidator._write_vocabulary_cache("m", vocab), vocabularies))
+
+    # One complete file from one writer, and no temp files left behind
+    files = list(vocab_cache_dir.iterdir())
+    assert len(files) == 1
+    assert frozenset(json.loads(files[0].read_text())) in vocabularies
+
+
+@pytest.mark.unit
+def test_unreadable_vocab_cache_is_ignored(vocab_cache_dir):
+    validation._vocab_cache_path("m").write_text("{not json")
+
+    assert BiomedicalContentValidator._read_vocabulary_cache("m") is None
+
+
+@pytest.fixture
+def documents_db(tmp_path, monkeypatch: MonkeyPatch):
+    """A throwaway database whose documents table holds doc-0 .. doc-9."""
+    path = tmp_path / "test.db"
+    monkeypatch.setattr(sql_connection_wrapper, "DB_PATH", path)
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("CREATE TABLE documents (doc_id TEXT PRIMARY KEY)")
+        conn.executemany("INSERT INTO documents VALUES (?)", [(f"doc-{i}",) for i in range(10)])
+    conn.close()
+    return path
+
+
+@pytest.mark.unit
+def test_foreign_key_validator_batch(documents_db):
+    validator = ForeignKeyValidator({"doc_id": "documents"})
+    batch = [
+        {"doc_id": "doc-1"},
+        {"doc_id": "doc-404"},
+        {"doc_id": ""},
+        {"other": "x"},
+        PDFBlock(doc_id="doc-2", text="Some text"),
+        42,
+    ]
+
+    results = validator.validate_batch(batch)
+
+    assert [result.is_valid for result in results] == [True, False, False, False, True, False]
+    assert results[1].errors == ["Foreign key reference not found: doc_id=doc-404 in documents"]
+    assert results[2].errors == ["Foreign key field empty: doc_id"]
+    assert results[3].errors == ["Foreign key field missing: doc_id"]
+
+
+@pytest.mark.unit
+def test_foreign_key_validator_caches_only_hits(documents_db):
+    validator = ForeignKeyValidator({"doc_id": "documents"})
+
+    assert not validator.validate({"doc_id": "doc-new"}).is_valid
+    assert validator._known_keys[("documents", "doc_id")] == set()
+
+    # A parent inserted after the first check is found on the next one
+    conn = sqlite3.connect(documents_db)
+    with conn:
+        conn.execute("INSERT INTO documents VALUES ('doc-new')")
+    conn.close()
+
+    assert validator.validate({"doc_id": "doc-new"}).is_valid
+    assert validator._known_keys[("documents", "doc_id")] == {"doc-new"}
+
+
+@pytest.mark.unit
+def test_foreign_key_validator_queries_once_per_batch(documents_db, monkeypatch: MonkeyPatch):
+    from BFHTW.utils.crud.crud import CRUD
+
+    lookups = []
+    select_existing = CRUD.select_existing
+    monkeypatch.setattr(CRUD, "select_existing", lambda **kwargs: lookups.append(kwargs["values"]) or select_existing(**kwargs))
+    validator = ForeignKeyValidator({"doc_id": "documents"})
+
+    validator.validate_batch([{"doc_id": f"doc-{i}"} for i in range(5)])
+    validator.validate_batch([{"doc_id": f"doc-{i}"} for i in range(3, 7)])
+
+    # The second batch only looks up the keys the first did not confirm
+    assert lookups == [{f"doc-{i}" for i in range(5)}, {"doc-5", "doc-6"}]
+
+
+@pytest.mark.unit
+def test_foreign_key_lookup_failure_is_a_warning(tmp_path, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(sql_connection_wrapper, "DB_PATH", tmp_path / "empty.db")
+    validator = ForeignKeyValidator({"doc_id": "documents"})
+
+    result = validator.validate({"doc_id": "doc-1"})
+
+    assert result.is_valid
+    assert result.warnings and result.warnings[0].startswith("Could not validate foreign key doc_id")
@@ -1,13 +1,45 @@
+from contextlib import contextmanager
+from functools import lru_cache
+from operator import attrgetter
 from typing import Type, List
 from pydantic import BaseModel
 from typing import Any, Optional, Union, Type, get_origin, get_args, Annotated
 import json
 
-from BFHTW.utils.db.sql_connection_wrapper import db_connector
+from BFHTW.utils.db.sql_connection_wrapper import db_connector, db_transaction, open_connection
 from BFHTW.utils.logs import get_logger
 
 L = get_logger()
 
+# Bound parameters per IN query; stays under SQLite's default SQLITE_MAX_VARIABLE_NUMBER (999)
+MAX_IN_PARAMS = 900
+# Rows pulled per fetchmany when streaming a whole column
+FETCH_CHUNK_SIZE = 10_000
+
+@lru_cache(maxsize=256)
+def _insert_sql(table: str, columns: tuple, on_conflict: str = "REPLACE") -> str:
+    """
+    Build the INSERT statement for a table/column set once.
+
+    Reusing the identical string lets sqlite3's per-connection statement cache
+    skip re-preparing it within a connection.
+    """
+    placeholders = ', '.join(['?'] * len(columns))
+    return f"INSERT OR {on_conflict} INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+@lru_cache(maxsize=None)
+def _model_columns(model: Type[BaseModel]) -> Optional[List[str]]:
+    """
+    Column names for reading a model's values straight off its attributes.
+
+    Returns None when the model customises serialization, in which case
+    values must come from model_dump().
+    """
+    decorators = model.__pydantic_decorators__
+    if decorators.field_serializers or decorators.model_serializers or decorators.computed_fields:
+        return None
+    return list(model.model_fields)
+
 class CRUD:
 
     type_mapping = {
@@ -31,13 +63,8 @@ class CRUD:
         data: BaseModel
         ):
         
-        fields = list(data.model_dump().keys())
-        placeholders = ', '.join(['?'] * len(fields))
-        columns = ', '.join(fields)
-        values = tuple(data.model_dump().values())
-
-        sql = f"INSERT OR REPLACE INTO {table} ({columns}) VALUES ({placeholders})"
-        conn.execute(sql, values)
+        dumped = data.model_dump()
+        conn.execute(_insert_sql(table, tuple(dumped)), tuple(dumped.values()))
         return data
 
     @staticmethod
@@ -48,18 +75,56 @@ class CRUD:
         model: Type[BaseModel], 
         id_field: Optional[str] = None,
         id_value: Optional[Union[str, int, float, bool]] = None, 
-        ALL: bool = False):
+        ALL: bool = False,
+        id_values: Optional[List[Union[str, int, float, bool]]] = None):
         if ALL:
             sql = f"SELECT * FROM {table}"
             rows = conn.execute(sql).fetchall()
         elif id_field and id_value is not None:
             sql = f"SELECT * FROM {table} WHERE {id_field} = ?"
             rows = conn.execute(sql, (id_value,)).fetchall()
+        elif id_field and id_values is not None:
+            if not id_values:
+                return []
+            id_values = list(id_values)
+            rows = []
+            # Long ID lists are queried in chunks to stay within SQLite's parameter limit
+            for start in range(0, len(id_values), MAX_IN_PARAMS):
+                chunk = id_values[start:start + MAX_IN_PARAMS]
+                placeholders = ', '.join(['?'] * len(chunk))
+                sql = f"SELECT * FROM {table} WHERE {id_field} IN ({placeholders})"
+                rows.extend(conn.execute(sql, tuple(chunk)).fetchall())
         else:
-            raise ValueError("Must provide either ALL=True or (id_field + id_value)")
+            raise ValueError("Must provide either ALL=True, (id_field + id_value) or (id_field + id_values)")
 
         return [model(**dict(row)) for row in rows] if rows else []
 
+    @staticmethod
+    @db_connector
+    def select_column(conn, table: str, column: str) -> set:
+        """Return the distinct values of one column, streamed in FETCH_CHUNK_SIZE row chunks."""
+        values = set()
+        cur = conn.execute(f"SELECT {column} FROM {table}")
+        while True:
+            rows = cur.fetchmany(FETCH_CHUNK_SIZE)
+            if not rows:
+                break
+            values.update(row[0] for row in rows)
+        return values
+
+    @staticmethod
+    @db_connector
+    def select_existing(conn, table: str, column: str, values) -> set:
+        """Return which of ``values`` are present in ``column``, queried in MAX_IN_PARAMS chunks."""
+        values = list(values)
+        found = set()
+        for start in range(0, len(values), MAX_IN_PARAMS):
+            chunk = values[start:start + MAX_IN_PARAMS]
+            placeholders = ', '.join(['?'] * len(chunk))
+            sql = f"SELECT {column} FROM {table} WHERE {column} IN ({placeholders})"
+            found.update(row[0] for row in conn.execute(sql, tuple(chunk)))
+        return found
+
     @staticmethod
     @db_connector
     def update(
@@ -76,6 +141,8 @@ class CRUD:
 
         sql = f"UPDATE {table} SET {set_clause} WHERE {id_field} = ?"
         conn.execute(sql, values)
+        # Commit first so the separate read connection sees the update
+        conn.commit()
         return CRUD.get(table=table, model=model, id_field=id_field, id_value=id_value)
 
     @staticmethod
@@ -126,37 +193,121 @@ class CRUD:
 
     @staticmethod
     @db_connector
-    def bulk_insert(
+    def create_index_if_not_exists(
         conn,
         table: str,
-        model: Type[BaseModel],
-        data_list: List[BaseModel]
-        ):
-        if not data_list:
-            return f"No data to insert into {table}"
+        fields: List[str],
+        unique: bool = False
+    ):
+        """Create an index on ``fields``; a unique index also covers tables created before the constraint."""
+        index_name = f"idx_{table}_{'_'.join(fields)}"
+        unique_sql = "UNIQUE " if unique else ""
+        conn.execute(
+            f"CREATE {unique_sql}INDEX IF NOT EXISTS {index_name} ON {table} ({', '.join(fields)})"
+        )
+        return True
 
-        fields = list(data_list[0].model_dump(mode='python').keys())
-        placeholders = ', '.join(['?'] * len(fields))
-        columns = ', '.join(fields)
-        sql = f"INSERT OR REPLACE INTO {table} ({columns}) VALUES ({placeholders})"
+    @staticmethod
+    def connect():
+        """Open a long-lived connection to reuse across `transaction` calls; the caller closes it."""
+        return open_connection()
 
-        successful = 0
+    @staticmethod
+    @contextmanager
+    def transaction(conn=None):
+        """
+        Group several writes into one transaction.
+
+        Pass a connection from `CRUD.connect` to reuse it across transactions;
+        otherwise a connection is opened for this one.
+
+        Example:
+            with CRUD.transaction() as conn:
+                CRUD.insert_rows(conn, 'pdf_blocks', blocks)
+                CRUD.update_rows(conn, 'documents', 'doc_id', [(doc_id, {'processed': True})])
+        """
+        with db_transaction(conn) as conn:
+            yield conn
+
+    @staticmethod
+    def insert_rows(
+        conn,
+        table: str,
+        data_list: List[Any],
+        on_conflict: str = "REPLACE",
+        fields: Optional[List[str]] = None
+    ) -> int:
+        """
+        Insert rows with a single executemany, falling back to per-row inserts on error.
+
+        ``on_conflict`` is the SQLite conflict resolution ("REPLACE" or "IGNORE").
+        Rows are pydantic models unless ``fields`` is given, in which case those
+        attributes are read from each object directly (e.g. slotted dataclasses)
+        and no model_dump() is made. Returns the number of rows actually written,
+        so ignored conflicts are not counted.
+        """
+        if fields is None:
+            fields = _model_columns(type(data_list[0]))
+        if fields is None:
+            # Models with custom serializers go through model_dump so those still apply
+            fields = list(data_list[0].model_dump(mode='python').keys())
+            get_values = lambda item: item.model_dump(mode='python').values()
+        elif len(fields) == 1:
+            get_values = lambda item, get=attrgetter(fields[0]): (get(item),)
+        else:
+            get_values = attrgetter(*fields)
+        sql = _insert_sql(table, tuple(fields), on_conflict)
+
+        rows = []
+        failed = []
         for idx, item in enumerate(data_list):
             try:
-                values = tuple(
+                rows.append(tuple(
                     int(v) if isinstance(v, bool)
                     else json.dumps(v) if isinstance(v, list)
                     else v
-                    for v in item.model_dump(mode='python').values()
-                )
-                conn.execute(sql, values)
-                successful += 1
+                    for v in get_values(item)
+                ))
+            except Exception as e:
+                failed.append(idx)
+                L.warning(f"Row {idx} for {table} could not be prepared: {e}")
+                L.debug(f"Offending values: {item!r}")
+
+        # A failed executemany keeps the rows it wrote before the error; roll back
+        # to here so the row-by-row retry writes (and counts) each row once
+        conn.execute("SAVEPOINT insert_rows")
+        try:
+            written = conn.executemany(sql, rows).rowcount
+            conn.execute("RELEASE SAVEPOINT insert_rows")
+            return written
+        except Exception as e:
+            conn.execute("ROLLBACK TO SAVEPOINT insert_rows")
+            conn.execute("RELEASE SAVEPOINT insert_rows")
+            L.warning(f"Batch insert into {table} failed ({e}); retrying row by row")
+
+        successful = 0
+        for idx, values in enumerate(rows):
+            try:
+                successful += conn.execute(sql, values).rowcount
             except Exception as e:
-                print(f"[ERROR] Row {idx} failed: {e}")
-                print(f"Offending values: {item.model_dump(mode='python')}")
+                L.warning(f"Row {idx} insert into {table} failed: {e}")
+                L.debug(f"Offending values: {values}")
+        return successful
 
+    @staticmethod
+    @db_connector
+    def bulk_insert(
+        conn,
+        table: str,
+        model: Type[BaseModel],
+        data_list: List[BaseModel]
+        ):
+        if not data_list:
+            return f"No data to insert into {table}"
+
+        successful = CRUD.insert_rows(conn, table, data_list)
         return f"Successfully inserted {successful}/{len(data_list)} records into {table}"
-    
+
     @staticmethod
     @db_connector
     def bulk_update(
@@ -185,6 +336,41 @@ class CRUD:
         if not data_list:
             return "No updates to perform."
 
+        total = CRUD.update_rows(conn, table, id_field, data_list)
+        return f"Successfully updated {total}/{len(data_list)} records in '{table}'"
+
+    @staticmethod
+    @db_connector
+    def bulk_set(conn, table: str, id_field: str, id_values: List[Any], updates: dict) -> int:
+        """
+        Apply the same updates to every row whose ``id_field`` is in ``id_values``.
+
+        Example:
+            CRUD.bulk_set('pdf_blocks', 'block_id', block_ids, {'processed': True})
+        """
+        return CRUD.update_where_in(conn, table, id_field, id_values, updates)
+
+    @staticmethod
+    def update_where_in(conn, table: str, id_field: str, id_values: List[Any], updates: dict) -> int:
+        """Apply one update dict to many IDs with chunked IN queries; returns the rows changed."""
+        id_values = list(id_values)
+        if not id_values or not updates:
+            return 0
+        set_clause = ', '.join(f"{k} = ?" for k in updates)
+        set_values = tuple(updates.values())
+        # Leave room for the SET parameters within SQLite's parameter limit
+        chunk_size = MAX_IN_PARAMS - len(set_values)
+        total = 0
+        for start in range(0, len(id_values), chunk_size):
+            chunk = id_values[start:start + chunk_size]
+            placeholders = ', '.join(['?'] * len(chunk))
+            sql = f"UPDATE {table} SET {set_clause} WHERE {id_field} IN ({placeholders})"
+            total += conn.execute(sql, set_values + tuple(chunk)).rowcount
+        return total
+
+    @staticmethod
+    def update_rows(conn, table: str, id_field: str, data_list: List[tuple]) -> int:
+        """Apply (id_value, update_dict) pairs on an open connection; returns the count applied."""
         total = 0
         for idx, (id_value, updates) in enumerate(data_list):
             try:
@@ -196,5 +382,4 @@ class CRUD:
             except Exception as e:
                 print(f"[ERROR] Update {idx} failed for ID {id_value}: {e}")
                 print(f"Offending updates: {updates}")
-
-        return f"Successfully updated {total}/{len(data_list)} records in '{table}'"
\ No newline at end of file
+        return total
\ No newline at end of file
@@ -1,7 +1,8 @@
 import sqlite3
+from contextlib import contextmanager
 from functools import wraps
 from pathlib import Path
-from typing import Any, Callable, TypeVar, ParamSpec, cast
+from typing import Any, Callable, Iterator, Optional, TypeVar, ParamSpec, cast
 
 from BFHTW.utils.logs import get_logger
 
@@ -10,16 +11,65 @@ L = get_logger()
 ROOT_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = ROOT_DIR / "data" / "database.db"
 
+# WAL lets readers run alongside the writer and, with synchronous=NORMAL,
+# only fsyncs at checkpoints instead of on every commit.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+)
+
+def _configure_connection(conn: sqlite3.Connection) -> None:
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+
 def db_connector(func: Callable[..., Any]) -> Callable[..., Any]:
     @wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> Any:
         conn = sqlite3.connect(DB_PATH)
         conn.row_factory = sqlite3.Row
+        _configure_connection(conn)
         try:
-            return func(conn, *args, **kwargs)
+            # One transaction per call: committed on success, rolled back on error
+            with conn:
+                return func(conn, *args, **kwargs)
         finally:
             conn.close()
     return wrapper
 
+def open_connection() -> sqlite3.Connection:
+    """
+    Open a configured connection in autocommit mode for callers that keep it
+    across many transactions; pass it to `db_transaction` and close it when done.
+    """
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    _configure_connection(conn)
+    return conn
+
+@contextmanager
+def db_transaction(conn: Optional[sqlite3.Connection] = None) -> Iterator[sqlite3.Connection]:
+    """
+    Yield a connection whose statements share one explicit BEGIN ... COMMIT.
+
+    Rolls back if the block raises, so several writes land atomically with a
+    single WAL commit. A connection from `open_connection` is reused and left
+    open; otherwise one is opened for this transaction and closed after it.
+    """
+    owned = conn is None
+    if owned:
+        conn = open_connection()
+    try:
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    finally:
+        if owned:
+            conn.close()
+
 
 
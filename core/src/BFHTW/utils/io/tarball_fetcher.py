@@ -1,42 +1,172 @@
 # src/BFHTW/utils/io/tarball_fetcher.py
 
+import os
+import shutil
 import tarfile
 import requests
+import requests.adapters
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.parse import urljoin
 from BFHTW.utils.logs import get_logger
 
 L = get_logger()
 
+# Large chunks keep the number of read/write syscalls per tarball low.
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Files smaller than this are fetched with a single request.
+RANGE_DOWNLOAD_MIN_SIZE = 8 * 1024 * 1024
+
 class TarballFetcher:
-    def __init__(self, base_dir: Path):
+    def __init__(self, base_dir: Path, max_connections: int = 16):
         self.base_dir = base_dir
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        # One pooled session keeps TCP/TLS connections alive across downloads
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def download(self, url: str, target_path: Path, parts: int = 4) -> Path:
+        """
+        Download a tar.gz file from a URL.
 
-    def download(self, url: str, target_path: Path) -> Path:
-        """Download a tar.gz file from a URL."""
+        Large files on servers that accept byte ranges are fetched as ``parts``
+        parallel range requests written into place; otherwise a single stream is used.
+        """
         L.info(f"Downloading: {url}")
-        response = requests.get(url, stream=True, timeout=60)
+
+        if parts > 1:
+            size = self._ranged_content_length(url)
+            if size >= RANGE_DOWNLOAD_MIN_SIZE and self._download_ranges(url, target_path, size, parts):
+                L.info(f"Saved to: {target_path}")
+                return target_path
+
+        response = self.session.get(url, stream=True, timeout=60)
         response.raise_for_status()
 
         with open(target_path, "wb") as f:
-            for i, chunk in enumerate(response.iter_content(chunk_size=8192)):
+            for i, chunk in enumerate(response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)):
                 if chunk:
                     f.write(chunk)
-                    if i % 25 == 0:
-                        L.debug(f"Downloaded ~{i * 8192} bytes...")
+                    L.debug(f"Downloaded ~{(i + 1) * DOWNLOAD_CHUNK_SIZE} bytes...")
 
         L.info(f"Saved to: {target_path}")
         return target_path
 
-    def extract(self, tar_path: Path, extract_to: Path) -> None:
-        """Extract all contents of a tar.gz file."""
+    def _ranged_content_length(self, url: str) -> int:
+        """Return the content length if the server advertises byte ranges, else 0."""
+        try:
+            response = self.session.head(url, allow_redirects=True, timeout=30)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            L.debug(f"HEAD failed for {url}: {e}")
+            return 0
+
+        if response.headers.get("Accept-Ranges", "").lower() != "bytes":
+            return 0
+        return int(response.headers.get("Content-Length", 0))
+
+    def _download_ranges(self, url: str, target_path: Path, size: int, parts: int) -> bool:
+        """Fetch ``size`` bytes as parallel range requests; False if ranges are refused."""
+        part_size = -(-size // parts)
+        ranges = [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+
+        with open(target_path, "wb") as f:
+            f.truncate(size)
+
+        def fetch(byte_range):
+            start, end = byte_range
+            response = self.session.get(url, headers={"Range": f"bytes={start}-{end}"}, stream=True, timeout=60)
+            response.raise_for_status()
+            if response.status_code != 206:
+                # Server ignored the range and is sending the whole file
+                response.close()
+                return False
+            with open(target_path, "r+b") as f:
+                f.seek(start)
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+            return True
+
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            if all(pool.map(fetch, ranges)):
+                L.debug(f"Downloaded {size} bytes in {len(ranges)} ranges")
+                return True
+
+        L.info(f"Range requests not honoured for {url}; falling back to a single stream")
+        return False
+
+    def stream_extract(self, url: str, extract_to: Path) -> Path:
+        """
+        Download a tar.gz file and extract it on the fly.
+
+        The response body is fed straight into tarfile's single-pass ``r|gz`` mode,
+        so the archive itself never touches the disk.
+        """
+        extract_to.mkdir(parents=True, exist_ok=True)
+        L.info(f"Streaming: {url} → {extract_to}")
+
+        with self.session.get(url, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            try:
+                with tarfile.open(fileobj=response.raw, mode="r|gz") as tar:
+                    if hasattr(tarfile, "data_filter"):
+                        tar.extractall(path=extract_to, filter="data")
+                    else:
+                        tar.extractall(path=extract_to)
+            except tarfile.TarError as e:
+                raise RuntimeError(f"Tar extraction error: {e}")
+
+        if not any(extract_to.iterdir()):
+            raise RuntimeError(f"Extraction failed — directory is empty: {extract_to}")
+
+        L.info("Extraction complete.")
+        return extract_to
+
+    def stream_extract_first(self, url: str, extract_to: Path, suffix: str) -> Path | None:
+        """
+        Stream a tar.gz file and write out only its first member ending in ``suffix``.
+
+        Reading stops at that member, so the rest of the archive is neither
+        downloaded nor written. Returns the written file, or None if no member matched.
+        """
+        extract_to.mkdir(parents=True, exist_ok=True)
+        suffix = suffix.lower()
+        L.info(f"Streaming first *{suffix} from: {url} → {extract_to}")
+
+        with self.session.get(url, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            try:
+                with tarfile.open(fileobj=response.raw, mode="r|gz") as tar:
+                    for member in tar:
+                        if not member.isfile() or not member.name.lower().endswith(suffix):
+                            continue
+                        # Keep only the base name so member paths cannot escape extract_to
+                        target = extract_to / Path(member.name).name
+                        with tar.extractfile(member) as src, open(target, "wb") as dst:
+                            shutil.copyfileobj(src, dst, DOWNLOAD_CHUNK_SIZE)
+                        L.info(f"Extracted {target.name}")
+                        return target
+            except tarfile.TarError as e:
+                raise RuntimeError(f"Tar extraction error: {e}")
+
+        L.warning(f"No *{suffix} member found in {url}")
+        return None
+
+    def extract(self, tar_path: Path, extract_to: Path) -> Path:
+        """Extract all contents of a tar.gz file and return the extraction directory."""
         extract_to.mkdir(parents=True, exist_ok=True)
         L.info(f"Extracting: {tar_path} → {extract_to}")
 
         try:
             with tarfile.open(tar_path, "r:gz") as tar:
-                tar.extractall(path=extract_to)
+                if hasattr(tarfile, "data_filter"):
+                    tar.extractall(path=extract_to, filter="data")
+                else:
+                    tar.extractall(path=extract_to)
         except tarfile.TarError as e:
             raise RuntimeError(f"Tar extraction error: {e}")
 
@@ -44,11 +174,34 @@ class TarballFetcher:
             raise RuntimeError(f"Extraction failed — directory is empty: {extract_to}")
 
         L.info("Extraction complete.")
+        return extract_to
 
     def find_first_pdf(self, extract_dir: Path) -> Path | None:
         """Search for the first PDF file in the extracted directory."""
-        pdfs = list(extract_dir.rglob("*.pdf"))
-        if not pdfs:
+        pdf_path = self.find_first_file(extract_dir, ".pdf")
+        if pdf_path is None:
             L.warning(f"No PDF found in {extract_dir}")
-            return None
-        return pdfs[0]
+        return pdf_path
+
+    @staticmethod
+    def find_first_file(extract_dir: Path, suffix: str) -> Path | None:
+        """
+        Return the first file under ``extract_dir`` whose name ends with ``suffix``.
+
+        Walks with os.scandir, which reuses directory-entry types instead of a stat
+        per file, and stops at the first match.
+        """
+        suffix = suffix.lower()
+        stack = [str(extract_dir)]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.lower().endswith(suffix):
+                        return Path(entry.path)
+        return None
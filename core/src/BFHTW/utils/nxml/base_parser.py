@@ -1,5 +1,6 @@
 # base_parser.py
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from pathlib import Path
 from lxml import etree
 from typing import Dict, Generator, Optional, List
@@ -16,12 +17,63 @@ class BaseNXMLParser(ABC):
 
     def __init__(self, file_path: str, doc_id: str, source_db: str, source_file: Optional[str] = None):
         self.file_path = Path(file_path)
-        self.tree = etree.parse(str(self.file_path), parser=None)
-        self.root = self.tree.getroot()
+        self._tree = None
+        # Partial tree up to the end of <front>, only used inside header_scope()
+        self._header_tree = None
+        self._use_header = False
         self.doc_id = doc_id
         self.source_db = source_db
         self.source_file = source_file
 
+    @property
+    def tree(self) -> etree._ElementTree:
+        """
+        Full document tree, parsed on first access (block extraction streams instead).
+
+        Inside ``header_scope`` the partial header tree is returned when one was loaded.
+        """
+        if self._use_header and self._header_tree is not None:
+            return self._header_tree
+        if self._tree is None:
+            self._tree = etree.parse(str(self.file_path), parser=None)
+        return self._tree
+
+    @property
+    def root(self) -> etree._Element:
+        return self.tree.getroot()
+
+    def load_header(self, until_tag: str = "front") -> None:
+        """
+        Parse only up to the end of ``until_tag`` and keep that partial tree.
+
+        It is kept apart from the full tree and only used inside ``header_scope``,
+        so later body lookups still see the whole document.
+        """
+        if self._tree is not None or self._header_tree is not None:
+            return
+        root = None
+        for _, elem in etree.iterparse(str(self.file_path), events=("end",)):
+            if elem.tag == until_tag:
+                root = elem.getroottree().getroot()
+                break
+        if root is not None:
+            self._header_tree = etree.ElementTree(root)
+
+    @contextmanager
+    def header_scope(self, until_tag: str = "front"):
+        """
+        Answer lookups from the partial header tree for the duration of the block.
+
+        Article metadata lives in ``<front>``, so metadata lookups need not build
+        the body. Falls back to the full tree if the tag is absent.
+        """
+        self.load_header(until_tag)
+        self._use_header = True
+        try:
+            yield
+        finally:
+            self._use_header = False
+
     # -------------------------------------------------------------------------
     # Required metadata extraction (must be implemented by subclasses)
     # -------------------------------------------------------------------------
@@ -58,7 +110,7 @@ class BaseNXMLParser(ABC):
     # -------------------------------------------------------------------------
 
     def extract_license_type(self) -> Optional[str]:
-        for action, pi in etree.iterwalk(self.tree, events=("PI",)):
+        for action, pi in etree.iterwalk(self.tree, events=("pi",)):
             if pi.target == "properties" and "open_access" in pi.text:
                 return "open_access"
         return None
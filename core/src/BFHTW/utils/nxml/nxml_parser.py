@@ -1,4 +1,5 @@
 from typing import Dict, Optional, List, Generator
+import mmap
 from lxml import etree
 from uuid import uuid4
 from datetime import datetime
@@ -6,6 +7,7 @@ from transformers import AutoTokenizer
 
 from BFHTW.models.meta_model import MetaBase
 from BFHTW.models.block_model import BlockBase
+from BFHTW.models.nxml_models import NXMLBlock, NXMLMetadata
 from BFHTW.models.document_main import Document
 from BFHTW.utils.nxml.base_parser import BaseNXMLParser
 
@@ -51,45 +53,113 @@ class PubMedNXMLParser(BaseNXMLParser):
                 return text.strip()
         return None
 
-    def extract_blocks(self) -> Generator[BlockBase, None, None]:
-        section_counter = 0
-        char_pointer = 0
+    def extract_blocks(self) -> Generator[NXMLBlock, None, None]:
+        """
+        Stream paragraph blocks from the article body.
 
-        for sec in self.root.xpath(".//body//sec"):
-            section_counter += 1
-            section_title_el = sec.find("title")
-            section_title = section_title_el.text.strip() if section_title_el is not None else None
+        The file is memory-mapped and fed to ``etree.iterparse``; finished sections and
+        top-level elements are cleared as parsing proceeds, so memory stays bounded by
+        document depth rather than document size.
 
-            for para in sec.findall("p"):
-                text = "".join(para.itertext()).strip()
-                if not text:
+        Blocks come out section by section in document order, each section's own
+        paragraphs before those of its subsections. Paragraph text is therefore held
+        until its outermost section closes.
+        """
+        section_counter = 0
+        char_pointer = 0
+        body_depth = 0
+        # Open sections as [element, section_index, section_title, paragraphs, subsection_blocks]
+        sections = []
+
+        with open(self.file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for event, elem in etree.iterparse(mm, events=("start", "end")):
+                tag = elem.tag
+
+                if event == "start":
+                    if tag == "body":
+                        body_depth += 1
+                    elif tag == "sec" and body_depth:
+                        section_counter += 1
+                        sections.append([elem, section_counter, None, [], []])
                     continue
 
-                token_count = len(self.tokenizer.encode(text, add_special_tokens=False))
-                char_start = char_pointer
-                char_end = char_start + len(text)
-                char_pointer = char_end + 1
-
-                yield BlockBase(
-                    block_id=str(uuid4()),
-                    doc_id=self.doc_id,
-                    text=text,
-                    section_index=section_counter,
-                    section_title=section_title,
-                    source="nxml",
-                    block_type="paragraph",
-                    page_num=None,
-                    char_start=char_start,
-                    char_end=char_end,
-                    token_count=token_count,
-                    language="en",
-                    parser_version="v1.0.0",
-                    created_at=datetime.utcnow().isoformat(),
-                    embedding_exists=False,
-                    ner_processed=False,
-                    source_db=self.source_db,
-                    source_file=self.source_file,
-                )
+                if tag == "title" and sections and elem.getparent() is sections[-1][0]:
+                    if sections[-1][2] is None and elem.text:
+                        sections[-1][2] = elem.text.strip()
+
+                elif tag == "p" and sections and elem.getparent() is sections[-1][0]:
+                    text = "".join(elem.itertext()).strip()
+                    elem.clear()
+                    if text:
+                        sections[-1][3].append(text)
+
+                elif tag == "sec" and sections and elem is sections[-1][0]:
+                    _, section_index, section_title, paragraphs, subsection_blocks = sections.pop()
+                    self._trim(elem)
+                    finished = [(section_index, section_title, text) for text in paragraphs]
+                    finished.extend(subsection_blocks)
+                    if sections:
+                        sections[-1][4].extend(finished)
+                        continue
+
+                    for section_index, section_title, text in finished:
+                        token_count = len(self.tokenizer.encode(text, add_special_tokens=False))
+                        char_start = char_pointer
+                        char_end = char_start + len(text)
+                        char_pointer = char_end + 1
+
+                        # All values are built here with known types; skip re-validation
+                        yield NXMLBlock.model_construct(
+                            block_id=str(uuid4()),
+                            doc_id=self.doc_id,
+                            text=text,
+                            section_index=section_index,
+                            section_title=section_title,
+                            source="nxml",
+                            block_type="paragraph",
+                            page_num=None,
+                            char_start=char_start,
+                            char_end=char_end,
+                            token_count=token_count,
+                            language="en",
+                            parser_version="v1.0.0",
+                            created_at=datetime.utcnow().isoformat(),
+                            embedding_exists=False,
+                            ner_processed=False,
+                        )
+
+                elif tag == "body":
+                    body_depth -= 1
+                    self._trim(elem)
+
+                elif elem.getparent() is not None and elem.getparent().getparent() is None:
+                    # Direct children of <article> (front, back, floats-group)
+                    self._trim(elem)
+
+    @staticmethod
+    def _trim(elem: etree._Element) -> None:
+        """Release a finished element and any already-processed preceding siblings."""
+        elem.clear()
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+
+    def get_nxml_metadata(self) -> NXMLMetadata:
+        # Every field below comes from <front>; blocks are streamed separately
+        with self.header_scope():
+            license_type = self.extract_license_type()
+            return NXMLMetadata(
+                doc_id=self.doc_id,
+                title=self.get_text(".//article-title"),
+                format="nxml",
+                file_path=str(self.file_path),
+                external_id=self.get_external_id({}),
+                doi=self.get_doi(),
+                journal=self.get_journal(),
+                publication_date=self.get_publication_date(),
+                open_access=license_type == "open_access",
+            )
 
     def get_document_metadata(self) -> Document:
         return Document(
@@ -53,7 +53,8 @@ class PDFBlockExtractor:
                 if not text:
                     continue
 
-                all_blocks.append(PDFBlock(
+                # Values come straight from fitz with known types; skip re-validation
+                all_blocks.append(PDFBlock.model_construct(
                     block_id=str(uuid.uuid4()),
                     doc_id=doc_id,
                     page=page_num,
@@ -11,7 +11,7 @@ import uuid
 from pathlib import Path
 from typing import Optional
 
-from BFHTW.models.pdf_extraction import PDFMetadata
+from BFHTW.models.pdf_models import PDFMetadata
 from BFHTW.utils.logs import get_logger
 
 L = get_logger()
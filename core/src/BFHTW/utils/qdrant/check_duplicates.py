@@ -2,10 +2,12 @@ from qdrant_client import QdrantClient
 from collections import defaultdict
 from qdrant_client.models import PointIdsList
 
+from BFHTW.utils.qdrant.qdrant_crud import BLOCK_EMBEDDING_COLLECTION, load_blocks
+
 # Connect to Qdrant
 client = QdrantClient("http://localhost:6333")
 
-collection = "bio_blocks"
+collection = BLOCK_EMBEDDING_COLLECTION
 scroll_limit = 10000
 
 # Scroll through all points
@@ -28,10 +30,20 @@ while True:
         break
     offset = next_offset
 
+# Payloads only reference their block; load the text from SQLite. Older points
+# still carry their text in the payload.
+blocks = load_blocks([
+    (pt.payload.get("table"), str(pt.payload.get("block_id", pt.id)))
+    for pt in all_points if not pt.payload.get("text")
+])
+
 # Group point IDs by text content
 text_map = defaultdict(list)
 for pt in all_points:
     text = pt.payload.get("text")
+    if not text:
+        block = blocks.get(str(pt.payload.get("block_id", pt.id)))
+        text = block.text if block else None
     if text:
         text_map[text].append(pt.id)
 
@@ -43,8 +55,9 @@ for ids in text_map.values():
 
 print(f"Identified {len(duplicate_ids)} duplicate points to delete.")
 
-client.delete(
-    collection_name="bio_blocks",
-    points_selector=PointIdsList(points=duplicate_ids),
-    wait=True
-)
\ No newline at end of file
+if duplicate_ids:
+    client.delete(
+        collection_name=collection,
+        points_selector=PointIdsList(points=duplicate_ids),
+        wait=True
+    )
\ No newline at end of file
@@ -1,16 +1,68 @@
 from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct, VectorParams, Distance, Filter, FieldCondition, MatchValue
-from typing import List
+from qdrant_client.models import (
+    PointStruct, VectorParams, Distance, Filter, FieldCondition, MatchValue, OptimizersConfigDiff
+)
+from typing import Dict, List, Optional, Tuple, Type
+
+from BFHTW.models.block_model import BlockBase
+from BFHTW.utils.crud.crud import CRUD
+from BFHTW.utils.logs import get_logger
+
+L = get_logger()
+
+# Collection for BioBERT block embeddings. The suffix is bumped whenever the
+# embedder's pooling changes, because vectors from different poolings are not
+# comparable: "bio_blocks" holds the original vectors, averaged over all 512
+# padded positions, while v2 vectors average each chunk's real tokens only.
+BLOCK_EMBEDDING_COLLECTION = "bio_blocks_v2"
+
+# SQLite tables whose blocks are embedded into Qdrant. Points name their table in
+# the "table" payload key; points written before that key existed are looked up
+# in each of these in turn.
+BLOCK_TABLES = ("blocks", "pdf_blocks")
+
+def load_blocks(
+    refs: List[Tuple[Optional[str], str]],
+    model: Type[BlockBase] = BlockBase
+) -> Dict[str, BlockBase]:
+    """
+    Load blocks referenced by Qdrant payloads from SQLite, keyed by block_id.
+
+    ``refs`` are (table, block_id) pairs; a table of None (points written
+    before payloads named their table) is looked up in every BLOCK_TABLES
+    table. Runs one IN query per table.
+    """
+    found: Dict[str, BlockBase] = {}
+    tables = dict.fromkeys([*BLOCK_TABLES, *(table for table, _ in refs if table)])
+    for table in tables:
+        wanted = [block_id for ref_table, block_id in refs if ref_table in (table, None) and block_id not in found]
+        if not wanted:
+            continue
+        try:
+            for block in CRUD.get(table=table, model=model, id_field="block_id", id_values=wanted):
+                found[block.block_id] = block
+        except Exception as e:
+            L.warning(f"Could not load {len(wanted)} blocks from {table}: {str(e)}")
+    return found
 
 class QdrantCRUD:
-    def __init__(self, collection_name: str, host: str = "localhost", port: int = 6333):
-        self.client = QdrantClient(host=host, port=port)
+    def __init__(
+        self,
+        collection_name: str,
+        host: str = "localhost",
+        port: int = 6333,
+        prefer_grpc: bool = False,
+        grpc_port: int = 6334
+    ):
+        # gRPC avoids JSON encoding of vectors; the server must expose grpc_port
+        self.client = QdrantClient(host=host, port=port, prefer_grpc=prefer_grpc, grpc_port=grpc_port)
         self.collection_name = collection_name
 
         if not self.client.collection_exists(collection_name):
             self.client.recreate_collection(
                 collection_name=collection_name,
-                vectors_config=VectorParams(size=768, distance=Distance.COSINE)
+                vectors_config=VectorParams(size=768, distance=Distance.COSINE),
+                on_disk_payload=True
             )
 
     def upsert_embedding(self, block_id: str, doc_id: str, embedding: List[float], payload: dict):
@@ -28,6 +80,23 @@ class QdrantCRUD:
             limit=top_k
         )
 
+    def get_similar_blocks(
+        self,
+        embedding: List[float],
+        top_k: int = 5,
+        model: Type[BlockBase] = BlockBase
+    ) -> List[Tuple[float, Optional[BlockBase]]]:
+        """
+        Search for similar blocks and load their text from SQLite.
+
+        Payloads only carry IDs and the table the block lives in, so block text
+        is fetched with one IN query per table.
+        """
+        hits = self.get_similar(embedding, top_k=top_k)
+        block_ids = [str(hit.payload.get("block_id", hit.id)) for hit in hits]
+        blocks = load_blocks([(hit.payload.get("table"), block_id) for hit, block_id in zip(hits, block_ids)], model)
+        return [(hit.score, blocks.get(block_id)) for hit, block_id in zip(hits, block_ids)]
+
     def delete_by_id(self, block_id: str):
         self.client.delete(collection_name=self.collection_name, points_selector=[block_id])
 
@@ -40,8 +109,47 @@ class QdrantCRUD:
             limit=100
         )
     
-    def upsert_embeddings_bulk(self, points: List[PointStruct]):
+    def upsert_embeddings_bulk(self, points: List[PointStruct], wait: bool = True):
         self.client.upsert(
             collection_name=self.collection_name,
-            points=points
+            points=points,
+            wait=wait
+        )
+
+    def upload_vectors_bulk(
+        self,
+        ids: List[str],
+        vectors,
+        payloads: List[dict],
+        batch_size: int = 64,
+        parallel: int = 1,
+        wait: bool = False
+    ):
+        """
+        Upload column-oriented points: ids, an (N, dim) array of vectors and payloads.
+
+        The vectors go to the client as one array instead of one list per point.
+        ``parallel`` > 1 starts a multiprocessing pool for this call, which only
+        pays off for uploads far larger than a buffered flush.
+        """
+        self.client.upload_collection(
+            collection_name=self.collection_name,
+            vectors=vectors,
+            payload=payloads,
+            ids=ids,
+            batch_size=batch_size,
+            parallel=parallel,
+            wait=wait
+        )
+
+    def get_indexing_threshold(self) -> Optional[int]:
+        """Return the collection's current HNSW indexing threshold."""
+        info = self.client.get_collection(collection_name=self.collection_name)
+        return info.config.optimizer_config.indexing_threshold
+
+    def set_indexing_threshold(self, threshold: int):
+        """Set the HNSW indexing threshold; 0 disables index building (bulk ingest)."""
+        self.client.update_collection(
+            collection_name=self.collection_name,
+            optimizers_config=OptimizersConfigDiff(indexing_threshold=threshold)
         )